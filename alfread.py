@@ -8,6 +8,15 @@ import inspect
 import time
 from telethon.sessions import StringSession
 from config import *
+from plugins.core.bot_handlers import remove_tenant
+from plugins.core.http import http_client
+from plugins.core.images import image_pipeline
+from plugins.core.manifest import premium_manifest
+from plugins.core.premium import premium_registry
+from plugins.core.profile import startup_profile
+from plugins.core.reactions import reaction_mirror
+from plugins.core.router import get_router
+from plugins.core.ytdl import ytdl_service
 
 # Setup folders and files
 os.makedirs('cache', exist_ok=True)
@@ -16,11 +25,15 @@ os.makedirs('premium/premium_sessions', exist_ok=True)
 os.makedirs('data', exist_ok=True)
 
 # File paths
-PREMIUM_FILE = 'premium/premium.json'
 UPTIME_FILE = 'premium/uptime.json'
-PREFIX_FILE = 'premium/prefix.json'
 ACTIVE_CONNECTIONS_FILE = 'premium/active_connections.json'
 
+# Premium session restore
+RESTORE_CONCURRENCY = 10  # sessions connected at the same time
+RESTORE_TIMEOUT = 30      # seconds allowed per connect/authorize step
+RESTORE_RETRIES = 3       # attempts per session before giving up
+RESTORE_BACKOFF = 2       # seconds before the first retry, doubled each time
+
 logging.basicConfig(level=logging.WARNING)
 logging.getLogger('telethon').setLevel(logging.WARNING)
 
@@ -43,6 +56,7 @@ connect_bot = TelegramClient('cache/connect_bot_session', API_ID, API_HASH) if B
 
 # In-memory storage
 active_premium_sessions = {}  # {user_id: TelegramClient}
+restore_task = None  # background restore_premium_connections() task
 
 def print_success(message):
     """Print success message with green color and checkmark emoji"""
@@ -68,21 +82,6 @@ def print_premium(message):
     """Print premium message with special formatting"""
     print(f"{Colors.HEADER}🌟 {message}{Colors.ENDC}")
 
-def load_premium_users():
-    """Load premium users from file"""
-    try:
-        if os.path.exists(PREMIUM_FILE):
-            with open(PREMIUM_FILE, 'r') as f:
-                return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        pass
-    return {"users": []}
-
-def save_premium_users(data):
-    """Save premium users to file"""
-    with open(PREMIUM_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-
 def load_active_connections():
     """Load active premium connections from file"""
     try:
@@ -100,8 +99,7 @@ def save_active_connections(data):
 
 def is_premium(user_id):
     """Check if user is premium"""
-    premium_data = load_premium_users()
-    return str(user_id) in premium_data.get("users", [])
+    return premium_registry.is_premium(user_id)
 
 def get_uptime():
     """Calculate bot uptime"""
@@ -126,43 +124,92 @@ def get_uptime():
     
     return ' '.join(parts)
 
-def get_prefix():
-    """Get current prefix"""
-    try:
-        with open(PREFIX_FILE, 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        with open(PREFIX_FILE, 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
+async def restore_premium_session(user_id, session_str):
+    """Connect one saved session with timeout and retries.
+
+    Returns "restored", "unauthorized" or "failed".
+    """
+    last_error = None
+    for attempt in range(1, RESTORE_RETRIES + 1):
+        client = TelegramClient(StringSession(session_str), API_ID, API_HASH)
+        try:
+            await asyncio.wait_for(client.connect(), RESTORE_TIMEOUT)
+            authorized = await asyncio.wait_for(client.is_user_authorized(), RESTORE_TIMEOUT)
+        except Exception as e:
+            last_error = e
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+            if attempt < RESTORE_RETRIES:
+                await asyncio.sleep(RESTORE_BACKOFF * 2 ** (attempt - 1))
+            continue
+
+        if not authorized:
+            await client.disconnect()
+            return "unauthorized"
+
+        try:
+            # Load premium features for this client
+            await load_premium_features(client, user_id)
+        except Exception:
+            # Undo the half-installed tenant before the restore is reported failed
+            remove_tenant(user_id)
+            reaction_mirror.remove_client(user_id)
+            await client.disconnect()
+            raise
+        # Registered only once its handlers are all installed
+        active_premium_sessions[user_id] = client
+        return "restored"
+
+    print_error(f"Error restoring connection for {user_id}: {str(last_error) or type(last_error).__name__}")
+    return "failed"
 
 async def restore_premium_connections():
-    """Restore active premium connections on startup"""
-    connections_data = load_active_connections()
-    premium_users = load_premium_users().get("users", [])
+    """Restore active premium connections on startup (RESTORE_CONCURRENCY at a time)"""
+    connections = load_active_connections().get("connections", {})
     
     print_header("\n🔍 RESTORING PREMIUM CONNECTIONS")
-    print_info(f"Premium Users: {len(premium_users)}")
-    print_info(f"Saved Connections: {len(connections_data.get('connections', {}))}")
+    print_info(f"Premium Users: {len(premium_registry)}")
+    print_info(f"Saved Connections: {len(connections)}")
     
-    restored_count = 0
-    for user_id_str, session_str in connections_data.get("connections", {}).items():
-        try:
-            user_id = int(user_id_str)
-            client = TelegramClient(StringSession(session_str), API_ID, API_HASH)
-            await client.connect()
-            
-            if await client.is_user_authorized():
-                active_premium_sessions[user_id] = client
-                print_success(f"Restored connection for user {user_id}")
-                restored_count += 1
-                
-                # Load premium features for this client
-                await load_premium_features(client, user_id)
-        except Exception as e:
-            print_error(f"Error restoring connection for {user_id_str}: {str(e)}")
-    
-    print_info(f"Successfully restored: {restored_count} connections")
+    semaphore = asyncio.Semaphore(RESTORE_CONCURRENCY)
+    timings = {}  # {user_id: seconds}
+
+    async def restore(user_id_str, session_str):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                status = await restore_premium_session(int(user_id_str), session_str)
+            except Exception as e:
+                print_error(f"Error restoring connection for {user_id_str}: {str(e)}")
+                status = "failed"
+            elapsed = time.perf_counter() - start
+            timings[user_id_str] = elapsed
+            if status == "restored":
+                print_success(f"Restored connection for user {user_id_str} ({elapsed:.1f}s)")
+            elif status == "unauthorized":
+                print_warning(f"Session for user {user_id_str} is no longer authorized ({elapsed:.1f}s)")
+            return status
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(restore(uid, sess) for uid, sess in connections.items()))
+    total = time.perf_counter() - started
+    startup_profile.record('phase', 'premium restore', total)
+
+    restored_count = results.count("restored")
+    print_info(
+        f"Successfully restored: {restored_count} connections "
+        f"({results.count('unauthorized')} unauthorized, {results.count('failed')} failed) in {total:.1f}s"
+    )
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5]
+    if slowest:
+        print_info("Slowest: " + ", ".join(f"{uid} {secs:.1f}s" for uid, secs in slowest))
+    slow_plugins = premium_manifest.slowest()
+    if slow_plugins:
+        print_info("Slowest plugin setup: " + ", ".join(
+            f"{spec.name} {spec.setup_avg * 1000:.0f}ms" for spec in slow_plugins
+        ))
     return restored_count
 
 def get_connection(user_id):
@@ -184,6 +231,10 @@ def delete_connection(user_id):
         del connections_data["connections"][user_id_str]
         save_active_connections(connections_data)
     
+    # Stop routing shared bot handlers to this tenant
+    remove_tenant(user_id)
+    reaction_mirror.remove_client(user_id)
+    
     # Remove from active sessions if exists
     if user_id in active_premium_sessions:
         try:
@@ -194,27 +245,25 @@ def delete_connection(user_id):
         except:
             pass
 
+def build_premium_manifest():
+    """Import premium plugins once; tenants then only run their setup"""
+    start = time.perf_counter()
+    premium_manifest.build()
+    for module_name, error in premium_manifest.errors.items():
+        print_error(f"Error loading premium plugin {module_name}: {error}")
+    print_premium(
+        f"Premium plugins: {len(premium_manifest.plugins)} modules, "
+        f"{len(premium_manifest.commands())} commands ({time.perf_counter() - start:.2f}s)"
+    )
+
 async def load_premium_features(client, user_id):
     """Load premium features for a specific user connection"""
-    premium_dir = 'plugins/premium'
-    if not os.path.isdir(premium_dir):
-        return
+    # One NewMessage handler per client; plugins register commands on it
+    get_router(client, user_id)
 
-    loaded_features = []
-    for fname in os.listdir(premium_dir):
-        if fname.endswith('.py') and not fname.startswith('_'):
-            module_name = fname[:-3]
-            try:
-                module = importlib.import_module(f'plugins.premium.{module_name}')
-                if hasattr(module, 'setup'):
-                    setup_func = module.setup
-                    if inspect.iscoroutinefunction(setup_func):
-                        await setup_func(bot, client, user_id)  # Pass user ID
-                    else:
-                        setup_func(bot, client, user_id)
-                    loaded_features.append(module_name)
-            except Exception as e:
-                print_error(f"Error loading {module_name} for user {user_id}: {str(e)}")
+    loaded_features, failed = await premium_manifest.activate(bot, client, user_id)
+    for module_name, error in failed.items():
+        print_error(f"Error loading {module_name} for user {user_id}: {error}")
     
     if loaded_features:
         print_premium(f"User {user_id}: {', '.join(loaded_features)}")
@@ -243,32 +292,33 @@ async def load_plugins():
     # Load priority plugins first
     priority_loaded = 0
     for plugin in priority_plugins:
-        try:
-            module = importlib.import_module(f'plugins.{plugin}')
-            if hasattr(module, 'setup'):
-                setup_func = module.setup
-                # Special setup for addprem (only needs user client)
-                if plugin == 'addprem':
-                    if inspect.iscoroutinefunction(setup_func):
-                        await setup_func(user)
-                    else:
-                        setup_func(user)
-                # Special setup for connect (needs connect_bot)
-                elif plugin == 'connect':
-                    if connect_bot:
+        with startup_profile.phase(plugin, 'plugin'):
+            try:
+                module = importlib.import_module(f'plugins.{plugin}')
+                if hasattr(module, 'setup'):
+                    setup_func = module.setup
+                    # Special setup for addprem (only needs user client)
+                    if plugin == 'addprem':
                         if inspect.iscoroutinefunction(setup_func):
-                            await setup_func(connect_bot)
+                            await setup_func(user)
                         else:
-                            setup_func(connect_bot)
-                else:
-                    if inspect.iscoroutinefunction(setup_func):
-                        await setup_func(bot, user)
+                            setup_func(user)
+                    # Special setup for connect (needs connect_bot)
+                    elif plugin == 'connect':
+                        if connect_bot:
+                            if inspect.iscoroutinefunction(setup_func):
+                                await setup_func(connect_bot)
+                            else:
+                                setup_func(connect_bot)
                     else:
-                        setup_func(bot, user)
-                print_success(f"Priority-loaded: {plugin}")
-                priority_loaded += 1
-        except Exception as e:
-            print_error(f"Error loading {plugin}: {str(e)}")
+                        if inspect.iscoroutinefunction(setup_func):
+                            await setup_func(bot, user)
+                        else:
+                            setup_func(bot, user)
+                    print_success(f"Priority-loaded: {plugin}")
+                    priority_loaded += 1
+            except Exception as e:
+                print_error(f"Error loading {plugin}: {str(e)}")
 
     # Load other plugins
     other_loaded = 0
@@ -276,59 +326,88 @@ async def load_plugins():
         if fname.endswith('.py') and not fname.startswith('_'):
             module_name = fname[:-3]
             if module_name not in priority_plugins:
-                try:
-                    module = importlib.import_module(f'plugins.{module_name}')
-                    if hasattr(module, 'setup'):
-                        setup_func = module.setup
-                        if inspect.iscoroutinefunction(setup_func):
-                            await setup_func(bot, user)
-                        else:
-                            setup_func(bot, user)
-                        print_info(f"Loaded: {module_name}")
-                        other_loaded += 1
-                except Exception as e:
-                    print_error(f"Error: {module_name} - {str(e)}")
+                with startup_profile.phase(module_name, 'plugin'):
+                    try:
+                        module = importlib.import_module(f'plugins.{module_name}')
+                        if hasattr(module, 'setup'):
+                            setup_func = module.setup
+                            if inspect.iscoroutinefunction(setup_func):
+                                await setup_func(bot, user)
+                            else:
+                                setup_func(bot, user)
+                            print_info(f"Loaded: {module_name}")
+                            other_loaded += 1
+                    except Exception as e:
+                        print_error(f"Error: {module_name} - {str(e)}")
     
     print_info(f"Priority plugins: {priority_loaded}")
     print_info(f"Other plugins: {other_loaded}")
     print_info(f"Total plugins: {priority_loaded + other_loaded}")
 
+def print_startup_profile():
+    """Print where boot time went (run with --profile or ALFREAD_PROFILE=1)"""
+    print_header("\n⏱️  STARTUP PROFILE")
+    if restore_task and not restore_task.done():
+        print_warning("Premium restore still running, not included")
+    for line in startup_profile.report():
+        print_info(line)
+
 async def main():
+    global restore_task
+
     # Save start time
     with open(UPTIME_FILE, 'w') as f:
         json.dump({'start_time': time.time()}, f)
     
     print_header("\n🚀 STARTING BOT SYSTEM")
     
+    # yt-dlp workers are forked before any connection starts a thread
+    ytdl_service.start()
+    
+    # Shared HTTP session, reused by every plugin until shutdown
+    await http_client.start()
+    
     # Start main bot
-    await bot.start(bot_token=BOT_TOKEN)
+    with startup_profile.phase("bot start"):
+        await bot.start(bot_token=BOT_TOKEN)
     print_success("Main Bot Ready!")
     
     # Start connect bot if available
     if BOT_TOKEN2:
-        await connect_bot.start(bot_token=BOT_TOKEN2)
+        with startup_profile.phase("connect bot start"):
+            await connect_bot.start(bot_token=BOT_TOKEN2)
         print_success("Connect Bot Ready!")
     else:
         print_warning("Connect Bot Token not configured")
     
     # Initialize userbot
-    userbot_status = await init_userbot()
+    with startup_profile.phase("userbot connect"):
+        userbot_status = await init_userbot()
     if not userbot_status:
         print_warning("Userbot initialization failed - some features may not work")
     
-    # Restore active premium connections
-    await restore_premium_connections()
+    # Resolve premium plugins once before any tenant is activated
+    with startup_profile.phase("premium manifest"):
+        build_premium_manifest()
+    
+    # Restore active premium connections in the background so the bot
+    # starts answering while tenants are still reconnecting
+    restore_task = asyncio.create_task(restore_premium_connections())
     
     # Load plugins
-    await load_plugins()
+    with startup_profile.phase("plugin load"):
+        await load_plugins()
     
     # Display summary
-    premium_users = load_premium_users().get("users", [])
     print_header("\n📊 BOT MARTIN")
-    print_info(f"Premium Users: {len(premium_users)}")
-    print_info(f"Active Premium Sessions: {len(active_premium_sessions)}")
+    print_info(f"Premium Users: {len(premium_registry)}")
+    restoring = "" if restore_task.done() else " (restore in progress)"
+    print_info(f"Active Premium Sessions: {len(active_premium_sessions)}{restoring}")
     print_info(f"Uptime: {get_uptime()}")
     
+    if startup_profile.enabled:
+        print_startup_profile()
+    
     print_success("\n🤖 Bot Running...")
     await bot.run_until_disconnected()
 
@@ -343,6 +422,18 @@ if __name__ == '__main__':
     finally:
         print_header("\n🔌 SHUTTING DOWN")
         
+        # Stop a restore that is still running, and let it unwind before
+        # anything it may still use is flushed or closed
+        if restore_task and not restore_task.done():
+            restore_task.cancel()
+            try:
+                loop.run_until_complete(restore_task)
+            except (asyncio.CancelledError, Exception):
+                pass
+        
+        # Write any pending premium changes
+        premium_registry.flush()
+        
         # Disconnect all premium clients
         premium_count = len(active_premium_sessions)
         for user_id, client in active_premium_sessions.items():
@@ -363,6 +454,16 @@ if __name__ == '__main__':
             user.disconnect()
             print_info("Userbot disconnected")
         
+        # Stop yt-dlp worker processes and image threads
+        ytdl_service.shutdown()
+        image_pipeline.shutdown()
+        
+        # Close pooled HTTP connections
+        try:
+            loop.run_until_complete(http_client.close())
+        except Exception:
+            pass
+        
         print_info(f"Disconnected {premium_count} premium sessions")
         print_success("Shutdown completed successfully")
         
@@ -1,24 +1,12 @@
 import json
 import os
+from datetime import datetime
 from telethon import events
 from config import OWNER_ID
+from plugins.core.premium import premium_registry
 
-PREMIUM_FILE = 'premium/premium.json'
 NOMOR_FILE = 'data/nomor.json'
 
-def load_premium_users():
-    try:
-        if os.path.exists(PREMIUM_FILE):
-            with open(PREMIUM_FILE, 'r') as f:
-                return json.load(f)
-    except:
-        return {"users": []}
-    return {"users": []}
-
-def save_premium_users(data):
-    with open(PREMIUM_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-
 def load_nomor():
     try:
         if os.path.exists(NOMOR_FILE):
@@ -29,16 +17,17 @@ def load_nomor():
     return {}
 
 async def setup(user):
-    @user.on(events.NewMessage(pattern=r'^\.addprem(?:\s+(@?\w+))?$', from_users=OWNER_ID))
+    @user.on(events.NewMessage(pattern=r'^\.addprem(?:\s+(@?\w+))?(?:\s+(\d+)d?)?$', from_users=OWNER_ID))
     async def addprem_handler(event):
-        """Add premium user"""
+        """Add premium user (optionally for a number of days)"""
         target = event.pattern_match.group(1)
+        days = int(event.pattern_match.group(2)) if event.pattern_match.group(2) else None
         if not target:
             if event.is_reply:
                 replied = await event.get_reply_message()
                 target_id = replied.sender_id
             else:
-                await event.reply("❌ **Gunakan:** `.addprem @username` atau reply pesan")
+                await event.reply("❌ **Gunakan:** `.addprem @username [hari]` atau reply pesan")
                 return
         else:
             if target.startswith('@'):
@@ -55,11 +44,7 @@ async def setup(user):
                     await event.reply("❌ **ID harus angka atau username**")
                     return
 
-        premium_data = load_premium_users()
-        if str(target_id) not in premium_data["users"]:
-            premium_data["users"].append(str(target_id))
-            save_premium_users(premium_data)
-
+        if premium_registry.add(target_id, days):
             try:
                 await user.send_message(
                     target_id,
@@ -71,13 +56,13 @@ async def setup(user):
 
             await event.reply(f"✅ **Berhasil menambahkan premium untuk ID {target_id}**")
         else:
-            await event.reply("ℹ️ **Pengguna sudah premium**")
+            note = " (masa aktif diperbarui)" if days else ""
+            await event.reply(f"ℹ️ **Pengguna sudah premium{note}**")
 
     @user.on(events.NewMessage(pattern=r'^\.listprem$', from_users=OWNER_ID))
     async def listprem_handler(event):
         """List premium users"""
-        premium_data = load_premium_users()
-        users = premium_data.get("users", [])
+        users = premium_registry.users()
         
         if not users:
             await event.reply("❌ **Tidak ada pengguna premium**")
@@ -85,15 +70,17 @@ async def setup(user):
 
         message = "📋 **Daftar Pengguna Premium:**\n\n"
         for user_id in users:
+            expires = premium_registry.expires_at(user_id)
+            until = f" - s/d {datetime.fromtimestamp(expires):%d-%m-%Y}" if expires else ""
             try:
                 entity = await user.get_entity(int(user_id))
                 name = entity.first_name
                 if entity.last_name:
                     name += f" {entity.last_name}"
                 username = f"@{entity.username}" if entity.username else "No Username"
-                message += f"• {name} ({username}) - `{user_id}`\n"
+                message += f"• {name} ({username}) - `{user_id}`{until}\n"
             except Exception:
-                message += f"• `{user_id}`\n"
+                message += f"• `{user_id}`{until}\n"
 
         await event.reply(message)
 
@@ -23,6 +23,8 @@ from telethon.tl.types import (
     DocumentAttributeAudio
 )
 from config import OWNER_ID
+from plugins.core.participants import get_participant_service
+from plugins.core.scheduler import get_scheduler
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -122,6 +124,9 @@ def determine_media_type(message):
     return None
 
 async def setup(bot, user):
+    scheduler = get_scheduler(user)
+    participants = get_participant_service(user)
+
     # ===== PIN/UNPIN =====
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID))
     async def pin_handler(event):
@@ -553,47 +558,50 @@ async def setup(bot, user):
             return
 
         emoji_list = ["🔥", "⚡", "✨", "💥", "🚀", "🎯", "⚔️", "🌟", "🎉", "🛡️"]
-        mentions = []
 
         try:
             # Mark this chat as active
             active_tag_sessions.add(chat_id)
             await event.reply("<blockquote>🔄 <b>Memulai proses tag...</b></blockquote>", parse_mode="html")
 
-            # Collect participants
-            async for member in user.iter_participants(
-                chat_id, 
-                filter=ChannelParticipantsSearch("")
-            ):
+            # Stream members and send mentions in chunks of 5
+            total_members = await participants.count(chat_id)
+            await event.reply(f"<blockquote>✅ <b>Akan men-tag ±{total_members} anggota. Ketik .stag untuk membatalkan.</b></blockquote>", parse_mode="html")
+
+            chunk_size = 5
+            chunk = []
+            tagged = 0
+            stopped = False
+            async for member in participants.iter(chat_id, filter=ChannelParticipantsSearch("")):
+                if chat_id not in active_tag_sessions:
+                    stopped = True
+                    break
+
                 # Skip bots and self
                 if getattr(member, 'bot', False) or getattr(member, 'is_self', False):
                     continue
 
                 mention = f"<a href='tg://user?id={member.id}'>{member.first_name or 'User'}</a>"
                 emoji = random.choice(emoji_list)
-                mentions.append(f"{emoji} {mention}")
-
-            if not mentions:
-                await event.reply("<blockquote>❌ <b>Tidak ada member yang bisa di-tag</b></blockquote>", parse_mode="html")
-                return
-
-            # Send initial message
-            total_members = len(mentions)
-            await event.reply(f"<blockquote>✅ <b>Akan men-tag {total_members} anggota. Ketik .stag untuk membatalkan.</b></blockquote>", parse_mode="html")
-
-            # Send mentions in chunks of 5
-            chunk_size = 5
-            for i in range(0, len(mentions), chunk_size):
-                if chat_id not in active_tag_sessions:
-                    await event.reply("<blockquote>🛑 <b>Proses tag dihentikan</b></blockquote>", parse_mode="html")
-                    break
-
-                chunk = mentions[i:i + chunk_size]
+                chunk.append(f"{emoji} {mention}")
+                if len(chunk) == chunk_size:
+                    text = f"<b>{message}</b>\n\n" + "\n".join(chunk)
+                    await scheduler.run('send', user.send_message, chat_id, text, parse_mode="html", link_preview=False)
+                    tagged += len(chunk)
+                    chunk = []
+
+            stopped = stopped or chat_id not in active_tag_sessions
+            if chunk and not stopped:
                 text = f"<b>{message}</b>\n\n" + "\n".join(chunk)
-                await user.send_message(chat_id, text, parse_mode="html", link_preview=False)
-                await asyncio.sleep(1.5)  # Rate limiting
+                await scheduler.run('send', user.send_message, chat_id, text, parse_mode="html", link_preview=False)
+                tagged += len(chunk)
 
-            await event.reply(f"<blockquote>✅ <b>Selesai men-tag {total_members} anggota</b></blockquote>", parse_mode="html")
+            if stopped:
+                await event.reply("<blockquote>🛑 <b>Proses tag dihentikan</b></blockquote>", parse_mode="html")
+            elif not tagged:
+                await event.reply("<blockquote>❌ <b>Tidak ada member yang bisa di-tag</b></blockquote>", parse_mode="html")
+            else:
+                await event.reply(f"<blockquote>✅ <b>Selesai men-tag {tagged} anggota</b></blockquote>", parse_mode="html")
 
         except Exception as e:
             await event.reply(f"<blockquote>❌ <b>Gagal melakukan tag:</b> <code>{str(e)[:200]}</code></blockquote>", parse_mode="html")
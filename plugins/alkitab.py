@@ -1,10 +1,14 @@
 # alkitab.py
 import os
 import json
-import aiohttp
 from telethon import events
 from config import OWNER_ID
-from bs4 import BeautifulSoup
+from plugins.core.http import http_client
+from plugins.core.media_cache import get_media_cache, media_key
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+BeautifulSoup = lazy_import('bs4', 'BeautifulSoup')
 
 # File configuration
 CONFIG_DIR = 'data'
@@ -26,32 +30,34 @@ async def search_alkitab(query):
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/55.0.2883.87 Safari/537.36'
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    results = []
-                    verses = soup.find_all('div', class_='vw')
-                    
-                    for verse in verses:
-                        title = verse.find('a').get_text(strip=True)
-                        text = verse.find('p').get_text(strip=True)
-                        link = verse.find('a')['href']
-                        results.append({
-                            'title': title,
-                            'text': text,
-                            'link': link
-                        })
-                    
-                    return results
+        response = await http_client.get(url, headers=headers)
+        if response.status == 200:
+            html = response.text
+            soup = BeautifulSoup(html, 'html.parser')
+            
+            results = []
+            verses = soup.find_all('div', class_='vw')
+            
+            for verse in verses:
+                title = verse.find('a').get_text(strip=True)
+                text = verse.find('p').get_text(strip=True)
+                link = verse.find('a')['href']
+                results.append({
+                    'title': title,
+                    'text': text,
+                    'link': link
+                })
+            
+            return results
         return None
     except Exception as e:
         print(f"[ALKITAB] Error: {str(e)}")
         return None
 
 async def setup(bot, user):
+    # The bot uploads the header image once and re-sends it by reference
+    media_cache = get_media_cache(bot)
+
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID))
     async def alkitab_handler(event):
         msg = (event.text or '').strip()
@@ -102,9 +108,14 @@ async def setup(bot, user):
             else:
                 # Send with image for normal chats
                 image_url = "https://telegra.ph/file/a333442553b1bc336cc55.jpg"
-                await bot.send_file(
+
+                async def image():
+                    return image_url
+
+                await media_cache.send(
+                    media_key('url', image_url),
                     event.chat_id,
-                    image_url,
+                    image,
                     caption=f"{judul}\n\n{caption}",
                     reply_to=event.message
                 )
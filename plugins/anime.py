@@ -1,10 +1,13 @@
 # anime.py
 import json
 import os
-import aiohttp
-from bs4 import BeautifulSoup
 from telethon import events
 from config import OWNER_ID
+from plugins.core.http import http_client
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+BeautifulSoup = lazy_import('bs4', 'BeautifulSoup')
 
 # File configuration
 CONFIG_DIR = 'data'
@@ -33,88 +36,87 @@ async def scrape_mal_info(anime_name):
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
 
-        async with aiohttp.ClientSession() as session:
-            # Search for anime
-            async with session.get(search_url, headers=headers) as response:
-                if response.status != 200:
-                    return None
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Find first anime result link
-                result = soup.find('div', class_='js-categories-seasonal')
-                if not result:
-                    return None
-                    
-                anime_link = result.find('a', class_='hoverinfo_trigger')
-                if not anime_link:
-                    return None
-                    
-                anime_url = anime_link.get('href')
-                if not anime_url:
-                    return None
-                
-                # Get anime details page
-                async with session.get(anime_url, headers=headers) as anime_response:
-                    if anime_response.status != 200:
-                        return None
-                    
-                    anime_html = await anime_response.text()
-                    anime_soup = BeautifulSoup(anime_html, 'html.parser')
-                    
-                    # Extract information with better selectors
-                    title = await safe_get_text(anime_soup.find('h1', class_='title-name'))
-                    
-                    # Image extraction with fallback
-                    image = None
-                    img_tag = anime_soup.find('img', {'data-src': True}) or anime_soup.find('img', {'src': True})
-                    if img_tag:
-                        image = img_tag.get('data-src') or img_tag.get('src')
-                    
-                    # Extract details from information table
-                    details = {}
-                    info_div = anime_soup.find('div', id='contentWrapper')
-                    if info_div:
-                        for entry in info_div.find_all('div', class_='spaceit_pad'):
-                            if entry and ':' in entry.text:
-                                parts = entry.text.split(':', 1)
-                                if len(parts) == 2:
-                                    details[parts[0].strip()] = parts[1].strip()
-                    
-                    # Get synopsis
-                    synopsis_div = anime_soup.find('p', itemprop='description')
-                    synopsis = await safe_get_text(synopsis_div) if synopsis_div else 'N/A'
-                    
-                    # Get score
-                    score_div = anime_soup.find('div', class_='score-label')
-                    score = await safe_get_text(score_div) if score_div else 'N/A'
-                    
-                    # Get genres
-                    genres = []
-                    genre_tags = anime_soup.find_all('span', itemprop='genre')
-                    if genre_tags:
-                        genres = [await safe_get_text(tag) for tag in genre_tags]
-                    
-                    # Format the information
-                    anime_info = {
-                        'title': title,
-                        'picture': image or "https://via.placeholder.com/225x350.png?text=No+Image",
-                        'type': details.get('Type', 'N/A'),
-                        'episodes': details.get('Episodes', 'N/A'),
-                        'status': details.get('Status', 'N/A'),
-                        'premiered': details.get('Aired', 'N/A'),
-                        'genres': ', '.join(genres) if genres else 'N/A',
-                        'studios': details.get('Studios', 'N/A'),
-                        'score': score,
-                        'rating': details.get('Rating', 'N/A'),
-                        'ranked': details.get('Ranked', 'N/A'),
-                        'popularity': details.get('Popularity', 'N/A'),
-                        'synopsis': synopsis,
-                        'url': anime_url
-                    }
-                    
-                    return anime_info
+        # Search for anime
+        response = await http_client.get(search_url, headers=headers)
+        if response.status != 200:
+            return None
+        
+        html = response.text
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Find first anime result link
+        result = soup.find('div', class_='js-categories-seasonal')
+        if not result:
+            return None
+            
+        anime_link = result.find('a', class_='hoverinfo_trigger')
+        if not anime_link:
+            return None
+            
+        anime_url = anime_link.get('href')
+        if not anime_url:
+            return None
+        
+        # Get anime details page
+        anime_response = await http_client.get(anime_url, headers=headers)
+        if anime_response.status != 200:
+            return None
+        
+        anime_html = anime_response.text
+        anime_soup = BeautifulSoup(anime_html, 'html.parser')
+        
+        # Extract information with better selectors
+        title = await safe_get_text(anime_soup.find('h1', class_='title-name'))
+        
+        # Image extraction with fallback
+        image = None
+        img_tag = anime_soup.find('img', {'data-src': True}) or anime_soup.find('img', {'src': True})
+        if img_tag:
+            image = img_tag.get('data-src') or img_tag.get('src')
+        
+        # Extract details from information table
+        details = {}
+        info_div = anime_soup.find('div', id='contentWrapper')
+        if info_div:
+            for entry in info_div.find_all('div', class_='spaceit_pad'):
+                if entry and ':' in entry.text:
+                    parts = entry.text.split(':', 1)
+                    if len(parts) == 2:
+                        details[parts[0].strip()] = parts[1].strip()
+        
+        # Get synopsis
+        synopsis_div = anime_soup.find('p', itemprop='description')
+        synopsis = await safe_get_text(synopsis_div) if synopsis_div else 'N/A'
+        
+        # Get score
+        score_div = anime_soup.find('div', class_='score-label')
+        score = await safe_get_text(score_div) if score_div else 'N/A'
+        
+        # Get genres
+        genres = []
+        genre_tags = anime_soup.find_all('span', itemprop='genre')
+        if genre_tags:
+            genres = [await safe_get_text(tag) for tag in genre_tags]
+        
+        # Format the information
+        anime_info = {
+            'title': title,
+            'picture': image or "https://via.placeholder.com/225x350.png?text=No+Image",
+            'type': details.get('Type', 'N/A'),
+            'episodes': details.get('Episodes', 'N/A'),
+            'status': details.get('Status', 'N/A'),
+            'premiered': details.get('Aired', 'N/A'),
+            'genres': ', '.join(genres) if genres else 'N/A',
+            'studios': details.get('Studios', 'N/A'),
+            'score': score,
+            'rating': details.get('Rating', 'N/A'),
+            'ranked': details.get('Ranked', 'N/A'),
+            'popularity': details.get('Popularity', 'N/A'),
+            'synopsis': synopsis,
+            'url': anime_url
+        }
+        
+        return anime_info
     except Exception as e:
         print(f"[ANIME] Error scraping MAL: {str(e)}")
         return None
@@ -2,11 +2,10 @@ import os
 import json
 import re
 import asyncio
-import requests
-from io import BytesIO
-from PIL import Image
 from telethon import events
 from config import OWNER_ID
+from plugins.core.brat import brat_renderer
+from plugins.core.media_cache import get_media_cache, media_key
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -21,40 +20,9 @@ def get_live_prefix():
     except (FileNotFoundError, json.JSONDecodeError):
         return '.'
 
-async def generate_brat_image(text: str) -> BytesIO:
-    """
-    Generate a brat image from text using the caliphdev API
-    """
-    try:
-        response = requests.get(
-            "https://aqul-brat.hf.space",
-            params={'text': text},
-            stream=True,
-            timeout=15
-        )
-        response.raise_for_status()
-
-        # Convert to sticker format
-        img = Image.open(BytesIO(response.content)).convert("RGBA")
-        max_size = (512, 512)
-        img.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-        # Create transparent canvas
-        canvas = Image.new("RGBA", max_size, (0, 0, 0, 0))
-        x = (max_size[0] - img.width) // 2
-        y = (max_size[1] - img.height) // 2
-        canvas.paste(img, (x, y), img)
-
-        bio = BytesIO()
-        bio.name = "sticker.webp"
-        canvas.save(bio, format="WEBP", quality=95)
-        bio.seek(0)
-        return bio
-
-    except Exception as e:
-        raise Exception(f"Failed to generate brat image: {str(e)}")
-
 async def setup(bot, user):
+    media_cache = get_media_cache(user)
+
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID))
     async def brat_handler(event):
         """Generate brat sticker from text"""
@@ -94,13 +62,11 @@ async def setup(bot, user):
         status = await event.reply("<blockquote>🔄 Sedang membuat sticker brat...</blockquote>", parse_mode="html")
         
         try:
-            # Generate brat image and convert to sticker
-            sticker = await generate_brat_image(text)
-            
-            # Send sticker
-            await user.send_file(
+            # Generate brat image and convert to sticker (once per text)
+            await media_cache.send(
+                media_key('brat', text),
                 event.chat_id,
-                sticker,
+                lambda: brat_renderer.image(text),
                 reply_to=event.id if event.is_reply else None,
                 force_document=False,
                 attributes=[],
@@ -1,9 +1,11 @@
 import os
 import json
 import asyncio
-from telethon import events, types
+from telethon import events
 from telethon.tl.types import Channel, Chat, User
 from config import OWNER_ID
+from plugins.core.broadcast import COPY, FORWARD, BroadcastPayload, split_mode
+from plugins.core.dialogs import get_dialog_index
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -54,7 +56,7 @@ async def setup(bot, user):
     blacklist = load_blacklist()
 
     # Helper function to send messages
-    async def send_broadcast(event, content, reply, is_group=False):
+    async def send_broadcast(event, content, reply, is_group=False, mode=COPY):
         success = 0
         failed = 0
         target_type = "grup" if is_group else "chat pribadi"
@@ -64,35 +66,16 @@ async def setup(bot, user):
             parse_mode="html"
         )
 
-        async for dialog in user.iter_dialogs():
-            if dialog.id in blacklist:
-                continue
-                
-            if is_group and not dialog.is_group:
-                continue
-            if not is_group and (not dialog.is_user or getattr(dialog.entity, 'bot', False) or dialog.id == OWNER_ID):
+        # Resolve the message once; media is re-sent by reference, not re-uploaded
+        payload = await BroadcastPayload.create(user, content, reply, mode)
+
+        dialogs = await get_dialog_index(user)
+        for dialog in (dialogs.groups() if is_group else dialogs.users()):
+            if dialog.id in blacklist or dialog.id == OWNER_ID:
                 continue
 
             try:
-                if reply:
-                    if reply.media:
-                        if isinstance(reply.media, types.MessageMediaPhoto):
-                            await user.send_file(dialog.id, reply.photo, caption=reply.text)
-                        elif isinstance(reply.media, types.MessageMediaDocument):
-                            if reply.document.mime_type == 'video/mp4':
-                                await user.send_file(dialog.id, reply.video, caption=reply.text)
-                            elif reply.document.mime_type == 'audio/ogg':  # Voice note
-                                await user.send_file(dialog.id, reply.voice, voice_note=True)
-                            elif reply.sticker:
-                                await user.send_file(dialog.id, reply.sticker)
-                            else:
-                                await user.send_file(dialog.id, reply.document, caption=reply.text)
-                        else:
-                            await user.send_file(dialog.id, reply.media, caption=reply.text)
-                    else:
-                        await user.send_message(dialog.id, reply.text)
-                else:
-                    await user.send_message(dialog.id, content)
+                await payload.send(user, dialog.id)
                 
                 success += 1
                 await asyncio.sleep(broadcast_delay)
@@ -139,14 +122,18 @@ async def setup(bot, user):
                 return
             content = msg[5:].strip()
 
+        mode, content = split_mode(content)
         reply = await event.get_reply_message()
         if not content and not reply:
             await event.edit("<blockquote>❌ Balas pesan atau ketik pesan</blockquote>", parse_mode="html")
             return
+        if mode == FORWARD and not reply:
+            await event.edit("<blockquote>❌ -fwd harus membalas pesan</blockquote>", parse_mode="html")
+            return
         
         try:
             await event.delete()
-            await send_broadcast(event, content, reply, is_group=True)
+            await send_broadcast(event, content, reply, is_group=True, mode=mode)
         except Exception as e:
             await event.reply(f"<blockquote>❌ Gagal broadcast: {str(e)}</blockquote>", parse_mode="html")
 
@@ -170,14 +157,18 @@ async def setup(bot, user):
                 return
             content = msg[5:].strip()
 
+        mode, content = split_mode(content)
         reply = await event.get_reply_message()
         if not content and not reply:
             await event.edit("<blockquote>❌ Balas pesan atau ketik pesan</blockquote>", parse_mode="html")
             return
+        if mode == FORWARD and not reply:
+            await event.edit("<blockquote>❌ -fwd harus membalas pesan</blockquote>", parse_mode="html")
+            return
         
         try:
             await event.delete()
-            await send_broadcast(event, content, reply, is_group=False)
+            await send_broadcast(event, content, reply, is_group=False, mode=mode)
         except Exception as e:
             await event.reply(f"<blockquote>❌ Gagal broadcast: {str(e)}</blockquote>", parse_mode="html")
 
@@ -386,7 +377,8 @@ async def setup(bot, user):
             "<blockquote><b>📢 Panduan Broadcast</b></blockquote>\n\n"
             "<blockquote><b>• Broadcast:</b></blockquote>\n"
             f"<blockquote>{prefix}gcast [pesan/reply] - Broadcast ke semua grup\n"
-            f"{prefix}ucast [pesan/reply] - Broadcast ke semua chat pribadi</blockquote>\n\n"
+            f"{prefix}ucast [pesan/reply] - Broadcast ke semua chat pribadi\n"
+            f"{prefix}gcast -fwd [reply] - Teruskan tanpa nama pengirim</blockquote>\n\n"
             "<blockquote><b>• Pengaturan:</b></blockquote>\n"
             f"<blockquote>{prefix}setdelay [detik] - Atur delay pengiriman\n"
             f"{prefix}addbl [id] - Tambah chat/grup ke blacklist\n"
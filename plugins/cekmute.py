@@ -1,8 +1,8 @@
 from telethon import events
-from telethon.tl.functions.channels import GetParticipantsRequest
 from telethon.tl.types import ChannelParticipantsBanned
 from config import OWNER_ID
-import asyncio
+from plugins.core.participants import get_participant_service
+from plugins.core.scheduler import get_scheduler
 import math
 import time
 import json
@@ -48,6 +48,9 @@ def format_username(user):
     return username
 
 async def setup(bot, user):
+    scheduler = get_scheduler(user)
+    participants = get_participant_service(user)
+
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID))
     async def cekmute_handler(event):
         msg = (event.text or '').strip()
@@ -83,14 +86,7 @@ async def setup(bot, user):
         processing_msg = None
         try:
             # Get total muted count
-            total_result = await user(GetParticipantsRequest(
-                channel=await event.get_input_chat(),
-                filter=ChannelParticipantsBanned(q=''),
-                offset=0,
-                limit=1,
-                hash=0
-            ))
-            total_muted = total_result.count
+            total_muted = await participants.count(event.chat_id, filter=ChannelParticipantsBanned)
 
             # Start processing
             start_time = time.time()
@@ -103,16 +99,12 @@ async def setup(bot, user):
             # Process muted members
             muted_users = []
             processed = 0
-            async for participant in user.iter_participants(
-                event.chat_id,
-                filter=ChannelParticipantsBanned,
-                aggressive=True
-            ):
+            async for participant in participants.iter(event.chat_id, filter=ChannelParticipantsBanned):
                 processed += 1
                 percent = math.floor((processed/total_muted)*100) if total_muted > 0 else 0
                 
-                # Update progress every 5% or 100 users
-                if processed % 100 == 0 or percent % 5 == 0:
+                # Update progress every 5% or 100 users, when an edit slot is free
+                if (processed % 100 == 0 or percent % 5 == 0) and scheduler.try_slot('edit'):
                     try:
                         await processing_msg.edit(
                             "<blockquote>🔄 <b>Memproses</b> <code>{}</code> <b>member... ({}%)</b>\n"
@@ -126,7 +118,6 @@ async def setup(bot, user):
                 
                 username = format_username(participant)
                 muted_users.append(f"‣ <a href='tg://user?id={participant.id}'>{username}</a>")
-                await asyncio.sleep(0.02)
 
             # Delete processing message
             await processing_msg.delete()
@@ -135,12 +126,13 @@ async def setup(bot, user):
             chunk_size = 30
             for i in range(0, len(muted_users), chunk_size):
                 chunk = muted_users[i:i+chunk_size]
-                await event.reply(
+                await scheduler.run(
+                    'send',
+                    event.reply,
                     "<blockquote>{}</blockquote>".format("\n".join(chunk)),
                     parse_mode="html",
                     link_preview=False
                 )
-                await asyncio.sleep(1)
 
             # Update cooldown
             set_cooldown()
@@ -9,7 +9,8 @@ from telethon.sessions import StringSession
 from telethon.tl.types import MessageEntityCode
 from telethon.errors import SessionPasswordNeededError, UserAlreadyParticipantError, InviteHashExpiredError, InviteHashInvalidError
 from config import API_ID, API_HASH, OWNER_ID, BOT_USERNAME2
-from alfread import is_premium, set_connection, active_premium_sessions, load_premium_features
+from alfread import set_connection, active_premium_sessions, load_premium_features
+from plugins.core.premium import premium_registry
 
 NOMOR_FILE = 'data/nomor.json'
 VERIFICATION_FILE = 'data/verification.json'
@@ -260,7 +261,7 @@ async def setup(connect_bot):
                 )
                 return
         
-        if not is_premium(user_id):
+        if not premium_registry.is_premium(user_id):
             buttons = [
                 [Button.url("🛒 Beli Premium", "https://t.me/alfreadRorw?text=Alfread+Ganteng+Userbot+Nya+Berapaan")]
             ]
@@ -0,0 +1 @@
+# plugins/core: shared services used by the plugin modules (not loaded as plugins)
@@ -0,0 +1,208 @@
+# plugins/core/admins.py
+import asyncio
+import json
+import logging
+import os
+import time
+import weakref
+from telethon import events, utils
+from telethon.tl.types import (
+    ChannelParticipantAdmin,
+    ChannelParticipantCreator,
+    ChannelParticipantsAdmins,
+    ChatParticipantCreator,
+    PeerChannel,
+    PeerChat,
+    UpdateChannelParticipant,
+    UpdateChatParticipantAdmin,
+    UpdateChatParticipants,
+)
+from plugins.core.config import get_user_folder
+from plugins.core.dialogs import get_dialog_index
+from plugins.core.peers import pack_peer
+
+logger = logging.getLogger(__name__)
+
+ADMIN_INDEX_FILE = 'admin_index.json'
+# Seconds a chat's admin list is trusted without any admin-change update
+ADMINS_TTL = 6 * 3600
+
+def rights_list(admin_rights):
+    """Names of the rights set in a ChatAdminRights"""
+    if admin_rights is None:
+        return []
+    return sorted(k for k, v in admin_rights.to_dict().items() if k != '_' and v is True)
+
+def is_basic_group(chat_id):
+    """True for a basic group (PeerChat), whose admins hold every right"""
+    return utils.resolve_id(chat_id)[1] is PeerChat
+
+class AdminIndex:
+    """Admin rights of one tenant, cached and persisted across restarts.
+
+    Two tables: the chats where this account is an admin (with which
+    rights), derived from the dialog index, and the admins of chats that
+    were asked about, fetched lazily. Participant/admin-change updates
+    drop or patch the affected entries.
+    """
+
+    def __init__(self, client, user_id=None):
+        self.client = client
+        self.path = os.path.join(get_user_folder(user_id), ADMIN_INDEX_FILE)
+        self.my_rights = {}    # {chat_id: {'title', 'creator', 'rights', 'peer'}}
+        self.chat_admins = {}  # {chat_id: {'fetched_at', 'admins': [admin dict]}}
+        self.me_id = None
+        self.synced = False    # my_rights rebuilt from dialogs since start
+        self._sync_task = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self.my_rights = {int(k): v for k, v in data.get('my_rights', {}).items()}
+        self.chat_admins = {int(k): v for k, v in data.get('chat_admins', {}).items()}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'my_rights': self.my_rights, 'chat_admins': self.chat_admins}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error("Could not save %s: %s", self.path, e)
+
+    def install(self):
+        self.client.add_event_handler(
+            self._on_update,
+            events.Raw((UpdateChannelParticipant, UpdateChatParticipantAdmin, UpdateChatParticipants))
+        )
+
+    async def _me(self):
+        if self.me_id is None:
+            me = await self.client.get_me(input_peer=True)
+            self.me_id = getattr(me, 'user_id', None)
+        return self.me_id
+
+    # Chats where I am admin
+
+    async def sync(self):
+        """Rebuild my_rights from the dialog index"""
+        dialogs = await get_dialog_index(self.client)
+        self.my_rights = {
+            entry.id: {
+                'title': entry.name,
+                'creator': entry.is_creator,
+                'rights': rights_list(getattr(entry.entity, 'admin_rights', None)),
+                'peer': pack_peer(entry.entity),
+            }
+            for entry in dialogs.admin_groups()
+        }
+        self.synced = True
+        self.save()
+
+    async def my_admin_chats(self, right=None):
+        """{chat_id: info} of groups where I am admin (and hold `right`, if given).
+
+        Answers from the persisted table at once; the first call after a
+        restart refreshes it in the background. 'peer' (see plugins.core.peers)
+        lets callers reach a chat before the session has cached it; a table
+        saved without peers is rebuilt before answering.
+        """
+        no_peers = any('peer' not in info for info in self.my_rights.values())
+        if not self.synced and (not self.my_rights or no_peers):
+            await self.sync()
+        elif not self.synced and (self._sync_task is None or self._sync_task.done()):
+            self._sync_task = asyncio.create_task(self.sync())
+        # Basic-group admins have no rights list: they hold every right. A
+        # supergroup admin with an empty list holds none.
+        return {
+            chat_id: info for chat_id, info in self.my_rights.items()
+            if right is None or info['creator'] or is_basic_group(chat_id) or right in info['rights']
+        }
+
+    # Admins of a chat
+
+    async def admins(self, chat_id, refresh=False):
+        """Admins of a chat as dicts: id, first_name, last_name, username, bot, creator, rank, rights"""
+        cached = self.chat_admins.get(chat_id)
+        if cached and not refresh and time.time() - cached['fetched_at'] < ADMINS_TTL:
+            return cached['admins']
+
+        admins = []
+        async for user in self.client.iter_participants(chat_id, filter=ChannelParticipantsAdmins):
+            participant = getattr(user, 'participant', None)
+            admins.append({
+                'id': user.id,
+                'first_name': getattr(user, 'first_name', None),
+                'last_name': getattr(user, 'last_name', None),
+                'username': getattr(user, 'username', None),
+                'bot': bool(getattr(user, 'bot', False)),
+                'creator': isinstance(participant, (ChannelParticipantCreator, ChatParticipantCreator)),
+                'rank': getattr(participant, 'rank', None),
+                'rights': rights_list(getattr(participant, 'admin_rights', None)),
+            })
+        self.chat_admins[chat_id] = {'fetched_at': time.time(), 'admins': admins}
+        self.save()
+        return admins
+
+    def invalidate(self, chat_id):
+        """Drop the cached admin list of a chat"""
+        if self.chat_admins.pop(chat_id, None) is not None:
+            self.save()
+
+    async def _on_update(self, update):
+        if isinstance(update, UpdateChannelParticipant):
+            chat_id = utils.get_peer_id(PeerChannel(update.channel_id))
+        elif isinstance(update, UpdateChatParticipantAdmin):
+            chat_id = utils.get_peer_id(PeerChat(update.chat_id))
+        else:
+            chat_id = utils.get_peer_id(PeerChat(update.participants.chat_id))
+            self.invalidate(chat_id)
+            return
+
+        self.invalidate(chat_id)
+        if update.user_id != await self._me():
+            return
+
+        # My own rights changed
+        info = self.my_rights.get(chat_id)
+        if info is None:
+            info = {'title': str(chat_id), 'creator': False, 'rights': [], 'peer': None}
+            # Newly promoted: take the chat from the update, or the session cache
+            entity = getattr(update, '_entities', {}).get(chat_id)
+            if entity is not None:
+                info['title'] = getattr(entity, 'title', info['title'])
+                info['peer'] = pack_peer(entity)
+            else:
+                try:
+                    info['peer'] = pack_peer(await self.client.get_input_entity(chat_id))
+                except ValueError:
+                    pass
+        if isinstance(update, UpdateChatParticipantAdmin):
+            is_admin = update.is_admin
+            info['rights'] = []
+        else:
+            new = update.new_participant
+            is_admin = isinstance(new, (ChannelParticipantAdmin, ChannelParticipantCreator))
+            info['creator'] = isinstance(new, ChannelParticipantCreator)
+            info['rights'] = rights_list(getattr(new, 'admin_rights', None))
+        if is_admin:
+            self.my_rights[chat_id] = info
+        else:
+            self.my_rights.pop(chat_id, None)
+        self.save()
+
+# {TelegramClient: AdminIndex}
+_indexes = weakref.WeakKeyDictionary()
+
+def get_admin_index(client, user_id=None):
+    """Get the admin index of a tenant's client, loading it from disk on first use"""
+    index = _indexes.get(client)
+    if index is None:
+        index = _indexes[client] = AdminIndex(client, user_id)
+        index.install()
+    return index
@@ -0,0 +1,52 @@
+# plugins/core/bot_handlers.py
+import weakref
+
+# {bot TelegramClient: SharedBotHandlers}
+_shared = weakref.WeakKeyDictionary()
+
+class SharedBotHandlers:
+    """Handlers on the shared main bot, installed once for all tenants.
+
+    Premium plugins run setup() once per tenant, but handlers added to the
+    shared bot must exist only once. Handlers registered with on() are keyed
+    by their qualified name, so later tenants reuse the first one. They must
+    not close over per-tenant variables; use tenant() to find the tenant
+    that belongs to the sender instead.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.installed = set()  # handler keys
+        self.tenants = {}       # {user_id: TelegramClient}
+
+    def on(self, event, key=None):
+        """Decorator: bot.add_event_handler(func, event) unless already installed"""
+        def decorator(func):
+            handler_key = key or f'{func.__module__}.{func.__qualname__}'
+            if handler_key not in self.installed:
+                self.installed.add(handler_key)
+                self.bot.add_event_handler(func, event)
+            return func
+        return decorator
+
+    def add_tenant(self, user_id, client):
+        self.tenants[user_id] = client
+
+    def remove_tenant(self, user_id):
+        self.tenants.pop(user_id, None)
+
+    def tenant(self, sender_id):
+        """Client of the tenant with this user id, or None"""
+        return self.tenants.get(sender_id)
+
+def get_bot_handlers(bot):
+    """Get the shared handler registry of a bot"""
+    shared = _shared.get(bot)
+    if shared is None:
+        shared = _shared[bot] = SharedBotHandlers(bot)
+    return shared
+
+def remove_tenant(user_id):
+    """Forget a disconnected tenant on every bot"""
+    for shared in list(_shared.values()):
+        shared.remove_tenant(user_id)
@@ -0,0 +1,272 @@
+# plugins/core/brat.py
+import asyncio
+import logging
+import math
+from functools import lru_cache
+from io import BytesIO
+from plugins.core.ffmpeg import ffmpeg_runner
+from plugins.core.http import http_client
+from plugins.core.images import image_pipeline, to_sticker
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFilter = lazy_import('PIL.ImageFilter')
+ImageFont = lazy_import('PIL.ImageFont')
+
+logger = logging.getLogger(__name__)
+
+# Draw stickers with Pillow; the APIs below are only used when that fails
+LOCAL_RENDER = True
+REMOTE_URLS = (
+    'https://aqul-brat.hf.space/',
+    'https://brat.caliphdev.com/api/brat',
+)
+
+FONT_FILE = "data/fonts/Arial.ttf"
+SIZE = 512
+MARGIN = 28
+MIN_FONT_SIZE = 24
+# Smallest size tried, with long words broken, before the API takes over
+FLOOR_FONT_SIZE = 12
+MAX_FONT_SIZE = 200
+LINE_HEIGHT = 1.15
+BLUR = 1.2
+
+# Video: seconds each step shows, seconds the full text stays, total cap
+STEP_SECONDS = 0.5
+HOLD_SECONDS = 3
+MAX_SECONDS = 10
+
+VIDEO_OUTPUT = [
+    '-c:v', 'libvpx-vp9',
+    '-b:v', '500k',
+    '-crf', '37',
+    '-auto-alt-ref', '0',
+    '-deadline', 'realtime',
+    '-cpu-used', '8',
+    '-an',
+    '-t', str(MAX_SECONDS),
+    '-f', 'webm',
+    'pipe:1'
+]
+
+class BratTextTooLong(Exception):
+    """The text does not fit on a sticker even at FLOOR_FONT_SIZE"""
+
+# Layout (runs in the image pool)
+
+@lru_cache(maxsize=64)
+def _font(size):
+    return ImageFont.truetype(FONT_FILE, size)
+
+@lru_cache(maxsize=8192)
+def _width(size, word):
+    return _font(size).getlength(word)
+
+def _split(word, size, box):
+    """Pieces of a word too wide for the box, each as long as fits"""
+    pieces, piece = [], ''
+    for char in word:
+        if piece and _width(size, piece + char) > box:
+            pieces.append(piece)
+            piece = ''
+        piece += char
+    pieces.append(piece)
+    return pieces
+
+def _wrap(words, size, split=False):
+    """Greedy line breaks at one font size; None if the text does not fit.
+
+    With split, words wider than the box are broken by character
+    instead of failing.
+    """
+    box = SIZE - 2 * MARGIN
+    space = _width(size, ' ')
+    if split:
+        words = [piece for word in words
+                 for piece in (_split(word, size, box) if _width(size, word) > box else (word,))]
+    lines, line, used = [], [], 0.0
+    for word in words:
+        width = _width(size, word)
+        if width > box:
+            return None
+        if line and used + space + width > box:
+            lines.append(line)
+            line, used = [], 0.0
+        used += (space if line else 0) + width
+        line.append(word)
+    lines.append(line)
+    if len(lines) * size * LINE_HEIGHT > box:
+        return None
+    return lines
+
+@lru_cache(maxsize=256)
+def layout(text):
+    """(font size, [(word, x, y)]) of the largest size that fits, justified.
+
+    Raises BratTextTooLong when the text does not fit at any size.
+    """
+    words = tuple(text.split())
+    lo, hi = MIN_FONT_SIZE, MAX_FONT_SIZE
+    best = None
+    while lo <= hi:
+        size = (lo + hi) // 2
+        lines = _wrap(words, size)
+        if lines is None:
+            hi = size - 1
+        else:
+            best = (size, lines)
+            lo = size + 1
+    if best is None:
+        # Very long words or text: break words by character and shrink
+        # below MIN_FONT_SIZE until it fits
+        for size in range(MIN_FONT_SIZE, FLOOR_FONT_SIZE - 1, -2):
+            lines = _wrap(words, size, split=True)
+            if lines is not None:
+                break
+        else:
+            raise BratTextTooLong(f"{len(text)} characters do not fit on a sticker")
+    else:
+        size, lines = best
+
+    box = SIZE - 2 * MARGIN
+    placements = []
+    for row, line in enumerate(lines):
+        y = MARGIN + row * size * LINE_HEIGHT
+        widths = [_width(size, word) for word in line]
+        last = row == len(lines) - 1
+        gap = _width(size, ' ')
+        if not last and len(line) > 1:
+            gap = (box - sum(widths)) / (len(line) - 1)
+        x = MARGIN
+        for word, width in zip(line, widths):
+            placements.append((word, x, y))
+            x += width + gap
+    return size, placements
+
+def _frame(canvas):
+    return canvas.filter(ImageFilter.GaussianBlur(BLUR))
+
+def render_image(text):
+    """Brat sticker as webp bytes"""
+    size, placements = layout(text)
+    canvas = Image.new('RGB', (SIZE, SIZE), 'white')
+    draw = ImageDraw.Draw(canvas)
+    font = _font(size)
+    for word, x, y in placements:
+        draw.text((x, y), word, font=font, fill='black')
+    output = BytesIO()
+    _frame(canvas).save(output, 'WEBP', quality=95)
+    return output.getvalue()
+
+def video_steps(count):
+    """Words revealed per step, so the full text shows within MAX_SECONDS"""
+    steps = int((MAX_SECONDS - HOLD_SECONDS) / STEP_SECONDS)
+    return max(1, math.ceil(count / steps))
+
+def render_frames(text):
+    """Raw rgb24 frames revealing the text word by word, and their count.
+
+    Every frame uses the layout of the full text, so each word is drawn
+    once onto a running canvas where it will end up.
+    """
+    size, placements = layout(text)
+    canvas = Image.new('RGB', (SIZE, SIZE), 'white')
+    draw = ImageDraw.Draw(canvas)
+    font = _font(size)
+    per_step = video_steps(len(placements))
+    frames = []
+    for i, (word, x, y) in enumerate(placements, 1):
+        draw.text((x, y), word, font=font, fill='black')
+        if i % per_step == 0 or i == len(placements):
+            frames.append(_frame(canvas).tobytes())
+    return b''.join(frames), len(frames)
+
+class BratRenderer:
+    """Brat stickers and video stickers.
+
+    Text is laid out once per text (font size, line breaks, word
+    positions) with fonts and word widths cached, and drawn with Pillow in
+    the image pool. Video frames are piped to ffmpeg as raw video, so no
+    frame or list files are written. The brat APIs are a fallback for when
+    the local renderer fails (no Pillow, missing font).
+    """
+
+    def __init__(self, local=LOCAL_RENDER):
+        self.local = local
+        self.rendered = 0
+        self.remote = 0
+
+    async def _fetch(self, text):
+        """Image bytes for text from the first API that answers"""
+        for url in REMOTE_URLS:
+            try:
+                response = await http_client.get(url, params={'text': text}, timeout=15)
+                if response.ok:
+                    self.remote += 1
+                    return response.content
+            except Exception:
+                continue
+        raise Exception("Semua API tidak merespon")
+
+    async def _local(self, func, text):
+        if not self.local:
+            return None
+        try:
+            result = await image_pipeline.run(f'brat.{func.__name__}', func, text)
+            self.rendered += 1
+            return result
+        except (ImportError, OSError, BratTextTooLong) as e:
+            logger.warning("Local brat renderer failed, using the API: %s", e)
+            return None
+
+    @staticmethod
+    def _check(text):
+        if not text.split():
+            raise ValueError("Teks kosong")
+
+    async def image(self, text):
+        """Brat sticker of text, as a BytesIO named sticker.webp"""
+        self._check(text)
+        data = await self._local(render_image, text)
+        if data is None:
+            data = await image_pipeline.convert(await self._fetch(text), to_sticker, op='brat.remote')
+        sticker = BytesIO(data)
+        sticker.name = "sticker.webp"
+        return sticker
+
+    async def video(self, text):
+        """Video sticker revealing text word by word: (BytesIO, seconds)"""
+        self._check(text)
+        words = text.split()
+        per_step = video_steps(len(words))
+        rendered = await self._local(render_frames, text)
+        if rendered is not None:
+            frames, count = rendered
+            source = ['-f', 'rawvideo', '-pixel_format', 'rgb24', '-video_size', f'{SIZE}x{SIZE}']
+            fit = ''
+        else:
+            prefixes = [' '.join(words[:i]) for i in range(per_step, len(words), per_step)]
+            prefixes.append(text)
+            images = await asyncio.gather(*(self._fetch(prefix) for prefix in prefixes))
+            frames, count = b''.join(images), len(images)
+            source = ['-f', 'image2pipe']
+            fit = (f'scale={SIZE}:{SIZE}:force_original_aspect_ratio=decrease,'
+                   f'pad={SIZE}:{SIZE}:(ow-iw)/2:(oh-ih)/2:white,')
+
+        data = await ffmpeg_runner.run([
+            *source, '-framerate', str(1 / STEP_SECONDS), '-i', 'pipe:0',
+            '-vf', f'{fit}tpad=stop_mode=clone:stop_duration={HOLD_SECONDS},fps=30,format=yuv420p',
+            *VIDEO_OUTPUT
+        ], input=frames)
+
+        sticker = BytesIO(data)
+        sticker.name = "sticker.webm"
+        return sticker, min(MAX_SECONDS, math.ceil(count * STEP_SECONDS + HOLD_SECONDS))
+
+    def stats(self):
+        return {'rendered': self.rendered, 'remote': self.remote}
+
+brat_renderer = BratRenderer()
@@ -0,0 +1,419 @@
+# plugins/core/broadcast.py
+import asyncio
+import json
+import logging
+import os
+import time
+from telethon import errors, types, utils
+from telethon.extensions import html
+from telethon.tl.functions.messages import ForwardMessagesRequest, SendMediaRequest
+from plugins.core.config import get_user_folder
+from plugins.core.dialogs import get_dialog_index
+from plugins.core.peers import unpack_peer
+from plugins.core.scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Folder (inside the tenant folder) holding the files of unfinished jobs
+JOBS_DIR = 'broadcast_jobs'
+# Per job: the progress checkpoint, the target snapshot (written once) and
+# the failed targets (appended as JSON lines)
+PROGRESS_SUFFIX = '.json'
+TARGETS_SUFFIX = '.targets'
+FAILED_SUFFIX = '.failed'
+# Targets sent between two progress saves
+SAVE_EVERY = 20
+
+# Payload modes: copy re-sends text and media by reference, forward lets the
+# server copy the message without the "Forwarded from" header
+COPY = 'copy'
+FORWARD = 'forward'
+
+RUNNING = 'running'
+PAUSED = 'paused'
+CANCELLED = 'cancelled'
+DONE = 'done'
+
+class SourceDeleted(Exception):
+    """The message a job copies or forwards no longer exists"""
+
+def split_mode(args):
+    """Split a leading -fwd flag off gcast/ucast arguments"""
+    parts = args.split(None, 1)
+    if parts and parts[0].lower() == "-fwd":
+        return FORWARD, parts[1] if len(parts) > 1 else ""
+    return COPY, args
+
+class BroadcastPayload:
+    """A broadcast message resolved once and then sent to every target.
+
+    Typed text is parsed once; a copied message keeps its raw text and
+    entities, and its media is turned into an input reference once, so no
+    target re-downloads or re-uploads the file.
+    """
+
+    def __init__(self, text=None, entities=None, media=None, source=None, from_peer=None, mode=COPY):
+        self.text = text
+        self.entities = entities
+        self.media = media          # InputMedia, or None for text messages
+        self.source = source        # Message being copied or forwarded
+        self.from_peer = from_peer  # InputPeer of the source chat
+        self.mode = mode
+
+    @classmethod
+    async def create(cls, client, content=None, source=None, mode=COPY):
+        if source is None:
+            text, entities = html.parse(content or '')
+            return cls(text, entities)
+
+        from_peer = await source.get_input_chat()
+        if mode == FORWARD:
+            return cls(source=source, from_peer=from_peer, mode=FORWARD)
+        return cls(source.message, source.entities, cls._input_media(source), source, from_peer)
+
+    @staticmethod
+    def _input_media(source):
+        if not source.media or isinstance(source.media, types.MessageMediaWebPage):
+            return None
+        try:
+            return utils.get_input_media(source.media)
+        except TypeError:
+            return None
+
+    async def _refresh(self, client):
+        """Re-fetch the source after its file reference expired"""
+        self.source = await client.get_messages(self.from_peer, ids=self.source.id)
+        self.media = self._input_media(self.source)
+
+    async def send(self, client, chat_id):
+        if self.mode == FORWARD:
+            return await client(ForwardMessagesRequest(
+                from_peer=self.from_peer,
+                id=[self.source.id],
+                to_peer=chat_id,
+                drop_author=True
+            ))
+        if self.media is None:
+            return await client.send_message(chat_id, self.text, formatting_entities=self.entities)
+        try:
+            return await client(SendMediaRequest(
+                peer=chat_id, media=self.media, message=self.text or '', entities=self.entities
+            ))
+        except errors.FileReferenceExpiredError:
+            await self._refresh(client)
+            return await client(SendMediaRequest(
+                peer=chat_id, media=self.media, message=self.text or '', entities=self.entities
+            ))
+
+class BroadcastJob:
+    """One broadcast: the target snapshot plus how far it got"""
+
+    def __init__(self, task_id, user_id, kind, targets, content=None, source=None,
+                 status_msg=None, owner_key=None, mode=COPY):
+        self.task_id = task_id
+        self.user_id = user_id        # tenant whose client sends
+        self.kind = kind              # 'gcast' or 'ucast'
+        self.targets = targets        # [[chat_id, name, packed peer]] snapshotted at start
+        self.content = content        # text to send, when not copying a message
+        self.source = source          # [chat_id, msg_id, packed peer] of the message to copy
+        self.status_msg = status_msg  # [chat_id, msg_id, packed peer] of the status message
+        self.owner_key = owner_key    # user id the failed list is saved under
+        self.mode = mode              # COPY or FORWARD (only for source messages)
+        self.position = 0
+        self.success = 0
+        self.failed_list = []
+        self.send_time = 0.0          # seconds spent in successful sends
+        self.status = RUNNING
+        self.started_at = int(time.time())
+
+    @property
+    def total(self):
+        return len(self.targets)
+
+    @property
+    def failed(self):
+        return len(self.failed_list)
+
+    @property
+    def avg_latency(self):
+        """Average seconds per successful target"""
+        return self.send_time / self.success if self.success else 0.0
+
+    @property
+    def finished(self):
+        return self.status in (CANCELLED, DONE)
+
+    @property
+    def needs_entity_cache(self):
+        """Saved before peers were stored: bare ids need the dialogs cached"""
+        return any(len(target) < 3 for target in self.targets) or bool(self.source and len(self.source) < 3)
+
+    @staticmethod
+    def peer(ref):
+        """InputPeer of a [chat_id, ..., packed peer] reference (chat_id in old jobs)"""
+        return unpack_peer(ref[2] if len(ref) > 2 else None, ref[0])
+
+    def to_dict(self):
+        """Progress checkpoint: everything but the target and failed lists"""
+        data = {k: v for k, v in self.__dict__.items() if k not in ('targets', 'failed_list')}
+        data['failed_count'] = self.failed
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data.pop('failed_count', None)
+        job = cls(data['task_id'], data['user_id'], data['kind'], data['targets'])
+        job.__dict__.update(data)
+        return job
+
+class BroadcastEngine:
+    """Runs broadcast jobs as background tasks and persists their progress.
+
+    Each tenant registers its client and a finish callback once in setup();
+    jobs found on disk for that tenant are then resumed. Jobs of different
+    tenants run concurrently, and every send goes through the client's
+    scheduler, so the per-client send rate and FloodWait handling apply.
+    """
+
+    def __init__(self):
+        self.jobs = {}     # {task_id: BroadcastJob}
+        self.tasks = {}    # {task_id: asyncio.Task}
+        self.clients = {}  # {user_id: (client, on_finish)}
+        self.logged = {}   # {task_id: failed targets already in the failed file}
+
+    def _folder(self, user_id):
+        return os.path.join(get_user_folder(user_id), JOBS_DIR)
+
+    def _path(self, job, suffix=PROGRESS_SUFFIX):
+        return os.path.join(self._folder(job.user_id), f'{job.task_id}{suffix}')
+
+    @staticmethod
+    def _write(path, data):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def save(self, job):
+        """Checkpoint a job's progress (or drop its files once finished).
+
+        The target snapshot is written once; later saves only append the new
+        failures and rewrite the small progress file, so a checkpoint costs
+        the same at the last target as at the first.
+        """
+        if job.finished:
+            self.logged.pop(job.task_id, None)
+            for suffix in (PROGRESS_SUFFIX, TARGETS_SUFFIX, FAILED_SUFFIX):
+                try:
+                    os.remove(self._path(job, suffix))
+                except OSError:
+                    pass
+            return
+
+        try:
+            os.makedirs(self._folder(job.user_id), exist_ok=True)
+            targets_path = self._path(job, TARGETS_SUFFIX)
+            if not os.path.exists(targets_path):
+                self._write(targets_path, job.targets)
+
+            # Failures first: the progress file never counts more than are logged
+            logged = self.logged.get(job.task_id, 0)
+            if logged < job.failed:
+                with open(self._path(job, FAILED_SUFFIX), 'a') as f:
+                    for failure in job.failed_list[logged:]:
+                        f.write(json.dumps(failure) + '\n')
+                self.logged[job.task_id] = job.failed
+
+            self._write(self._path(job), job.to_dict())
+        except OSError as e:
+            logger.error("Could not save broadcast job %s: %s", job.task_id, e)
+
+    def _load(self, path):
+        """Rebuild a job from its progress, targets and failed files"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if 'targets' in data:
+            # Saved as a single file by older versions
+            return BroadcastJob.from_dict(data)
+
+        base = path[:-len(PROGRESS_SUFFIX)]
+        with open(base + TARGETS_SUFFIX, 'r') as f:
+            data['targets'] = json.load(f)
+
+        count = data.get('failed_count', 0)
+        try:
+            with open(base + FAILED_SUFFIX, 'r') as f:
+                failed = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            failed = []
+        if len(failed) > count:
+            # Appended before a progress save that never happened: those
+            # targets are sent again, so drop their entries
+            failed = failed[:count]
+            self._write_lines(base + FAILED_SUFFIX, failed)
+        data['failed_list'] = failed
+
+        job = BroadcastJob.from_dict(data)
+        self.logged[job.task_id] = job.failed
+        return job
+
+    @staticmethod
+    def _write_lines(path, items):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            for item in items:
+                f.write(json.dumps(item) + '\n')
+        os.replace(tmp_path, path)
+
+    def register(self, user_id, client, on_finish):
+        """Attach a tenant's client; on_finish(job) is awaited when a job ends"""
+        self.clients[user_id] = (client, on_finish)
+
+    def resume_saved(self, user_id):
+        """Load the tenant's unfinished jobs from disk and restart running ones"""
+        folder = self._folder(user_id)
+        if not os.path.isdir(folder):
+            return []
+
+        resumed = []
+        for fname in sorted(os.listdir(folder)):
+            if not fname.endswith(PROGRESS_SUFFIX):
+                continue
+            try:
+                job = self._load(os.path.join(folder, fname))
+            except (OSError, json.JSONDecodeError, KeyError) as e:
+                logger.warning("Skipping broadcast job %s: %s", fname, e)
+                continue
+            if job.task_id in self.jobs:
+                continue
+            self.jobs[job.task_id] = job
+            if job.status == RUNNING:
+                self._spawn(job)
+                resumed.append(job)
+        return resumed
+
+    def start(self, job):
+        """Persist a new job and start sending"""
+        self.jobs[job.task_id] = job
+        self.save(job)
+        self._spawn(job)
+        return job
+
+    def _spawn(self, job):
+        task = self.tasks.get(job.task_id)
+        if task is None or task.done():
+            self.tasks[job.task_id] = asyncio.create_task(self._run(job))
+
+    def get(self, task_id, user_id=None):
+        """Job by task id, optionally only if it belongs to user_id"""
+        job = self.jobs.get(task_id)
+        if job is None or (user_id is not None and job.user_id != user_id):
+            return None
+        return job
+
+    def user_jobs(self, user_id):
+        return [job for job in self.jobs.values() if job.user_id == user_id]
+
+    def pause(self, task_id, user_id=None):
+        job = self.get(task_id, user_id)
+        if job is None or job.status != RUNNING:
+            return False
+        job.status = PAUSED
+        self.save(job)
+        return True
+
+    def resume(self, task_id, user_id=None):
+        job = self.get(task_id, user_id)
+        if job is None or job.status != PAUSED:
+            return False
+        job.status = RUNNING
+        self.save(job)
+        self._spawn(job)
+        return True
+
+    def cancel(self, task_id, user_id=None):
+        job = self.get(task_id, user_id)
+        if job is None or job.finished:
+            return False
+        was_paused = job.status == PAUSED
+        job.status = CANCELLED
+        if was_paused:
+            # No task is running to notice the cancellation
+            asyncio.create_task(self._finish(job))
+        return True
+
+    async def _load_payload(self, client, job):
+        source = None
+        if job.source:
+            source = await client.get_messages(job.peer(job.source), ids=job.source[1])
+            if source is None:
+                raise SourceDeleted(f"message {job.source[1]} was deleted")
+        return await BroadcastPayload.create(client, job.content, source, job.mode)
+
+    async def _run(self, job):
+        entry = self.clients.get(job.user_id)
+        if entry is None:
+            return
+        client = entry[0]
+        scheduler = get_scheduler(client)
+
+        try:
+            if job.needs_entity_cache:
+                # Fills the session's entity cache so the bare ids resolve
+                await get_dialog_index(client)
+            payload = await self._load_payload(client, job)
+        except SourceDeleted as e:
+            logger.error("Broadcast %s lost its source message: %s", job.task_id, e)
+            job.status = CANCELLED
+            await self._finish(job)
+            return
+        except Exception as e:
+            # Keep the job; bc-resume retries it
+            logger.error("Broadcast %s could not load its message, pausing: %s", job.task_id, e)
+            job.status = PAUSED
+            self.save(job)
+            self.tasks.pop(job.task_id, None)
+            return
+
+        async def timed_send(peer):
+            # Timed inside the scheduler slot, so pacing is not counted
+            start = time.perf_counter()
+            await payload.send(client, peer)
+            return time.perf_counter() - start
+
+        unsaved = 0
+        while job.position < job.total and job.status == RUNNING:
+            target = job.targets[job.position]
+            chat_id, name = target[0], target[1]
+            try:
+                job.send_time += await scheduler.run('send', timed_send, job.peer(target))
+                job.success += 1
+            except Exception as e:
+                job.failed_list.append({'id': chat_id, 'name': name, 'error': str(e)})
+            job.position += 1
+            unsaved += 1
+            if unsaved >= SAVE_EVERY:
+                self.save(job)
+                unsaved = 0
+
+        if job.status == PAUSED:
+            self.save(job)
+            return
+        if job.status == RUNNING:
+            job.status = DONE
+        await self._finish(job)
+
+    async def _finish(self, job):
+        self.save(job)
+        self.jobs.pop(job.task_id, None)
+        self.tasks.pop(job.task_id, None)
+        entry = self.clients.get(job.user_id)
+        if entry is None:
+            return
+        try:
+            await entry[1](job)
+        except Exception:
+            logger.exception("Broadcast %s finish callback failed", job.task_id)
+
+broadcast_engine = BroadcastEngine()
@@ -0,0 +1,107 @@
+# plugins/core/config.py
+import copy
+import json
+import os
+import time
+from config import OWNER_ID
+from plugins.core.premium import premium_registry
+
+DEFAULT_PREFIX = '.'
+
+# Seconds between mtime checks of a cached file (picks up edits made by hand)
+POLL_INTERVAL = 2.0
+
+class JsonFileCache:
+    """Parsed JSON files kept in memory and reloaded when their mtime changes.
+
+    Lookups are a dict access; the file is stat()ed at most once per
+    poll interval. Writes go through the cache so readers see them at once.
+    """
+
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._entries = {}  # {path: [data, mtime, checked_at]}
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self, path, default):
+        mtime = self._mtime(path)
+        data = None
+        if mtime is not None:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                data = None
+        if data is None:
+            data = default()
+        self._entries[path] = [data, mtime, time.monotonic()]
+        return data
+
+    def get(self, path, default=dict):
+        """Return the parsed content of path (do not mutate it)"""
+        entry = self._entries.get(path)
+        if entry is None:
+            return self._load(path, default)
+
+        now = time.monotonic()
+        if now - entry[2] >= self.poll_interval:
+            entry[2] = now
+            if self._mtime(path) != entry[1]:
+                return self._load(path, default)
+        return entry[0]
+
+    def write(self, path, data, **dump_kwargs):
+        """Save data to path and update the cached copy"""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, **dump_kwargs)
+        self._entries[path] = [copy.deepcopy(data), self._mtime(path), time.monotonic()]
+
+    def invalidate(self, path=None):
+        """Drop one cached file, or all of them"""
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(path, None)
+
+_cache = JsonFileCache()
+
+def get_user_folder(user_id=None):
+    """Get user-specific folder path"""
+    if user_id is None or str(user_id) == str(OWNER_ID):
+        return 'premium'
+    return f'premium/userprem_{user_id}'
+
+def get_prefix(user_id=None):
+    """Get current prefix for specific user ("no" means prefix disabled)"""
+    path = f'{get_user_folder(user_id)}/prefix.json'
+    data = _cache.get(path)
+    if 'prefix' not in data:
+        _cache.write(path, {'prefix': DEFAULT_PREFIX})
+        return DEFAULT_PREFIX
+    return data['prefix']
+
+def get_active_prefix(user_id=None):
+    """Get the prefix to match commands with ("" when prefix is disabled)"""
+    prefix = get_prefix(user_id)
+    return "" if prefix == "no" else prefix
+
+def set_prefix(new_prefix, user_id=None):
+    """Save prefix for specific user"""
+    _cache.write(f'{get_user_folder(user_id)}/prefix.json', {'prefix': new_prefix})
+
+def is_premium_user(user_id):
+    """Check if user is premium"""
+    return premium_registry.is_premium(user_id)
+
+def invalidate(path=None):
+    """Force the next lookup to re-read path (or every cached file)"""
+    _cache.invalidate(path)
@@ -0,0 +1,219 @@
+# plugins/core/dialogs.py
+import asyncio
+import logging
+import time
+import weakref
+from telethon import errors, events, utils
+from telethon.tl.types import Channel, Chat, PeerChannel, UpdateChannel, User
+
+logger = logging.getLogger(__name__)
+
+# Seconds after which the index is rebuilt from scratch on next use, to pick
+# up anything the update handlers missed
+REBUILD_INTERVAL = 6 * 3600
+# Seconds channel updates are collected before the channels they did not
+# carry are fetched, so a burst costs one lookup per channel
+CHANNEL_REFRESH_DELAY = 5.0
+
+class DialogEntry:
+    """What the index knows about one dialog"""
+    __slots__ = ('id', 'name', 'kind', 'is_admin', 'is_creator', 'muted', 'access_hash', 'entity')
+
+    def __init__(self, entity):
+        self.id = utils.get_peer_id(entity)  # marked id, same as dialog.id
+        self.name = utils.get_display_name(entity) or 'Unknown'
+        self.entity = entity
+        self.access_hash = getattr(entity, 'access_hash', None)
+        self.is_creator = bool(getattr(entity, 'creator', False))
+        self.is_admin = self.is_creator or getattr(entity, 'admin_rights', None) is not None
+
+        if isinstance(entity, User):
+            self.kind = 'bot' if entity.bot else 'user'
+        elif isinstance(entity, Channel) and entity.broadcast:
+            self.kind = 'channel'
+        else:
+            self.kind = 'group'
+
+        # Muted = we are not allowed to send messages here
+        banned = getattr(entity, 'banned_rights', None)
+        default = getattr(entity, 'default_banned_rights', None)
+        self.muted = not self.is_admin and bool(
+            (banned and banned.send_messages) or (default and default.send_messages)
+        )
+
+class DialogIndex:
+    """All dialogs of a client, fetched once and kept fresh from updates.
+
+    The first query pays for one iter_dialogs() scan; after that joins,
+    leaves and new chats are applied from NewMessage, ChatAction and
+    channel updates, so queries are in-memory lookups.
+    """
+
+    def __init__(self, client, rebuild_interval=REBUILD_INTERVAL):
+        self.client = client
+        self.rebuild_interval = rebuild_interval
+        self.entries = {}  # {marked chat id: DialogEntry}
+        self.me_id = None
+        self.built_at = None
+        self._lock = asyncio.Lock()
+        self._pending = set()        # channel ids waiting for _refresh_channels
+        self._refresh_task = None
+
+    def install(self):
+        self.client.add_event_handler(self._on_message, events.NewMessage())
+        self.client.add_event_handler(self._on_action, events.ChatAction())
+        self.client.add_event_handler(self._on_channel, events.Raw(UpdateChannel))
+
+    def uninstall(self):
+        self.client.remove_event_handler(self._on_message)
+        self.client.remove_event_handler(self._on_action)
+        self.client.remove_event_handler(self._on_channel)
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+    @property
+    def built(self):
+        return self.built_at is not None and time.monotonic() - self.built_at < self.rebuild_interval
+
+    async def ensure(self):
+        """Build the index if it was never built or is too old"""
+        if self.built:
+            return self
+        async with self._lock:
+            if not self.built:
+                await self.rebuild()
+        return self
+
+    async def rebuild(self):
+        start = time.perf_counter()
+        entries = {}
+        async for dialog in self.client.iter_dialogs():
+            if dialog.entity is None:
+                continue
+            entry = DialogEntry(dialog.entity)
+            entries[entry.id] = entry
+        me = await self.client.get_me(input_peer=True)
+        self.me_id = getattr(me, 'user_id', None)
+        self.entries = entries
+        self.built_at = time.monotonic()
+        logger.info("Indexed %d dialogs in %.2fs", len(entries), time.perf_counter() - start)
+
+    def invalidate(self):
+        """Rebuild on next use"""
+        self.built_at = None
+
+    def add(self, entity):
+        if entity is None or getattr(entity, 'left', False):
+            return None
+        entry = DialogEntry(entity)
+        self.entries[entry.id] = entry
+        return entry
+
+    def remove(self, chat_id):
+        return self.entries.pop(chat_id, None)
+
+    # Queries (call ensure() first)
+
+    def get(self, chat_id):
+        return self.entries.get(chat_id)
+
+    def channel(self, channel_id):
+        """Channel or supergroup by bare or marked id"""
+        entry = self.entries.get(channel_id)
+        if entry is None and channel_id > 0:
+            entry = self.entries.get(utils.get_peer_id(PeerChannel(channel_id)))
+        if entry is None or not isinstance(entry.entity, Channel):
+            return None
+        return entry
+
+    def all(self):
+        return list(self.entries.values())
+
+    def of_kind(self, *kinds):
+        return [entry for entry in self.entries.values() if entry.kind in kinds]
+
+    def users(self):
+        """Private chats with people (no bots)"""
+        return self.of_kind('user')
+
+    def groups(self):
+        """Basic groups and supergroups"""
+        return self.of_kind('group')
+
+    def admin_groups(self):
+        """Groups where this account is an admin or the creator"""
+        return [entry for entry in self.groups() if entry.is_admin]
+
+    def muted_groups(self):
+        """Groups and channels where this account may not send messages"""
+        return [entry for entry in self.entries.values() if entry.kind != 'user' and entry.muted]
+
+    # Update handlers
+
+    async def _on_message(self, event):
+        if self.built_at is None or event.chat_id in self.entries:
+            return
+        try:
+            self.add(await event.get_chat())
+        except Exception:
+            pass
+
+    async def _on_action(self, event):
+        if self.built_at is None or self.me_id is None:
+            return
+        if self.me_id not in (event.user_ids or []):
+            return
+        if event.user_left or event.user_kicked:
+            self.remove(event.chat_id)
+        elif event.user_joined or event.user_added or event.created:
+            try:
+                self.add(await event.get_chat())
+            except Exception:
+                pass
+
+    async def _on_channel(self, update):
+        if self.built_at is None:
+            return
+        chat_id = utils.get_peer_id(PeerChannel(update.channel_id))
+        # Telegram normally sends the changed channel along with the update
+        entity = getattr(update, '_entities', {}).get(chat_id)
+        if entity is not None:
+            self._apply_channel(chat_id, entity)
+            return
+        self._pending.add(update.channel_id)
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_channels())
+
+    async def _refresh_channels(self):
+        """Fetch the channels queued by _on_channel once their burst is over"""
+        while self._pending:
+            await asyncio.sleep(CHANNEL_REFRESH_DELAY)
+            pending, self._pending = self._pending, set()
+            for channel_id in pending:
+                chat_id = utils.get_peer_id(PeerChannel(channel_id))
+                try:
+                    entity = await self.client.get_entity(PeerChannel(channel_id))
+                except (ValueError, errors.ChannelPrivateError):
+                    self.remove(chat_id)
+                    continue
+                except Exception:
+                    continue
+                self._apply_channel(chat_id, entity)
+
+    def _apply_channel(self, chat_id, entity):
+        # Left, kicked (ChannelForbidden) or banned channels leave the index
+        if isinstance(entity, (Channel, Chat)) and not getattr(entity, 'left', False):
+            self.add(entity)
+        else:
+            self.remove(chat_id)
+
+# {TelegramClient: DialogIndex}
+_indexes = weakref.WeakKeyDictionary()
+
+async def get_dialog_index(client):
+    """Get the client's dialog index, building it on first use"""
+    index = _indexes.get(client)
+    if index is None:
+        index = _indexes[client] = DialogIndex(client)
+        index.install()
+    return await index.ensure()
@@ -0,0 +1,135 @@
+# plugins/core/effects.py
+import os
+import tempfile
+from collections import OrderedDict
+from io import BytesIO
+from plugins.core.ffmpeg import ffmpeg_runner
+
+# Encoded results kept in memory (bytes, summed over all entries)
+CACHE_BYTES = 64 * 1024 * 1024
+# Results larger than this are sent but not cached
+MAX_ENTRY_BYTES = 16 * 1024 * 1024
+
+# Output encodings: voice notes stay Opus-in-Ogg, other audio becomes MP3
+VOICE_OUTPUT = (['-c:a', 'libopus', '-b:a', '64k', '-f', 'ogg'], 'effect.ogg')
+AUDIO_OUTPUT = (['-c:a', 'libmp3lame', '-q:a', '2', '-f', 'mp3'], 'effect.mp3')
+
+# Containers whose index (the mp4 moov atom) may sit at the end of the
+# file, where ffmpeg reading a pipe cannot seek to it
+SEEKABLE_MIME_TYPES = ('video/mp4', 'audio/mp4', 'audio/m4a', 'audio/x-m4a', 'video/quicktime', 'video/3gpp')
+SEEKABLE_EXTENSIONS = ('.mp4', '.m4a', '.m4v', '.mov', '.3gp')
+
+def media_key(message):
+    """Id of the file behind a message, the same for every copy of it"""
+    document = getattr(message, 'document', None)
+    if document is not None:
+        return document.id
+    return None
+
+def needs_seek(message):
+    """True for mp4/m4a-like media, which ffmpeg must read from a file"""
+    file = getattr(message, 'file', None)
+    mime_type = (getattr(file, 'mime_type', None) or '').lower()
+    ext = (getattr(file, 'ext', None) or '').lower()
+    return mime_type in SEEKABLE_MIME_TYPES or ext in SEEKABLE_EXTENSIONS
+
+def is_mp4(data):
+    """True if data starts like an mp4/m4a/mov file (an ftyp box)"""
+    return data[4:8] == b'ftyp'
+
+class EffectPipeline:
+    """Audio effects piped through ffmpeg without temp files.
+
+    The media is downloaded into memory, fed to ffmpeg on stdin and the
+    encoded result read from stdout. mp4/m4a media, which ffmpeg may have
+    to seek in (told by mime type, extension or its first bytes), goes
+    through a temp file instead. Several filters run as one chain
+    in a single pass. Results are cached by (file id, filter chain, output)
+    and evicted least recently used once CACHE_BYTES is reached.
+    """
+
+    def __init__(self, cache_bytes=CACHE_BYTES):
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()  # {(file id, chain, voice): bytes}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key):
+        data = self._cache.get(key)
+        if data is not None:
+            self._cache.move_to_end(key)
+        return data
+
+    def _put(self, key, data):
+        if len(data) > MAX_ENTRY_BYTES:
+            return
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._cache[key] = data
+        self._size += len(data)
+        while self._size > self.cache_bytes and self._cache:
+            _, evicted = self._cache.popitem(last=False)
+            self._size -= len(evicted)
+
+    async def _encode_file(self, args, write):
+        """Encode from a temp file filled by `await write(path)`; None if it wrote nothing"""
+        fd, path = tempfile.mkstemp(prefix='effect-')
+        os.close(fd)
+        try:
+            if not await write(path):
+                return None
+            return await ffmpeg_runner.run(['-i', path, *args])
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    async def render(self, client, message, filters):
+        """Apply the ffmpeg audio filters (in order) to a message's audio.
+
+        Returns a named BytesIO ready for send_file, or None if the media
+        could not be downloaded. Raises FFmpegError if encoding fails.
+        """
+        voice = bool(getattr(message, 'voice', None))
+        chain = ','.join(f.strip() for f in filters)
+        file_id = media_key(message)
+        key = (file_id, chain, voice)
+        output_args, name = VOICE_OUTPUT if voice else AUDIO_OUTPUT
+
+        data = self._get(key) if file_id is not None else None
+        if data is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            args = ['-vn', '-af', chain, *output_args, 'pipe:1']
+            if needs_seek(message):
+                data = await self._encode_file(args, lambda path: client.download_media(message, file=path))
+            else:
+                media = await client.download_media(message, file=bytes)
+                if not media:
+                    return None
+                if is_mp4(media):
+                    # Sent with another mime type; ffmpeg would silently stop early
+                    async def write(path):
+                        with open(path, 'wb') as f:
+                            f.write(media)
+                        return True
+                    data = await self._encode_file(args, write)
+                else:
+                    data = await ffmpeg_runner.run(['-i', 'pipe:0', *args], input=media)
+            if data is None:
+                return None
+            if file_id is not None:
+                self._put(key, data)
+
+        result = BytesIO(data)
+        result.name = name
+        return result
+
+    def stats(self):
+        return {'entries': len(self._cache), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
+
+effect_pipeline = EffectPipeline()
@@ -0,0 +1,118 @@
+# plugins/core/ffmpeg.py
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+FFMPEG_BIN = 'ffmpeg'
+# Encodes running at the same time in the whole process (all tenants)
+FFMPEG_CONCURRENCY = os.cpu_count() or 1
+# Seconds one ffmpeg run may take before it is killed
+DEFAULT_TIMEOUT = 120
+# Bytes of stderr kept in an FFmpegError
+STDERR_LIMIT = 2000
+
+class FFmpegError(Exception):
+    """ffmpeg exited with an error or ran past its timeout"""
+
+    def __init__(self, message, returncode=None, stderr=''):
+        super().__init__(message)
+        self.returncode = returncode
+        self.stderr = stderr
+
+class FFmpegRunner:
+    """Runs ffmpeg as asyncio subprocesses behind a process-wide cap.
+
+    Handlers await run(args) instead of calling subprocess.run, so an
+    encode never blocks the event loop. At most `concurrency` encodes run
+    at once; the rest wait in line. A timeout or a cancelled caller kills
+    the process.
+    """
+
+    def __init__(self, concurrency=FFMPEG_CONCURRENCY):
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.waiting = 0      # jobs queued for a slot
+        self.running = 0      # jobs encoding now
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.wait_total = 0.0  # seconds spent queued, summed over jobs
+        self.run_total = 0.0   # seconds spent encoding, summed over jobs
+
+    def stats(self):
+        """Queue depth and totals, for status commands and logs"""
+        finished = self.completed + self.failed + self.timed_out + self.cancelled
+        return {
+            'concurrency': self.concurrency,
+            'waiting': self.waiting,
+            'running': self.running,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+            'cancelled': self.cancelled,
+            'avg_wait': self.wait_total / finished if finished else 0.0,
+            'avg_run': self.run_total / finished if finished else 0.0,
+        }
+
+    async def run(self, args, input=None, cwd=None, timeout=DEFAULT_TIMEOUT):
+        """Run `ffmpeg *args` and return its stdout.
+
+        `input` is written to stdin (for `-i pipe:0`); read the result from
+        stdout with `pipe:1` as output. Raises FFmpegError on a non-zero
+        exit or on timeout.
+        """
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        started = time.monotonic()
+        self.wait_total += started - queued_at
+        self.running += 1
+        process = None
+        try:
+            # -nostdin keeps ffmpeg from waiting on a terminal when nothing is piped
+            base = [FFMPEG_BIN, '-hide_banner', '-loglevel', 'error']
+            if input is None:
+                base.append('-nostdin')
+            process = await asyncio.create_subprocess_exec(
+                *base, *args,
+                stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(input), timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise FFmpegError(f"ffmpeg timed out after {timeout}s")
+
+            if process.returncode != 0:
+                self.failed += 1
+                stderr = stderr.decode('utf-8', 'replace')[-STDERR_LIMIT:]
+                logger.warning("ffmpeg exited with %s: %s", process.returncode, stderr.strip())
+                raise FFmpegError(f"ffmpeg exited with {process.returncode}", process.returncode, stderr)
+
+            self.completed += 1
+            return stdout
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except FileNotFoundError:
+            self.failed += 1
+            raise FFmpegError("ffmpeg is not installed")
+        finally:
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+            self.running -= 1
+            self.run_total += time.monotonic() - started
+            self._semaphore.release()
+
+ffmpeg_runner = FFmpegRunner()
@@ -0,0 +1,218 @@
+# plugins/core/gban.py
+import asyncio
+import json
+import logging
+import os
+import time
+from plugins.core.config import get_user_folder
+from plugins.core.dialogs import get_dialog_index
+from plugins.core.peers import unpack_peer
+from plugins.core.scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Folder (inside the tenant folder) with one file per gban/ungban run
+RUNS_DIR = 'gban_runs'
+# Finished runs kept on disk for gban-status and rollback
+HISTORY_LIMIT = 20
+# Groups processed at the same time (the 'ban' bucket still sets the rate)
+GBAN_CONCURRENCY = 10
+# Results recorded between two checkpoints
+CHECKPOINT_EVERY = 10
+
+BAN = 'ban'
+UNBAN = 'unban'
+
+RUNNING = 'running'
+DONE = 'done'
+
+class GbanRun:
+    """One gban or ungban over a planned set of groups, with per-group outcomes"""
+
+    def __init__(self, run_id, user_id, action, target, target_name, groups, status_msg=None,
+                 rollback_of=None, target_peer=None):
+        self.run_id = run_id
+        self.user_id = user_id          # tenant whose client bans
+        self.action = action            # BAN or UNBAN
+        self.target = target
+        self.target_name = target_name
+        self.target_peer = target_peer  # packed input peer of the target
+        self.groups = groups            # [[chat_id, title, packed peer]] planned at start
+        self.status_msg = status_msg    # [chat_id, msg_id, packed peer] to post the result to
+        self.rollback_of = rollback_of  # run_id this ungban reverts
+        self.results = {}               # {str(chat_id): {'ok': bool, 'error': str or None}}
+        self.status = RUNNING
+        self.started_at = time.time()
+        self.finished_at = None
+
+    @property
+    def success(self):
+        return sum(1 for r in self.results.values() if r['ok'])
+
+    @property
+    def failed(self):
+        return sum(1 for r in self.results.values() if not r['ok'])
+
+    @property
+    def pending(self):
+        return [group for group in self.groups if str(group[0]) not in self.results]
+
+    @property
+    def duration(self):
+        return (self.finished_at or time.time()) - self.started_at
+
+    @staticmethod
+    def peer(ref):
+        """InputPeer of a [chat_id, ..., packed peer] reference (chat_id in old runs)"""
+        return unpack_peer(ref[2] if len(ref) > 2 else None, ref[0])
+
+    def target_input(self):
+        return unpack_peer(self.target_peer, self.target)
+
+    def banned_groups(self):
+        """Groups where the action succeeded (what a rollback has to undo)"""
+        return [group for group in self.groups if self.results.get(str(group[0]), {}).get('ok')]
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        run = cls(data['run_id'], data['user_id'], data['action'], data['target'],
+                  data['target_name'], data['groups'])
+        run.__dict__.update(data)
+        return run
+
+class GbanExecutor:
+    """Runs gban/ungban across groups concurrently and checkpoints each run.
+
+    Every run is saved under <tenant folder>/gban_runs, so an interrupted
+    run resumes with only its pending groups after a restart, and finished
+    runs stay queryable (and reversible) until HISTORY_LIMIT pushes them out.
+    """
+
+    def __init__(self, concurrency=GBAN_CONCURRENCY):
+        self.concurrency = concurrency
+        self.tasks = {}    # {run_id: asyncio.Task}
+        self.clients = {}  # {user_id: (client, on_finish)}
+
+    def _folder(self, user_id):
+        return os.path.join(get_user_folder(user_id), RUNS_DIR)
+
+    def _path(self, user_id, run_id):
+        return os.path.join(self._folder(user_id), f'{run_id}.json')
+
+    def save(self, run):
+        path = self._path(run.user_id, run.run_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(run.to_dict(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error("Could not save gban run %s: %s", run.run_id, e)
+
+    def load(self, user_id, run_id):
+        """A saved run of this tenant, or None"""
+        if os.sep in run_id or '/' in run_id:
+            return None
+        try:
+            with open(self._path(user_id, run_id), 'r') as f:
+                return GbanRun.from_dict(json.load(f))
+        except (OSError, json.JSONDecodeError, KeyError):
+            return None
+
+    def history(self, user_id):
+        """Saved runs of a tenant, newest first"""
+        folder = self._folder(user_id)
+        if not os.path.isdir(folder):
+            return []
+        runs = []
+        for fname in os.listdir(folder):
+            if fname.endswith('.json'):
+                run = self.load(user_id, fname[:-5])
+                if run is not None:
+                    runs.append(run)
+        return sorted(runs, key=lambda run: run.started_at, reverse=True)
+
+    def _prune(self, user_id):
+        finished = [run for run in self.history(user_id) if run.status == DONE]
+        for run in finished[HISTORY_LIMIT:]:
+            try:
+                os.remove(self._path(user_id, run.run_id))
+            except OSError:
+                pass
+
+    def register(self, user_id, client, on_finish):
+        """Attach a tenant's client; on_finish(run) is awaited when a run ends"""
+        self.clients[user_id] = (client, on_finish)
+
+    def resume_saved(self, user_id):
+        """Restart the tenant's interrupted runs"""
+        resumed = [run for run in self.history(user_id) if run.status == RUNNING]
+        for run in resumed:
+            self._spawn(run)
+        return resumed
+
+    def start(self, run):
+        self.save(run)
+        return self._spawn(run)
+
+    def _spawn(self, run):
+        task = self.tasks.get(run.run_id)
+        if task is None or task.done():
+            task = self.tasks[run.run_id] = asyncio.create_task(self._run(run))
+        return task
+
+    async def _apply(self, client, run, group):
+        if run.action == BAN:
+            await client.edit_permissions(run.peer(group), run.target_input(), view_messages=False)
+        else:
+            # No restrictions given = every right restored
+            await client.edit_permissions(run.peer(group), run.target_input())
+
+    async def _run(self, run):
+        entry = self.clients.get(run.user_id)
+        if entry is None:
+            return run
+        client, on_finish = entry
+        scheduler = get_scheduler(client)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        unsaved = 0
+
+        pending = run.pending
+        if any(len(group) < 3 for group in pending):
+            # Saved before peers were stored: cache the dialogs so bare ids resolve
+            try:
+                await get_dialog_index(client)
+            except Exception as e:
+                logger.warning("Gban %s could not index dialogs: %s", run.run_id, e)
+
+        async def process(group):
+            nonlocal unsaved
+            async with semaphore:
+                try:
+                    await scheduler.run('ban', self._apply, client, run, group)
+                    run.results[str(group[0])] = {'ok': True, 'error': None}
+                except Exception as e:
+                    run.results[str(group[0])] = {'ok': False, 'error': str(e)[:200]}
+            unsaved += 1
+            if unsaved >= CHECKPOINT_EVERY:
+                unsaved = 0
+                self.save(run)
+
+        await asyncio.gather(*(process(group) for group in pending))
+
+        run.status = DONE
+        run.finished_at = time.time()
+        self.save(run)
+        self._prune(run.user_id)
+        self.tasks.pop(run.run_id, None)
+        try:
+            await on_finish(run)
+        except Exception:
+            logger.exception("Gban %s finish callback failed", run.run_id)
+        return run
+
+gban_executor = GbanExecutor()
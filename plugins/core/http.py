@@ -0,0 +1,254 @@
+# plugins/core/http.py
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import time
+from urllib.parse import urlsplit
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+aiohttp = lazy_import('aiohttp')
+
+logger = logging.getLogger(__name__)
+
+# Open connections in the pool, in total and to one host
+POOL_SIZE = 100
+POOL_PER_HOST = 10
+# Seconds an idle connection is kept open for reuse
+KEEPALIVE = 30
+# Seconds a resolved host name is reused
+DNS_TTL = 300
+# Requests in flight to one host at the same time (the rest wait)
+HOST_CONCURRENCY = 8
+# Seconds a request may take unless the caller says otherwise
+DEFAULT_TIMEOUT = 15
+# Retries after connection errors, timeouts and these statuses. POST is not
+# retried unless the call passes retries (the server may have acted on it)
+RETRIES = 2
+IDEMPOTENT = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Base of the exponential backoff between retries, in seconds
+BACKOFF = 0.5
+# Largest response body read into memory
+MAX_BODY = 50 * 1024 * 1024
+# Seconds a streamed download may wait for the next bytes
+STREAM_TIMEOUT = 60
+
+class HttpError(Exception):
+    """A request failed: bad status, timeout or connection error"""
+
+    def __init__(self, message, status=None, url=None):
+        super().__init__(message)
+        self.status = status
+        self.url = url
+
+class Response:
+    """A fully read response"""
+
+    def __init__(self, url, status, headers, content):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = content
+
+    @property
+    def ok(self):
+        return self.status < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise HttpError(f"HTTP {self.status} from {self.url}", self.status, self.url)
+
+class StreamResponse(Response):
+    """A response whose body is read in chunks (see HttpClient.stream)"""
+
+    def __init__(self, resp):
+        super().__init__(str(resp.url), resp.status, resp.headers, None)
+        self._resp = resp
+
+    async def iter_chunks(self, size=64 * 1024):
+        try:
+            async for chunk in self._resp.content.iter_chunked(size):
+                yield chunk
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise HttpError(f"{type(e).__name__} on {self.url}: {e}", self.status, self.url) from None
+
+class HostStats:
+    __slots__ = ('calls', 'errors', 'retries', 'total_time', 'max_time')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+class HttpClient:
+    """Process-wide async HTTP client shared by every plugin.
+
+    One pooled aiohttp session keeps connections (and their TLS sessions)
+    alive between calls and caches DNS lookups. alfread opens it with
+    start() and closes it on shutdown. Each host gets a concurrency limit,
+    failed calls are retried with jittered exponential backoff, and the
+    time of every call is recorded per host.
+
+    Large downloads use stream(), which reads the body in chunks instead
+    of into memory.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._hosts = {}  # {host: asyncio.Semaphore}
+        self.metrics = {}  # {host: HostStats}
+
+    def session(self):
+        """The shared aiohttp session (opened here if start() was not called)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=POOL_SIZE,
+                    limit_per_host=POOL_PER_HOST,
+                    keepalive_timeout=KEEPALIVE,
+                    use_dns_cache=True,
+                    ttl_dns_cache=DNS_TTL,
+                    enable_cleanup_closed=True
+                )
+            )
+        return self._session
+
+    async def start(self):
+        """Open the session at startup (must run inside the event loop)"""
+        self.session()
+
+    def _host(self, host):
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = self._hosts[host] = asyncio.Semaphore(HOST_CONCURRENCY)
+            self.metrics[host] = HostStats()
+        return semaphore, self.metrics[host]
+
+    async def request(self, method, url, *, timeout=DEFAULT_TIMEOUT, retries=None, max_body=MAX_BODY, **kwargs):
+        """Send a request and read the whole body.
+
+        Extra keyword arguments go to aiohttp (params, json, data, headers).
+        retries defaults to RETRIES for idempotent methods and 0 otherwise.
+        Returns a Response for any status that is not retried; raises
+        HttpError when every attempt failed.
+        """
+        if retries is None:
+            retries = RETRIES if method.upper() in IDEMPOTENT else 0
+        host = urlsplit(url).hostname or ''
+        semaphore, stats = self._host(host)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            error = None
+            try:
+                async with semaphore:
+                    async with self.session().request(
+                        method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+                    ) as resp:
+                        if resp.content_length and resp.content_length > max_body:
+                            raise HttpError(f"Response from {host} is too large", resp.status, url)
+                        chunks = []
+                        size = 0
+                        async for chunk in resp.content.iter_chunked(64 * 1024):
+                            size += len(chunk)
+                            if size > max_body:
+                                raise HttpError(f"Response from {host} is too large", resp.status, url)
+                            chunks.append(chunk)
+                        response = Response(str(resp.url), resp.status, resp.headers, b''.join(chunks))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = HttpError(f"{type(e).__name__} on {url}: {e}", url=url)
+                response = None
+
+            elapsed = time.perf_counter() - start
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+            if response is not None and response.status not in RETRY_STATUSES:
+                return response
+            if attempt >= retries:
+                stats.errors += 1
+                if response is not None:
+                    return response
+                raise error
+
+            attempt += 1
+            stats.retries += 1
+            delay = random.uniform(0, BACKOFF * 2 ** attempt)
+            logger.info("Retrying %s %s in %.1fs (%s)", method, url, delay,
+                        error or f"HTTP {response.status}")
+            await asyncio.sleep(delay)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method, url, *, timeout=STREAM_TIMEOUT, **kwargs):
+        """Send a request and read its body in chunks:
+
+            async with http_client.stream('GET', url) as response:
+                async for chunk in response.iter_chunks():
+                    ...
+
+        timeout limits each wait for data, not the whole download. The host
+        slot is held until the block exits. Nothing is retried, since part
+        of the body may already have been used.
+        """
+        host = urlsplit(url).hostname or ''
+        semaphore, stats = self._host(host)
+        start = time.perf_counter()
+        try:
+            async with semaphore:
+                try:
+                    async with self.session().request(
+                        method, url, timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout), **kwargs
+                    ) as resp:
+                        yield StreamResponse(resp)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    raise HttpError(f"{type(e).__name__} on {url}: {e}", url=url) from None
+        except HttpError:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    def stats(self):
+        """{host: {'calls', 'errors', 'retries', 'avg', 'max'}}"""
+        return {
+            host: {
+                'calls': s.calls,
+                'errors': s.errors,
+                'retries': s.retries,
+                'avg': s.total_time / s.calls if s.calls else 0.0,
+                'max': s.max_time,
+            }
+            for host, s in self.metrics.items()
+        }
+
+    async def close(self):
+        """Close the session and its pooled connections at shutdown"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            # Give the connector a moment to finish closing TLS transports
+            await asyncio.sleep(0.25)
+        self._session = None
+
+http_client = HttpClient()
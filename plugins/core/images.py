@@ -0,0 +1,212 @@
+# plugins/core/images.py
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+Image = lazy_import('PIL.Image')
+ImageOps = lazy_import('PIL.ImageOps')
+
+logger = logging.getLogger(__name__)
+
+# Pillow jobs running at the same time (Pillow releases the GIL while it
+# decodes, resizes and encodes, so threads use several cores)
+IMAGE_WORKERS = min(4, os.cpu_count() or 1)
+# Jobs waiting for a worker before new ones are refused
+QUEUE_SIZE = 32
+# Jobs slower than this many seconds are logged
+SLOW_JOB = 2.0
+# Side of a sticker, in pixels
+STICKER_SIZE = 512
+THUMB_SIZE = 100
+
+class ImageQueueFull(Exception):
+    """Too many image jobs are waiting; the message is shown to the user"""
+
+# Transforms (run in a worker thread; they never modify their input)
+
+def decode(data, size=None):
+    """Open image bytes, applying EXIF orientation.
+
+    With size, JPEGs are decoded at a reduced scale that is still at
+    least size pixels, which is much faster for large photos.
+    """
+    img = Image.open(BytesIO(data))
+    if size:
+        img.draft('RGB', (size, size))
+    img = ImageOps.exif_transpose(img)
+    img.load()
+    return img
+
+def fit(img, size=STICKER_SIZE, upscale=False):
+    """Scale img to fit in size x size, keeping the aspect ratio"""
+    scale = min(size / img.width, size / img.height)
+    if scale >= 1 and not upscale:
+        return img
+    new_size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+    return img.resize(new_size, Image.Resampling.LANCZOS)
+
+def to_sticker(img, size=STICKER_SIZE, quality=95, method=4):
+    """img centered on a transparent size x size canvas, as webp bytes"""
+    img = fit(img.convert("RGBA"), size)
+    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    canvas.paste(img, ((size - img.width) // 2, (size - img.height) // 2), img)
+    output = BytesIO()
+    canvas.save(output, format="WEBP", quality=quality, method=method)
+    return output.getvalue()
+
+def to_png(img, size=STICKER_SIZE):
+    """img scaled so its longer side is size, as png bytes (sticker bot input)"""
+    output = BytesIO()
+    fit(img, size, upscale=True).save(output, "PNG")
+    return output.getvalue()
+
+def thumbnail(img, size=THUMB_SIZE, quality=80):
+    """Small jpeg preview of img"""
+    output = BytesIO()
+    fit(img.convert("RGB"), size).save(output, "JPEG", quality=quality)
+    return output.getvalue()
+
+def _name(func):
+    return getattr(getattr(func, 'func', func), '__name__', 'output')
+
+def _convert(data, outputs, size):
+    """Decode once and run every output on the decoded image"""
+    steps = []
+    start = time.perf_counter()
+    img = decode(data, size)
+    steps.append(('decode', time.perf_counter() - start))
+    results = []
+    for output in outputs:
+        start = time.perf_counter()
+        results.append(output(img))
+        steps.append((_name(output), time.perf_counter() - start))
+    return results, steps
+
+def _timed(func, args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, [(None, time.perf_counter() - start)]
+
+class OpStats:
+    __slots__ = ('calls', 'errors', 'total_time', 'max_time', 'wait_time')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.wait_time = 0.0
+
+class ImagePipeline:
+    """Process-wide thread pool for Pillow work.
+
+    Handlers await run() or convert() instead of calling Pillow on the
+    event loop, so a large photo no longer stalls every tenant. At most
+    `workers` jobs run at once and at most `queue_size` wait; beyond that
+    ImageQueueFull is raised. convert() decodes an image once and builds
+    several outputs from it. The time of every operation (and of each
+    step of a convert) is recorded for stats().
+    """
+
+    def __init__(self, workers=IMAGE_WORKERS, queue_size=QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._pool = None
+        self._semaphore = asyncio.Semaphore(workers)
+        self.waiting = 0
+        self.running = 0
+        self.rejected = 0
+        self.metrics = {}  # {operation: OpStats}
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='image')
+        return self._pool
+
+    def _stats(self, op):
+        stats = self.metrics.get(op)
+        if stats is None:
+            stats = self.metrics[op] = OpStats()
+        return stats
+
+    async def _submit(self, op, func, *args):
+        if self.waiting >= self.queue_size:
+            self.rejected += 1
+            raise ImageQueueFull("Antrian gambar penuh, coba lagi sebentar")
+        stats = self._stats(op)
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        stats.wait_time += time.perf_counter() - queued_at
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, steps = await loop.run_in_executor(self._executor(), func, *args)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+            stats.calls += 1
+
+        elapsed = sum(seconds for _, seconds in steps)
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        for step, seconds in steps:
+            if step is not None:
+                step_stats = self._stats(f'{op}.{step}')
+                step_stats.calls += 1
+                step_stats.total_time += seconds
+                step_stats.max_time = max(step_stats.max_time, seconds)
+        if elapsed > SLOW_JOB:
+            logger.info("Image job %s took %.2fs", op, elapsed)
+        return result
+
+    async def run(self, op, func, *args):
+        """Run func(*args) in the pool; op names it in stats()"""
+        return await self._submit(op, _timed, func, args)
+
+    async def convert(self, data, *outputs, op='convert', size=STICKER_SIZE):
+        """Decode image bytes once and return output(image) for every output.
+
+        Returns a single result for one output and a tuple for several,
+        e.g. sticker, thumb = await convert(data, to_sticker, thumbnail).
+        size is the largest size any output needs (see decode()).
+        """
+        results = await self._submit(op, _convert, data, outputs, size)
+        return results[0] if len(results) == 1 else tuple(results)
+
+    def stats(self):
+        """Queue depth and {operation: {'calls', 'errors', 'avg', 'max', 'avg_wait'}}"""
+        return {
+            'workers': self.workers,
+            'waiting': self.waiting,
+            'running': self.running,
+            'rejected': self.rejected,
+            'ops': {
+                op: {
+                    'calls': s.calls,
+                    'errors': s.errors,
+                    'avg': s.total_time / s.calls if s.calls else 0.0,
+                    'max': s.max_time,
+                    'avg_wait': s.wait_time / s.calls if s.calls else 0.0,
+                }
+                for op, s in self.metrics.items()
+            },
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+image_pipeline = ImagePipeline()
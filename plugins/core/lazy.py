@@ -0,0 +1,74 @@
+# plugins/core/lazy.py
+import importlib
+import time
+from plugins.core.profile import startup_profile
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+
+    Plugins declare heavy dependencies at the top of the file with
+    lazy_import() so they are only imported when a command needs them.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            name = self.__dict__['_name']
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            startup_profile.record('import', name, time.perf_counter() - start)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+class LazyObject:
+    """Proxy for an object built by factory() on first use"""
+
+    def __init__(self, factory, label=None):
+        self._factory = factory
+        self._label = label or getattr(factory, '__name__', 'object')
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            self._target = self._factory()
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy {self._label}>"
+
+_modules = {}  # {module name: LazyModule}, shared by every plugin
+
+def lazy_import(name, attr=None):
+    """Declare a dependency: lazy_import('requests') or lazy_import('bs4', 'BeautifulSoup')"""
+    module = _modules.get(name)
+    if module is None:
+        module = _modules[name] = LazyModule(name)
+    if attr is None:
+        return module
+    return LazyObject(lambda: getattr(module._load(), attr), f'{name}.{attr}')
+
+def lazy_object(factory):
+    """Create an expensive object (client, loader...) the first time it is used"""
+    return LazyObject(factory)
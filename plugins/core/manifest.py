@@ -0,0 +1,126 @@
+# plugins/core/manifest.py
+import ast
+import importlib
+import inspect
+import logging
+import os
+import time
+from plugins.core.profile import startup_profile
+
+logger = logging.getLogger(__name__)
+
+PREMIUM_PACKAGE = 'plugins.premium'
+PREMIUM_DIR = 'plugins/premium'
+
+class PluginSpec:
+    """One premium plugin: its setup callable and setup timings"""
+
+    def __init__(self, name, module, setup, is_async, commands):
+        self.name = name
+        self.module = module
+        self.setup = setup
+        self.is_async = is_async
+        self.commands = commands  # command words registered with @router.command
+        self.setup_count = 0
+        self.setup_total = 0.0
+        self.setup_max = 0.0
+
+    def record(self, seconds):
+        self.setup_count += 1
+        self.setup_total += seconds
+        self.setup_max = max(self.setup_max, seconds)
+
+    @property
+    def setup_avg(self):
+        return self.setup_total / self.setup_count if self.setup_count else 0.0
+
+def declared_commands(path):
+    """Command words passed to @router.command(...) in a plugin source file"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError):
+        return []
+
+    commands = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for deco in node.decorator_list:
+            if (isinstance(deco, ast.Call) and isinstance(deco.func, ast.Attribute)
+                    and deco.func.attr == 'command'):
+                commands.extend(
+                    arg.value for arg in deco.args
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+                )
+    return list(dict.fromkeys(commands))
+
+class PluginManifest:
+    """Premium plugins imported and resolved once, then set up per tenant"""
+
+    def __init__(self, package=PREMIUM_PACKAGE, directory=PREMIUM_DIR):
+        self.package = package
+        self.directory = directory
+        self.plugins = []  # [PluginSpec]
+        self.errors = {}   # {module_name: error message} from build()
+        self.built = False
+
+    def build(self):
+        """Import every plugin module and resolve its setup callable"""
+        self.plugins = []
+        self.errors = {}
+        if os.path.isdir(self.directory):
+            for fname in sorted(os.listdir(self.directory)):
+                if not fname.endswith('.py') or fname.startswith('_'):
+                    continue
+                name = fname[:-3]
+                try:
+                    with startup_profile.phase(f'premium.{name}', 'plugin'):
+                        module = importlib.import_module(f'{self.package}.{name}')
+                except Exception as e:
+                    self.errors[name] = str(e)
+                    continue
+                setup = getattr(module, 'setup', None)
+                if setup is None:
+                    continue
+                self.plugins.append(PluginSpec(
+                    name, module, setup, inspect.iscoroutinefunction(setup),
+                    declared_commands(os.path.join(self.directory, fname)),
+                ))
+        self.built = True
+        return self
+
+    def ensure_built(self):
+        if not self.built:
+            self.build()
+        return self
+
+    async def activate(self, *args):
+        """Run every plugin's setup(*args); returns (loaded names, {name: error})"""
+        self.ensure_built()
+        loaded, failed = [], {}
+        for spec in self.plugins:
+            start = time.perf_counter()
+            try:
+                if spec.is_async:
+                    await spec.setup(*args)
+                else:
+                    spec.setup(*args)
+            except Exception as e:
+                failed[spec.name] = str(e)
+                continue
+            finally:
+                spec.record(time.perf_counter() - start)
+            loaded.append(spec.name)
+        return loaded, failed
+
+    def commands(self):
+        """{command word: plugin name} for every declared command"""
+        return {cmd: spec.name for spec in self.plugins for cmd in spec.commands}
+
+    def slowest(self, count=5):
+        """Plugins with the highest average setup time"""
+        timed = [spec for spec in self.plugins if spec.setup_count]
+        return sorted(timed, key=lambda spec: spec.setup_avg, reverse=True)[:count]
+
+premium_manifest = PluginManifest()
@@ -0,0 +1,175 @@
+# plugins/core/media_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import weakref
+from collections import OrderedDict
+from telethon import errors, types
+from plugins.core.config import get_user_folder
+
+logger = logging.getLogger(__name__)
+
+# Folder (inside the tenant folder) with one file per account
+CACHE_DIR = 'media_cache'
+# References kept per account, least recently used dropped first
+MAX_ENTRIES = 2000
+
+def media_key(kind, *parts):
+    """Stable cache key: media_key('lagu', video_id), media_key('qc', user_id, text)"""
+    if len(parts) == 1 and len(str(parts[0])) <= 64:
+        return f'{kind}:{parts[0]}'
+    digest = hashlib.sha1('\x1f'.join(map(str, parts)).encode('utf-8', 'replace')).hexdigest()
+    return f'{kind}:{digest}'
+
+class MediaCache:
+    """Telegram file references of media this account already uploaded.
+
+    The first send() of a key uploads whatever produce() returns and
+    remembers the resulting document/photo; later sends of the key re-send
+    it by reference, so nothing is downloaded, rendered or uploaded again.
+    An expired reference is refreshed from the message it was first sent
+    in; a reference Telegram no longer accepts is dropped and re-produced.
+    References are per account, so each client has its own cache.
+    """
+
+    def __init__(self, client, user_id=None, max_entries=MAX_ENTRIES):
+        self.client = client
+        self.folder = os.path.join(get_user_folder(user_id), CACHE_DIR)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # {key: entry dict}
+        self.path = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshed = 0
+        self._lock = asyncio.Lock()
+
+    async def load(self):
+        """Read this account's entries (needs get_me, so it runs on first use)"""
+        if self.path is not None:
+            return
+        async with self._lock:
+            if self.path is not None:
+                return
+            me = await self.client.get_me(input_peer=True)
+            path = os.path.join(self.folder, f'{getattr(me, "user_id", "unknown")}.json')
+            try:
+                with open(path, 'r') as f:
+                    self.entries = OrderedDict(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+            self.path = path
+
+    def save(self):
+        os.makedirs(self.folder, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(list(self.entries.items()), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error("Could not save %s: %s", self.path, e)
+
+    @staticmethod
+    def _input_file(entry):
+        ref = bytes.fromhex(entry['file_reference'])
+        if entry['type'] == 'photo':
+            return types.InputPhoto(entry['id'], entry['access_hash'], ref)
+        return types.InputDocument(entry['id'], entry['access_hash'], ref)
+
+    def meta(self, key):
+        """Metadata stored with a key (e.g. title and duration), or None; await load() first"""
+        entry = self.entries.get(key)
+        return entry.get('meta') if entry else None
+
+    def remember(self, key, message, meta=None):
+        """Store the media of a sent message under key"""
+        media = getattr(message, 'photo', None) or getattr(message, 'document', None)
+        if media is None:
+            return
+        if meta is None:
+            meta = self.meta(key)
+        self.entries[key] = {
+            'type': 'photo' if isinstance(media, types.Photo) else 'document',
+            'id': media.id,
+            'access_hash': media.access_hash,
+            'file_reference': (media.file_reference or b'').hex(),
+            'chat_id': message.chat_id,
+            'msg_id': message.id,
+            'meta': meta,
+        }
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.save()
+
+    def forget(self, key):
+        if self.entries.pop(key, None) is not None:
+            self.save()
+
+    async def _refresh(self, key, entry):
+        """Re-read the reference from the first message; None if it is gone"""
+        try:
+            message = await self.client.get_messages(entry['chat_id'], ids=entry['msg_id'])
+        except Exception:
+            message = None
+        if message is None or not (message.photo or message.document):
+            self.forget(key)
+            return None
+        self.remember(key, message)
+        self.refreshed += 1
+        return self.entries[key]
+
+    async def send(self, key, chat_id, produce, meta=None, **kwargs):
+        """Send the media cached under key, or upload what `await produce()` returns.
+
+        kwargs go to send_file (caption, reply_to, attributes...); meta is
+        stored with a new upload. Returns the sent message, or None if
+        produce() returned nothing.
+        """
+        await self.load()
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            for attempt in range(2):
+                try:
+                    message = await self.client.send_file(chat_id, self._input_file(entry), **kwargs)
+                    self.hits += 1
+                    return message
+                except errors.FloodWaitError:
+                    raise
+                except errors.FileReferenceExpiredError:
+                    if attempt == 0:
+                        entry = await self._refresh(key, entry)
+                    else:
+                        self.forget(key)
+                        entry = None
+                except errors.RPCError as e:
+                    logger.info("Cached media %s rejected (%s), uploading again", key, e)
+                    self.forget(key)
+                    entry = None
+                if entry is None:
+                    break
+
+        self.misses += 1
+        file = await produce()
+        if file is None:
+            return None
+        message = await self.client.send_file(chat_id, file, **kwargs)
+        self.remember(key, message, meta)
+        return message
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses,
+                'refreshed': self.refreshed}
+
+# {TelegramClient: MediaCache}
+_caches = weakref.WeakKeyDictionary()
+
+def get_media_cache(client, user_id=None):
+    """Get the media cache of a client (user_id picks the tenant folder)"""
+    cache = _caches.get(client)
+    if cache is None:
+        cache = _caches[client] = MediaCache(client, user_id)
+    return cache
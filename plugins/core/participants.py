@@ -0,0 +1,118 @@
+# plugins/core/participants.py
+import time
+import weakref
+from collections import OrderedDict
+from telethon.tl.functions.channels import GetFullChannelRequest
+from telethon.tl.functions.messages import GetFullChatRequest
+from telethon.tl.types import InputPeerChannel, InputPeerChat
+
+# Seconds a member list / member count is reused
+SNAPSHOT_TTL = 300
+COUNT_TTL = 60
+# Member lists kept per client, and the largest list worth keeping
+MAX_SNAPSHOTS = 16
+MAX_SNAPSHOT_SIZE = 50000
+
+def filter_key(filter):
+    """Hashable key of a participants filter (class, instance or None)"""
+    if filter is None:
+        return None
+    if isinstance(filter, type):
+        return filter.__name__
+    return (type(filter).__name__, getattr(filter, 'q', None))
+
+def options_key(kwargs):
+    """Hashable key of the other iter_participants options (search, limit...)"""
+    return tuple(sorted(
+        (name, value if isinstance(value, (str, int, float, bool, type(None))) else repr(value))
+        for name, value in kwargs.items()
+    ))
+
+class ParticipantService:
+    """Member counts and member lists of chats, shared by the plugins of one client.
+
+    count() answers from GetFullChannel/GetFullChat (or a limit=0 query for
+    filtered counts) instead of downloading the member list. iter() streams
+    members and keeps the complete list as a snapshot for SNAPSHOT_TTL, so
+    the next command on the same chat does not fetch it again.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._snapshots = OrderedDict()  # {(chat_id, filter key, options key): (taken_at, [User])}
+        self._counts = {}                # {(chat_id, filter key, ()): (taken_at, count)}
+
+    async def _chat_id(self, chat):
+        return chat if isinstance(chat, int) else await self.client.get_peer_id(chat)
+
+    async def count(self, chat, filter=None):
+        """Number of members (matching filter) without fetching them"""
+        key = (await self._chat_id(chat), filter_key(filter), ())
+        cached = self._counts.get(key)
+        if cached and time.monotonic() - cached[0] < COUNT_TTL:
+            return cached[1]
+
+        peer = await self.client.get_input_entity(chat)
+        if filter is None and isinstance(peer, InputPeerChannel):
+            full = await self.client(GetFullChannelRequest(peer))
+            count = full.full_chat.participants_count
+        elif filter is None and isinstance(peer, InputPeerChat):
+            full = await self.client(GetFullChatRequest(peer.chat_id))
+            count = len(getattr(full.full_chat.participants, 'participants', []))
+        else:
+            count = (await self.client.get_participants(peer, limit=0, filter=filter)).total
+
+        self._counts[key] = (time.monotonic(), count)
+        return count
+
+    async def iter(self, chat, filter=None, **kwargs):
+        """Yield members, from a fresh snapshot if there is one"""
+        key = (await self._chat_id(chat), filter_key(filter), options_key(kwargs))
+        cached = self._snapshots.get(key)
+        if cached and time.monotonic() - cached[0] < SNAPSHOT_TTL:
+            self._snapshots.move_to_end(key)
+            for user in cached[1]:
+                yield user
+            return
+
+        members = []
+        async for user in self.client.iter_participants(chat, filter=filter, **kwargs):
+            if members is not None:
+                members.append(user)
+                if len(members) > MAX_SNAPSHOT_SIZE:
+                    members = None
+            yield user
+
+        # Only complete lists become snapshots
+        if members is not None:
+            self._snapshots[key] = (time.monotonic(), members)
+            self._snapshots.move_to_end(key)
+            if not kwargs:
+                # A search or limit does not give the member count
+                self._counts[key] = (time.monotonic(), len(members))
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+
+    async def snapshot(self, chat, filter=None, **kwargs):
+        """All members (matching filter) as a list"""
+        return [user async for user in self.iter(chat, filter=filter, **kwargs)]
+
+    def invalidate(self, chat_id=None):
+        """Forget snapshots and counts of one chat (or of every chat)"""
+        if chat_id is None:
+            self._snapshots.clear()
+            self._counts.clear()
+            return
+        for table in (self._snapshots, self._counts):
+            for key in [key for key in table if key[0] == chat_id]:
+                del table[key]
+
+# {TelegramClient: ParticipantService}
+_services = weakref.WeakKeyDictionary()
+
+def get_participant_service(client):
+    """Get the participant service of a client"""
+    service = _services.get(client)
+    if service is None:
+        service = _services[client] = ParticipantService(client)
+    return service
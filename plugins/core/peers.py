@@ -0,0 +1,37 @@
+# plugins/core/peers.py
+from telethon import types, utils
+
+def pack_peer(entity):
+    """JSON-safe input peer of an entity: id plus access hash.
+
+    Saved jobs store this next to the chat id, because a restored
+    StringSession has no entity cache to resolve a bare id from.
+    """
+    try:
+        peer = utils.get_input_peer(entity)
+    except TypeError:
+        return None
+    if isinstance(peer, types.InputPeerUser):
+        return ['user', peer.user_id, peer.access_hash]
+    if isinstance(peer, types.InputPeerChannel):
+        return ['channel', peer.channel_id, peer.access_hash]
+    if isinstance(peer, types.InputPeerChat):
+        return ['chat', peer.chat_id]
+    if isinstance(peer, types.InputPeerSelf):
+        return ['self']
+    return None
+
+def unpack_peer(data, fallback=None):
+    """InputPeer from pack_peer() data, or fallback (e.g. a marked id) without it"""
+    if not data:
+        return fallback
+    kind = data[0]
+    if kind == 'user':
+        return types.InputPeerUser(data[1], data[2])
+    if kind == 'channel':
+        return types.InputPeerChannel(data[1], data[2])
+    if kind == 'chat':
+        return types.InputPeerChat(data[1])
+    if kind == 'self':
+        return types.InputPeerSelf()
+    return fallback
@@ -0,0 +1,180 @@
+# plugins/core/premium.py
+import asyncio
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+PREMIUM_FILE = 'premium/premium.json'
+
+# Seconds to wait before saving, so a burst of changes is written once
+SAVE_DELAY = 1.0
+# Seconds before a failed save is tried again
+SAVE_RETRY_DELAY = 30.0
+# Seconds between mtime checks of premium.json (picks up edits made by hand)
+POLL_INTERVAL = 2.0
+
+class PremiumRegistry:
+    """Premium users indexed in a set and persisted to premium.json.
+
+    File format: {"users": ["<id>", ...], "expiry": {"<id>": <unix time>}}.
+    Users without an expiry entry never expire. Saves are coalesced and
+    written to a temp file that is renamed over the old one, so readers
+    never see a half-written file.
+    """
+
+    def __init__(self, path=PREMIUM_FILE, save_delay=SAVE_DELAY, poll_interval=POLL_INTERVAL):
+        self.path = path
+        self.save_delay = save_delay
+        self.poll_interval = poll_interval
+        self._users = set()
+        self._expiry = {}  # {user_id_str: unix time}
+        self._mtime = None
+        self._checked_at = 0.0
+        self._dirty = False
+        self._save_handle = None
+        self.load()
+
+    @staticmethod
+    def _key(user_id):
+        return str(user_id)
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        """(Re)load the registry from disk"""
+        self._mtime = self._file_mtime()
+        self._checked_at = time.monotonic()
+        data = {}
+        if self._mtime is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Could not read %s: %s", self.path, e)
+        self._users = {str(u) for u in data.get("users", [])}
+        self._expiry = {
+            str(u): float(ts) for u, ts in data.get("expiry", {}).items() if str(u) in self._users
+        }
+
+    def _refresh(self):
+        """Reload if the file was changed by someone else"""
+        now = time.monotonic()
+        if self._dirty or now - self._checked_at < self.poll_interval:
+            return
+        self._checked_at = now
+        if self._file_mtime() != self._mtime:
+            self.load()
+
+    def _expired(self, key, now=None):
+        expiry = self._expiry.get(key)
+        return expiry is not None and expiry <= (now or time.time())
+
+    def is_premium(self, user_id):
+        """Check if user is premium (and not expired)"""
+        self._refresh()
+        key = self._key(user_id)
+        if key not in self._users:
+            return False
+        if self._expired(key):
+            self.remove(key)
+            return False
+        return True
+
+    __contains__ = is_premium
+
+    def add(self, user_id, days=None):
+        """Add a user, optionally for a number of days. Returns False if already premium"""
+        self._refresh()
+        key = self._key(user_id)
+        added = key not in self._users or self._expired(key)
+        self._users.add(key)
+        if days:
+            self._expiry[key] = time.time() + days * 86400
+        elif added:
+            self._expiry.pop(key, None)
+        self._schedule_save()
+        return added
+
+    def remove(self, user_id):
+        """Remove a user. Returns False if they were not premium"""
+        self._refresh()
+        key = self._key(user_id)
+        if key not in self._users:
+            return False
+        self._users.discard(key)
+        self._expiry.pop(key, None)
+        self._schedule_save()
+        return True
+
+    def expires_at(self, user_id):
+        """Unix time the user's premium ends, or None if it does not expire"""
+        return self._expiry.get(self._key(user_id))
+
+    def purge_expired(self):
+        """Drop expired users, returning their ids"""
+        self._refresh()
+        now = time.time()
+        expired = [key for key in self._expiry if self._expired(key, now)]
+        for key in expired:
+            self._users.discard(key)
+            del self._expiry[key]
+        if expired:
+            self._schedule_save()
+        return expired
+
+    def users(self):
+        """List of premium user ids (as strings)"""
+        self.purge_expired()
+        return sorted(self._users)
+
+    def __len__(self):
+        self._refresh()
+        return len(self._users)
+
+    def _schedule_save(self, delay=None):
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if delay is None:
+                self.flush()
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.save_delay if delay is None else delay, self.flush)
+
+    def flush(self):
+        """Write pending changes to disk now"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if not self._dirty:
+            return
+
+        data = {"users": sorted(self._users), "expiry": dict(self._expiry)}
+        folder = os.path.dirname(self.path)
+        tmp_path = f'{self.path}.tmp'
+        try:
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            # Still dirty: try again later (or on the next change / shutdown)
+            logger.error("Could not save %s, retrying in %ss: %s", self.path, SAVE_RETRY_DELAY, e)
+            self._schedule_save(SAVE_RETRY_DELAY)
+            return
+        self._dirty = False
+        self._mtime = self._file_mtime()
+        self._checked_at = time.monotonic()
+
+premium_registry = PremiumRegistry()
@@ -0,0 +1,53 @@
+# plugins/core/profile.py
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Run with ALFREAD_PROFILE=1 or `python alfread.py --profile` to print the report
+PROFILE_ENABLED = os.environ.get('ALFREAD_PROFILE') == '1' or '--profile' in sys.argv
+
+class StartupProfile:
+    """Durations of the startup phases, plugin loads and dependency imports"""
+
+    def __init__(self, enabled=PROFILE_ENABLED):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.entries = []  # [(kind, name, seconds)]
+
+    def record(self, kind, name, seconds):
+        self.entries.append((kind, name, seconds))
+
+    @contextmanager
+    def phase(self, name, kind='phase'):
+        """Time the body of a with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - start)
+
+    def total(self, kind):
+        return sum(seconds for k, _, seconds in self.entries if k == kind)
+
+    def report(self, top=10):
+        """Report lines, slowest first within each kind"""
+        lines = [f"Boot time: {time.perf_counter() - self.started:.2f}s"]
+        for kind, title in (('phase', 'Phases'), ('plugin', 'Plugin load'), ('import', 'Dependency import')):
+            entries = sorted((e for e in self.entries if e[0] == kind), key=lambda e: e[2], reverse=True)
+            if not entries:
+                continue
+            lines.append(f"{title}: {self.total(kind):.2f}s total")
+            lines.extend(f"  {name}: {seconds * 1000:.0f}ms" for _, name, seconds in entries[:top])
+
+        try:
+            import resource
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # kilobytes on Linux, bytes on macOS
+            rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+            lines.append(f"Peak memory: {rss_mb:.1f} MB")
+        except ImportError:
+            pass
+        return lines
+
+startup_profile = StartupProfile()
@@ -0,0 +1,289 @@
+# plugins/core/quote.py
+import base64
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from io import BytesIO
+from plugins.core.http import HttpError, http_client
+from plugins.core.images import image_pipeline
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
+
+logger = logging.getLogger(__name__)
+
+QUOTE_API = "https://bot.lyo.su/quote/generate"
+# Seconds the quote API gets before the local renderer takes over
+REMOTE_TIMEOUT = 8
+# Seconds the API is skipped after it failed
+REMOTE_COOLDOWN = 60
+# Render locally with PIL when the API is slow or down
+LOCAL_FALLBACK = True
+# Profile photos kept in memory ({photo id: bytes})
+AVATAR_CACHE_SIZE = 256
+# Finished stickers kept in memory (bytes, summed over all entries)
+STICKER_CACHE_BYTES = 32 * 1024 * 1024
+
+# Local renderer layout, in pixels of the 512 px wide sticker
+FONT_FILE = "data/fonts/Arial.ttf"
+AVATAR_SIZE = 64
+BUBBLE_PADDING = 18
+BUBBLE_RADIUS = 24
+BUBBLE_COLOR = (30, 30, 30, 255)
+NAME_SIZE = 26
+TEXT_SIZE = 28
+LINE_SPACING = 6
+MAX_LINES = 20
+
+def get_unique_color(user_id, offset=0):
+    """Generate a unique color based on user ID"""
+    hex_color = f"#{(user_id * 1234567 + offset) % 0xFFFFFF:06x}"
+    return hex_color
+
+def get_initials(name):
+    """Get initials from name"""
+    if not name:
+        return "?"
+    parts = name.split()
+    if len(parts) >= 2:
+        return (parts[0][0] + parts[-1][0]).upper()
+    return name[:2].upper() if len(name) >= 2 else name[0].upper()
+
+def _photo_id(user):
+    return getattr(getattr(user, 'photo', None), 'photo_id', None)
+
+# Local renderer (runs in the image pool)
+
+@lru_cache(maxsize=8)
+def _font(size):
+    try:
+        return ImageFont.truetype(FONT_FILE, size)
+    except OSError:
+        pass
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # Pillow < 10.1: only the fixed-size bitmap font
+        return ImageFont.load_default()
+
+def _wrap(draw, text, font, width):
+    """Split text into lines no wider than width, breaking long words"""
+    lines = []
+    for paragraph in text.split('\n'):
+        line = ''
+        for word in paragraph.split(' '):
+            candidate = f'{line} {word}' if line else word
+            if draw.textlength(candidate, font=font) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            line = ''
+            for char in word:
+                if line and draw.textlength(line + char, font=font) > width:
+                    lines.append(line)
+                    line = ''
+                line += char
+        lines.append(line)
+    if len(lines) > MAX_LINES:
+        lines = lines[:MAX_LINES]
+        lines[-1] = lines[-1][:-1] + '…'
+    return lines
+
+def _avatar(avatar, name, color):
+    """Round avatar from photo bytes, or initials on a colored circle"""
+    size = AVATAR_SIZE
+    mask = Image.new('L', (size, size), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, size - 1, size - 1), fill=255)
+    if avatar:
+        try:
+            image = Image.open(BytesIO(avatar)).convert('RGBA').resize((size, size), Image.LANCZOS)
+            image.putalpha(mask)
+            return image
+        except Exception:
+            pass
+    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((0, 0, size - 1, size - 1), fill=color)
+    draw.text((size / 2, size / 2), get_initials(name), font=_font(NAME_SIZE), fill='white', anchor='mm')
+    return image
+
+def render_local(user_id, name, text, avatar=None):
+    """Draw a quote sticker with PIL; returns webp bytes"""
+    name = name or 'Unknown'
+    width = 512
+    left = AVATAR_SIZE + 8
+    inner = width - left - 2 * BUBBLE_PADDING
+
+    scratch = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    name_font, text_font = _font(NAME_SIZE), _font(TEXT_SIZE)
+    name_line = _wrap(scratch, name, name_font, inner)[0]
+    lines = _wrap(scratch, text, text_font, inner)
+    line_height = TEXT_SIZE + LINE_SPACING
+
+    # Shrink the bubble to the text when it is short
+    used = max([scratch.textlength(name_line, font=name_font)] +
+               [scratch.textlength(line, font=text_font) for line in lines])
+    bubble_width = int(used) + 2 * BUBBLE_PADDING
+    bubble_height = 2 * BUBBLE_PADDING + NAME_SIZE + LINE_SPACING + line_height * len(lines)
+    height = max(bubble_height, AVATAR_SIZE)
+
+    image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle((left, 0, left + bubble_width, bubble_height),
+                           radius=BUBBLE_RADIUS, fill=BUBBLE_COLOR)
+    x = left + BUBBLE_PADDING
+    y = BUBBLE_PADDING
+    draw.text((x, y), name_line, font=name_font, fill=get_unique_color(user_id))
+    y += NAME_SIZE + LINE_SPACING
+    for line in lines:
+        draw.text((x, y), line, font=text_font, fill='white')
+        y += line_height
+    image.alpha_composite(_avatar(avatar, name, get_unique_color(user_id, 1)), (0, height - AVATAR_SIZE))
+
+    # Stickers are at most 512 px on each side
+    if height > 512:
+        image = image.resize((max(1, width * 512 // height), 512), Image.LANCZOS)
+
+    output = BytesIO()
+    image.save(output, 'WEBP', quality=90)
+    return output.getvalue()
+
+class QuoteRenderer:
+    """Quote stickers, from the quote API or drawn locally.
+
+    Profile photos are cached by photo id, so one is only downloaded again
+    after the user changes it. Finished stickers are memoized by (user,
+    photo, name, text). When the API fails or takes longer than
+    REMOTE_TIMEOUT the sticker is drawn locally with PIL, and the API is
+    skipped for REMOTE_COOLDOWN.
+    """
+
+    def __init__(self, local_fallback=LOCAL_FALLBACK):
+        self.local_fallback = local_fallback
+        self._avatars = OrderedDict()   # {photo id: bytes}
+        self._stickers = OrderedDict()  # {(user id, photo id, name, text): bytes}
+        self._size = 0
+        self._remote_down_until = 0.0
+        self.hits = 0
+        self.remote = 0
+        self.local = 0
+        self.remote_errors = 0
+        self.avatar_downloads = 0
+
+    async def avatar(self, client, user):
+        """Profile photo bytes of user, or None if it has none"""
+        photo_id = _photo_id(user)
+        if photo_id is None:
+            return None
+        data = self._avatars.get(photo_id)
+        if data is not None:
+            self._avatars.move_to_end(photo_id)
+            return data
+        try:
+            data = await client.download_profile_photo(user, file=bytes)
+        except Exception:
+            data = None
+        if not data:
+            return None
+        self.avatar_downloads += 1
+        self._avatars[photo_id] = data
+        while len(self._avatars) > AVATAR_CACHE_SIZE:
+            self._avatars.popitem(last=False)
+        return data
+
+    def _remember(self, key, data):
+        self._stickers[key] = data
+        self._size += len(data)
+        while self._size > STICKER_CACHE_BYTES and self._stickers:
+            _, evicted = self._stickers.popitem(last=False)
+            self._size -= len(evicted)
+
+    async def _remote(self, user, text, avatar):
+        avatar_b64 = base64.b64encode(avatar).decode('utf-8') if avatar else None
+        quote_data = {
+            "type": "quote",
+            "format": "webp",
+            "backgroundColor": "#000000",
+            "width": 512,
+            "height": 512,
+            "scale": 2,
+            "quality": 100,
+            "messages": [{
+                "entities": [],
+                "avatar": True,
+                "from": {
+                    "id": user.id,
+                    "name": user.first_name,
+                    "photo": {
+                        "url": f"data:image/png;base64,{avatar_b64}" if avatar_b64 else None,
+                        "width": 512,
+                        "height": 512,
+                        "color": get_unique_color(user.id, 1) if not avatar_b64 else None,
+                        "initials": get_initials(user.first_name) if not avatar_b64 else None
+                    }
+                },
+                "text": text,
+                "textColor": get_unique_color(user.id),
+                "replyMessage": {}
+            }]
+        }
+        # Retrying would only delay the local fallback
+        retries = 0 if self.local_fallback else 2
+        response = await http_client.post(QUOTE_API, json=quote_data, timeout=REMOTE_TIMEOUT, retries=retries)
+        response.raise_for_status()
+        return base64.b64decode(response.json()["result"]["image"])
+
+    async def render(self, client, user, text):
+        """Quote sticker of text by user, as a BytesIO named sticker.webp.
+
+        Returns None if neither the API nor the local renderer produced one.
+        """
+        name = getattr(user, 'first_name', None)
+        key = (user.id, _photo_id(user), name, text)
+        data = self._stickers.get(key)
+        if data is not None:
+            self._stickers.move_to_end(key)
+            self.hits += 1
+        else:
+            avatar = await self.avatar(client, user)
+            data = None
+            if time.monotonic() >= self._remote_down_until or not self.local_fallback:
+                try:
+                    data = await self._remote(user, text, avatar)
+                    self.remote += 1
+                except (HttpError, KeyError, TypeError, ValueError) as e:
+                    self.remote_errors += 1
+                    self._remote_down_until = time.monotonic() + REMOTE_COOLDOWN
+                    logger.warning("Quote API failed: %s", e)
+            if data is None and self.local_fallback:
+                try:
+                    data = await image_pipeline.run('quote', render_local, user.id, name, text, avatar)
+                    self.local += 1
+                except ImportError:
+                    logger.warning("Pillow is not installed, no local quote renderer")
+            if data is None:
+                return None
+            self._remember(key, data)
+
+        sticker = BytesIO(data)
+        sticker.name = "sticker.webp"
+        return sticker
+
+    def stats(self):
+        return {
+            'stickers': len(self._stickers),
+            'bytes': self._size,
+            'avatars': len(self._avatars),
+            'hits': self.hits,
+            'remote': self.remote,
+            'local': self.local,
+            'remote_errors': self.remote_errors,
+            'avatar_downloads': self.avatar_downloads,
+        }
+
+quote_renderer = QuoteRenderer()
@@ -0,0 +1,211 @@
+# plugins/core/reactions.py
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from telethon import errors, types
+from telethon.tl.functions.messages import SendReactionRequest
+
+logger = logging.getLogger(__name__)
+
+# Tenants reacting at the same time during one fan-out
+MIRROR_CONCURRENCY = 8
+# Minimum seconds between two reactions sent by the same client
+CLIENT_INTERVAL = 1.0
+# Seconds a "can / cannot see this chat" result is trusted
+ACCESS_TTL = 600
+# Owner reactions remembered per tenant for .react
+OWNER_REACTIONS_LIMIT = 100
+# Mirrored reactions remembered per tenant to drop duplicate events
+SEEN_LIMIT = 512
+
+# Errors meaning the client cannot react in that chat at all
+ACCESS_ERRORS = (
+    ValueError,
+    errors.ChannelPrivateError,
+    errors.ChatAdminRequiredError,
+    errors.ChatWriteForbiddenError,
+    errors.PeerIdInvalidError,
+    errors.UserNotParticipantError,
+)
+
+EMOJI_SETS = {
+    'like': ['👍', '❤️', '🔥', '⭐', '🎯'],
+    'love': ['❤️', '💕', '💖', '💗', '😍'],
+    'laugh': ['😂', '🤣', '😆', '😄', '🎭'],
+    'surprise': ['😮', '🤯', '😲', '👀', '✨'],
+    'sad': ['😢', '😭', '💔', '😔', '🌧️'],
+    'angry': ['😠', '🤬', '💢', '👿', '⚡'],
+    'celebrate': ['🎉', '🎊', '🥳', '🎁', '🏆']
+}
+
+def reaction_category(emoji):
+    """Pick the EMOJI_SETS category matching an emoji ('like' by default)"""
+    if emoji in ['❤️', '💕', '💖', '💗', '😍']:
+        return 'love'
+    if emoji in ['😂', '🤣', '😆', '😄']:
+        return 'laugh'
+    if emoji in ['😮', '🤯', '😲', '👀']:
+        return 'surprise'
+    if emoji in ['😢', '😭', '💔', '😔']:
+        return 'sad'
+    if emoji in ['😠', '🤬', '💢', '👿']:
+        return 'angry'
+    if emoji in ['🎉', '🎊', '🥳', '🎁']:
+        return 'celebrate'
+    return 'like'
+
+def reaction_key(reaction):
+    """Hashable id of a Reaction object"""
+    if isinstance(reaction, types.ReactionEmoji):
+        return reaction.emoticon
+    if isinstance(reaction, types.ReactionCustomEmoji):
+        return f"emoji_{reaction.document_id}"
+    return repr(reaction)
+
+class ReactionMirror:
+    """Mirrors owner reactions from premium tenants, once per reaction.
+
+    Each tenant's setup() registers its client here. Owner reactions are
+    mirrored by the client that saw them: message ids in private chats
+    belong to one account, so an id seen by one tenant can point at another
+    message (or none) for the rest. Remembered reactions and duplicate
+    detection are therefore kept per tenant. fan_out() reacts from every
+    tenant at once, for chats where ids are shared; sends run concurrently
+    up to MIRROR_CONCURRENCY, each client is limited to one reaction per
+    CLIENT_INTERVAL, and tenants known not to see the chat are skipped.
+    """
+
+    def __init__(self, concurrency=MIRROR_CONCURRENCY, interval=CLIENT_INTERVAL,
+                 access_ttl=ACCESS_TTL):
+        self.clients = {}  # {user_id: TelegramClient}
+        self.owner_reactions = {}  # {user_id: OrderedDict {(chat_id, msg_id): info}}
+        self.interval = interval
+        self.access_ttl = access_ttl
+        self._concurrency = concurrency
+        self._semaphore = None
+        self._seen = {}             # {user_id: OrderedDict {(chat_id, msg_id, reaction key): None}}
+        self._access = {}           # {(user_id, chat_id): (ok, checked_at)}
+        self._next_send = {}        # {user_id: monotonic time of next allowed send}
+        self._locks = {}            # {user_id: asyncio.Lock}
+
+    def add_client(self, user_id, client):
+        self.clients[user_id] = client
+
+    def remove_client(self, user_id):
+        self.clients.pop(user_id, None)
+        self.owner_reactions.pop(user_id, None)
+        self._seen.pop(user_id, None)
+        self._next_send.pop(user_id, None)
+        self._locks.pop(user_id, None)
+        for key in [key for key in self._access if key[0] == user_id]:
+            del self._access[key]
+
+    def remember(self, user_id, chat_id, msg_id, reaction, timestamp):
+        """Store an owner reaction seen by a tenant, dropping the oldest past OWNER_REACTIONS_LIMIT"""
+        reactions = self.owner_reactions.setdefault(user_id, OrderedDict())
+        key = (chat_id, msg_id)
+        reactions[key] = {
+            'chat_id': chat_id,
+            'message_id': msg_id,
+            'reaction': reaction,
+            'timestamp': timestamp
+        }
+        reactions.move_to_end(key)
+        while len(reactions) > OWNER_REACTIONS_LIMIT:
+            reactions.popitem(last=False)
+
+    def latest(self, user_id):
+        """Most recent owner reaction seen by a tenant, or None"""
+        reactions = self.owner_reactions.get(user_id)
+        if not reactions:
+            return None
+        return next(reversed(reactions.values()))
+
+    def _first_time(self, user_id, key):
+        """True the first time a tenant sees a key"""
+        seen = self._seen.setdefault(user_id, OrderedDict())
+        if key in seen:
+            return False
+        seen[key] = None
+        while len(seen) > SEEN_LIMIT:
+            seen.popitem(last=False)
+        return True
+
+    async def _can_access(self, user_id, client, chat_id):
+        key = (user_id, chat_id)
+        cached = self._access.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.access_ttl:
+            return cached[0]
+        try:
+            await client.get_input_entity(chat_id)
+            ok = True
+        except ACCESS_ERRORS:
+            ok = False
+        self._access[key] = (ok, time.monotonic())
+        return ok
+
+    async def _send(self, user_id, client, chat_id, msg_id, emoji):
+        """Send one reaction from a client, honoring its rate limit"""
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            delay = self._next_send.get(user_id, 0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await client(SendReactionRequest(
+                    peer=chat_id,
+                    msg_id=msg_id,
+                    reaction=[types.ReactionEmoji(emoticon=emoji)]
+                ))
+                return True
+            except errors.FloodWaitError as e:
+                self._next_send[user_id] = time.monotonic() + e.seconds
+                return False
+            except ACCESS_ERRORS:
+                self._access[(user_id, chat_id)] = (False, time.monotonic())
+                return False
+            except Exception as e:
+                logger.debug("Reaction from %s failed: %s", user_id, e)
+                return False
+            finally:
+                self._next_send[user_id] = max(
+                    self._next_send.get(user_id, 0), time.monotonic() + self.interval
+                )
+
+    async def fan_out(self, chat_id, msg_id, pick_emoji, user_ids=None):
+        """React from every connected tenant; pick_emoji() gives each one's emoji.
+
+        user_ids limits the tenants (e.g. to the one whose private chat the
+        message id belongs to). Returns the number of tenants that reacted.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def react(user_id, client):
+            async with self._semaphore:
+                if not await self._can_access(user_id, client, chat_id):
+                    return False
+                return await self._send(user_id, client, chat_id, msg_id, pick_emoji())
+
+        tenants = [
+            (user_id, client) for user_id, client in list(self.clients.items())
+            if client.is_connected() and (user_ids is None or user_id in user_ids)
+        ]
+        results = await asyncio.gather(*(react(u, c) for u, c in tenants))
+        return sum(1 for ok in results if ok)
+
+    async def mirror(self, user_id, client, chat_id, msg_id, reaction):
+        """Mirror an owner reaction a tenant saw, from that tenant's client.
+
+        The emoji is picked from the same category. Returns True if the
+        client reacted.
+        """
+        key = reaction_key(reaction)
+        if not self._first_time(user_id, (chat_id, msg_id, key)):
+            return False
+        emoji = random.choice(EMOJI_SETS[reaction_category(key)])
+        return await self._send(user_id, client, chat_id, msg_id, emoji)
+
+reaction_mirror = ReactionMirror()
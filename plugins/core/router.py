@@ -0,0 +1,135 @@
+# plugins/core/router.py
+import logging
+import weakref
+from telethon import events
+from telethon.events import StopPropagation
+from config import OWNER_ID
+from plugins.core.config import get_active_prefix, is_premium_user
+
+logger = logging.getLogger(__name__)
+
+# {TelegramClient: CommandRouter}
+_routers = weakref.WeakKeyDictionary()
+
+class Command:
+    """Command parsed once by the router and passed to every callback"""
+    __slots__ = ('name', 'args', 'prefix', 'text')
+
+    def __init__(self, name, args, prefix, text):
+        self.name = name      # matched command word, lowercased
+        self.args = args      # rest of the message, stripped (original case)
+        self.prefix = prefix  # active prefix, "" when prefix is disabled
+        self.text = text      # full stripped message text
+
+class CommandRouter:
+    """Single NewMessage entry point for a premium client.
+
+    Every message is authorized and split into prefix/command/args once,
+    then dispatched through a dict lookup instead of running every plugin
+    handler.
+    """
+
+    def __init__(self, client, user_id):
+        self.client = client
+        self.user_id = user_id
+        self.commands = {}      # {word: [callback]} - used after the prefix
+        self.raw_commands = {}  # {word: [callback]} - used without any prefix
+        self.watchers = []      # called for authorized messages that are not commands
+
+    def command(self, *names, prefix=True):
+        """Register a callback(event, cmd) for one or more command words"""
+        table = self.commands if prefix else self.raw_commands
+
+        def decorator(func):
+            for name in names:
+                table.setdefault(name.lower(), []).append(func)
+            return func
+        return decorator
+
+    def watch(self, func):
+        """Register a callback(event) for authorized non-command messages"""
+        self.watchers.append(func)
+        return func
+
+    def is_authorized(self, sender_id):
+        """Owner, or the premium user that owns this client"""
+        if sender_id == OWNER_ID:
+            return True
+        return sender_id == self.user_id and is_premium_user(sender_id)
+
+    def resolve(self, text):
+        """Return (callbacks, Command) for a message, or (None, None)"""
+        if not text:
+            return None, None
+
+        prefix = get_active_prefix(self.user_id)
+
+        body = None
+        if not prefix:
+            body = text
+        elif text[:len(prefix)].lower() == prefix.lower():
+            # Case-insensitive like the old handlers (phones capitalise the first letter)
+            body = text[len(prefix):].lstrip()
+
+        if body:
+            parts = body.split(None, 1)
+            name = parts[0].lower()
+            callbacks = self.commands.get(name)
+            if callbacks:
+                args = parts[1].strip() if len(parts) > 1 else ""
+                return callbacks, Command(name, args, prefix, text)
+
+        if self.raw_commands:
+            parts = text.split(None, 1)
+            name = parts[0].lower()
+            callbacks = self.raw_commands.get(name)
+            if callbacks:
+                args = parts[1].strip() if len(parts) > 1 else ""
+                return callbacks, Command(name, args, prefix, text)
+
+        return None, None
+
+    async def dispatch(self, event):
+        """Handle every new message seen by the client"""
+        sender_id = event.sender_id
+        if sender_id != OWNER_ID and sender_id != self.user_id:
+            return
+        if not self.is_authorized(sender_id):
+            return
+
+        text = (event.raw_text or '').strip()
+        callbacks, cmd = self.resolve(text)
+
+        if callbacks is None:
+            for watcher in self.watchers:
+                try:
+                    await watcher(event)
+                except StopPropagation:
+                    break
+                except Exception:
+                    logger.exception("Watcher %s failed for user %s", watcher.__name__, self.user_id)
+            return
+
+        for callback in callbacks:
+            try:
+                await callback(event, cmd)
+            except StopPropagation:
+                break
+            except Exception:
+                logger.exception("Command %s failed for user %s", cmd.name, self.user_id)
+
+def get_router(client, user_id=None):
+    """Get the router of a client, installing it on first use"""
+    router = _routers.get(client)
+    if router is None:
+        router = CommandRouter(client, user_id)
+        client.add_event_handler(router.dispatch, events.NewMessage())
+        _routers[client] = router
+    return router
+
+def remove_router(client):
+    """Detach the router from a client"""
+    router = _routers.pop(client, None)
+    if router is not None:
+        client.remove_event_handler(router.dispatch)
+    return router
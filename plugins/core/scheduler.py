@@ -0,0 +1,138 @@
+# plugins/core/scheduler.py
+import asyncio
+import logging
+import time
+import weakref
+from telethon.errors import FloodWaitError
+
+logger = logging.getLogger(__name__)
+
+# {method class: (requests per second, burst)} for a fresh client
+DEFAULT_RATES = {
+    'send': (1.0, 3),
+    'edit': (1.0, 3),
+    'delete': (5.0, 10),
+    'ban': (10.0, 20),
+}
+# Rate multiplier after a FloodWait, and the lowest fraction of the base rate
+FLOOD_BACKOFF = 0.5
+MIN_RATE_FACTOR = 0.1
+# Fraction of the missing rate won back after each successful call
+RECOVERY = 0.05
+# FloodWaits of up to this many seconds are waited out and retried
+MAX_FLOOD_WAIT = 600
+# Times one call is retried after a FloodWait
+MAX_RETRIES = 3
+
+class TokenBucket:
+    """Token bucket whose rate drops on FloodWait and recovers on success"""
+
+    def __init__(self, rate, burst):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # monotonic time a FloodWait ends
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        """Seconds until a token is available (0 if one is available now)"""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def try_acquire(self):
+        """Take a token without waiting; False if none is available"""
+        if self.wait_time() > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def acquire(self):
+        """Wait for a token and take it"""
+        async with self._lock:
+            while True:
+                delay = self.wait_time()
+                if delay <= 0:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep(delay)
+
+    def flood(self, seconds):
+        """Telegram asked to wait: block for that long and slow down"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.rate = max(self.base_rate * MIN_RATE_FACTOR, self.rate * FLOOD_BACKOFF)
+
+    def success(self):
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + (self.base_rate - self.rate) * RECOVERY)
+
+    def set_rate(self, rate):
+        """Change the base rate (e.g. from a user delay setting)"""
+        throttled = self.rate < self.base_rate
+        self.base_rate = rate
+        self.rate = min(self.rate, rate) if throttled else rate
+
+class ClientScheduler:
+    """Per-client rate limiter with one token bucket per method class.
+
+    Bulk operations call run(kind, func, ...) instead of sleeping between
+    requests: the call waits for a slot in the 'send', 'edit', 'delete' or
+    'ban' bucket, and a FloodWaitError pauses that bucket for the requested
+    time, lowers its rate and retries the call.
+    """
+
+    def __init__(self, rates=None):
+        self.buckets = {
+            kind: TokenBucket(rate, burst)
+            for kind, (rate, burst) in (rates or DEFAULT_RATES).items()
+        }
+
+    def bucket(self, kind):
+        return self.buckets[kind]
+
+    async def slot(self, kind):
+        """Wait until a request of this class may be sent"""
+        await self.buckets[kind].acquire()
+
+    def try_slot(self, kind):
+        """Take a slot if one is free now (for skippable calls like progress edits)"""
+        return self.buckets[kind].try_acquire()
+
+    async def run(self, kind, func, *args, retries=MAX_RETRIES, **kwargs):
+        """Await func(*args, **kwargs) in a slot, retrying after FloodWaits"""
+        bucket = self.buckets[kind]
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            try:
+                result = await func(*args, **kwargs)
+            except FloodWaitError as e:
+                bucket.flood(e.seconds)
+                attempt += 1
+                if attempt > retries or e.seconds > MAX_FLOOD_WAIT:
+                    raise
+                logger.info("FloodWait %ss on %s, retrying", e.seconds, kind)
+                continue
+            bucket.success()
+            return result
+
+# {TelegramClient: ClientScheduler}
+_schedulers = weakref.WeakKeyDictionary()
+
+def get_scheduler(client):
+    """Get the scheduler shared by every bulk operation of a client"""
+    scheduler = _schedulers.get(client)
+    if scheduler is None:
+        scheduler = _schedulers[client] = ClientScheduler()
+    return scheduler
@@ -0,0 +1,292 @@
+# plugins/core/ytdl.py
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Where finished audio files are kept (named by video id, shared by tenants)
+DOWNLOAD_DIR = 'data/download/ytdl'
+# Seconds a finished file is reused before it is deleted
+FILE_TTL = 3600
+# Downloads running at the same time; one extra worker serves searches
+MAX_DOWNLOADS = 2
+# Search results remembered ({query: video id})
+SEARCH_CACHE_SIZE = 256
+# Seconds between two progress reports of one download
+PROGRESS_INTERVAL = 1.0
+
+YOUTUBE_ID = re.compile(r'(?:v=|youtu\.be/|shorts/|embed/|live/)([A-Za-z0-9_-]{11})')
+
+AUDIO_OPTS = {
+    'format': 'bestaudio/best',
+    'postprocessors': [{
+        'key': 'FFmpegExtractAudio',
+        'preferredcodec': 'mp3',
+        'preferredquality': '192',
+    }],
+    'quiet': True,
+    'no_warnings': True,
+    'noprogress': True,
+    'noplaylist': True,
+    'writethumbnail': True,
+    'embedthumbnail': True,
+    'addmetadata': True,
+
+    # Fix untuk error YouTube restriction (pakai web client, bukan android)
+    'compat_opts': ['manifest-filesize-approx'],
+    'extractor_args': {
+        'youtube': {
+            'player_client': ['web'],
+            'player_skip': ['configs'],
+        }
+    },
+    'http_headers': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                      'AppleWebKit/537.36 (KHTML, like Gecko) '
+                      'Chrome/120.0.0.0 Safari/537.36',
+    },
+
+    # Network settings
+    'socket_timeout': 30,
+    'retries': 10,
+    'fragment_retries': 10,
+    'skip_unavailable_fragments': True,
+    'continue_dl': True,
+    'buffersize': 1024 * 32,
+}
+
+class YtdlError(Exception):
+    """A search or download failed; the message is shown to the user"""
+
+def _friendly_error(e):
+    message = str(e)
+    if "Private video" in message:
+        return YtdlError("Video bersifat private")
+    if "Sign in" in message:
+        return YtdlError("Video memerlukan login")
+    if "age restricted" in message.lower():
+        return YtdlError("Video dibatasi usia (age restricted)")
+    if "not available" in message or "unavailable" in message:
+        return YtdlError("Video tidak tersedia atau dibatasi aksesnya")
+    return YtdlError(f"Gagal download: {message[:100]}")
+
+# Worker side (runs in the process pool)
+
+def _search(query):
+    """Video id of the first search result, or None"""
+    import yt_dlp
+    opts = {'quiet': True, 'no_warnings': True, 'extract_flat': 'in_playlist', 'noplaylist': True}
+    try:
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            result = ydl.extract_info(f'ytsearch1:{query}', download=False)
+    except Exception as e:
+        raise _friendly_error(e) from None
+    entries = result.get('entries') or []
+    return entries[0].get('id') if entries else None
+
+def _download_audio(video_id, folder, progress):
+    """Extract and download in one pass; returns (file path, info subset)"""
+    import yt_dlp
+    last = [0.0]
+
+    def hook(d):
+        now = time.monotonic()
+        if d.get('status') == 'downloading' and now - last[0] < PROGRESS_INTERVAL:
+            return
+        last[0] = now
+        progress.put({
+            'status': d.get('status'),
+            'downloaded': d.get('downloaded_bytes') or 0,
+            'total': d.get('total_bytes') or d.get('total_bytes_estimate') or 0,
+            'speed': d.get('speed') or 0,
+            'eta': d.get('eta'),
+        })
+
+    opts = dict(AUDIO_OPTS, outtmpl=os.path.join(folder, '%(id)s.%(ext)s'), progress_hooks=[hook])
+    try:
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(f'https://www.youtube.com/watch?v={video_id}', download=True)
+    except Exception as e:
+        raise _friendly_error(e) from None
+
+    path = os.path.join(folder, f'{video_id}.mp3')
+    if not os.path.exists(path):
+        downloads = info.get('requested_downloads') or [{}]
+        path = downloads[0].get('filepath') or path
+    if not os.path.exists(path):
+        raise YtdlError("File hasil download tidak ditemukan")
+    return path, {
+        'id': info.get('id', video_id),
+        'title': info.get('title', 'Unknown Title'),
+        'uploader': info.get('uploader', 'Unknown Artist'),
+        'duration': int(info.get('duration') or 0),
+    }
+
+# Event loop side
+
+class _Job:
+    __slots__ = ('task', 'listeners')
+
+    def __init__(self):
+        self.task = None
+        self.listeners = []  # async callbacks taking a progress dict
+
+class YtdlService:
+    """yt-dlp in a process pool, shared by every tenant.
+
+    Searches and downloads run in worker processes, so the event loop never
+    blocks on yt-dlp. start() forks the workers at boot, before Telethon
+    or any pool has started a thread. Requests for a video that is already downloading join
+    that download (and get its progress reports) instead of starting a
+    second one; finished files are kept until unused for FILE_TTL.
+    """
+
+    def __init__(self, max_downloads=MAX_DOWNLOADS, folder=DOWNLOAD_DIR):
+        self.folder = folder
+        self.max_downloads = max_downloads
+        self._pool = None
+        self._manager = None
+        self._slots = asyncio.Semaphore(max_downloads)
+        self._jobs = {}              # {video_id: _Job} in flight
+        self._done = {}              # {video_id: (path, info, last used)} finished files
+        self._searches = OrderedDict()  # {query: video id}
+        self.downloads = 0
+        self.joined = 0
+        self.reused = 0
+
+    def start(self):
+        """Fork the manager and every worker now, while the process has one thread"""
+        if self._pool is not None:
+            return
+        # fork: spawn/forkserver would re-run alfread.py in every worker
+        context = multiprocessing.get_context('fork')
+        self._manager = context.Manager()
+        self._pool = ProcessPoolExecutor(self.max_downloads + 1, mp_context=context)
+        # With fork the pool launches all workers on its first submit
+        self._pool.submit(os.getpid)
+
+    def _executor(self):
+        if self._pool is None:
+            logger.warning("ytdl_service.start() was not called, forking workers late")
+            self.start()
+        return self._pool
+
+    async def _call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), func, *args)
+
+    async def resolve(self, query):
+        """Video id for a YouTube link or a search query"""
+        match = YOUTUBE_ID.search(query)
+        if match:
+            return match.group(1)
+        key = query.strip().lower()
+        video_id = self._searches.get(key)
+        if video_id is None:
+            video_id = await self._call(_search, query)
+            if video_id is None:
+                raise YtdlError("Tidak dapat menemukan video untuk query tersebut")
+            self._searches[key] = video_id
+            while len(self._searches) > SEARCH_CACHE_SIZE:
+                self._searches.popitem(last=False)
+        else:
+            self._searches.move_to_end(key)
+        return video_id
+
+    async def audio(self, query, on_progress=None):
+        """(mp3 path, info) for a query; the file is shared, do not delete it"""
+        video_id = await self.resolve(query)
+
+        done = self._done.get(video_id)
+        if done and os.path.exists(done[0]):
+            self.reused += 1
+            # The caller is about to send it: keep it out of the next prune
+            self._done[video_id] = (done[0], done[1], time.monotonic())
+            return done[:2]
+
+        job = self._jobs.get(video_id)
+        if job is None:
+            job = self._jobs[video_id] = _Job()
+            job.task = asyncio.create_task(self._run(video_id, job))
+        else:
+            self.joined += 1
+        if on_progress is not None:
+            job.listeners.append(on_progress)
+        try:
+            return await asyncio.shield(job.task)
+        finally:
+            if on_progress in job.listeners:
+                job.listeners.remove(on_progress)
+
+    async def _run(self, video_id, job):
+        try:
+            async with self._slots:
+                self._prune()
+                os.makedirs(self.folder, exist_ok=True)
+                self._executor()
+                progress = self._manager.Queue()
+                pump = asyncio.create_task(self._pump(progress, job))
+                try:
+                    path, info = await self._call(_download_audio, video_id, self.folder, progress)
+                finally:
+                    pump.cancel()
+            self.downloads += 1
+            self._done[video_id] = (path, info, time.monotonic())
+            return path, info
+        finally:
+            self._jobs.pop(video_id, None)
+
+    async def _pump(self, progress, job):
+        """Forward worker progress reports to everyone waiting on the job"""
+        loop = asyncio.get_running_loop()
+        while True:
+            report = await loop.run_in_executor(None, self._next_report, progress)
+            if report is None:
+                continue
+            for listener in list(job.listeners):
+                try:
+                    await listener(report)
+                except Exception:
+                    pass
+
+    @staticmethod
+    def _next_report(progress):
+        try:
+            return progress.get(timeout=PROGRESS_INTERVAL)
+        except Exception:
+            return None
+
+    def _prune(self):
+        """Delete files nobody was handed for FILE_TTL (mtime is the upload date)"""
+        now = time.monotonic()
+        for video_id, (path, _, last_used) in list(self._done.items()):
+            try:
+                if now - last_used > FILE_TTL:
+                    os.remove(path)
+                    del self._done[video_id]
+            except OSError:
+                del self._done[video_id]
+
+    def stats(self):
+        return {
+            'in_flight': len(self._jobs),
+            'downloads': self.downloads,
+            'joined': self.joined,
+            'reused': self.reused,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+ytdl_service = YtdlService()
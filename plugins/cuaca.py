@@ -1,8 +1,8 @@
 import os
 import json
-import aiohttp
 from telethon import events
 from config import OWNER_ID
+from plugins.core.http import http_client
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -24,11 +24,10 @@ async def get_weather_data(location):
         url = f"https://api.openweathermap.org/data/2.5/weather?q={location}&units=metric&appid={WEATHER_API_KEY}&lang=id"
         headers = {'User-Agent': 'Mozilla/5.0'}
         
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
+        response = await http_client.get(url, headers=headers)
+        if response.status == 200:
+            return response.json()
+        return None
     except Exception as e:
         print(f"[WEATHER] Error fetching data: {str(e)}")
         return None
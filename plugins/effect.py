@@ -1,9 +1,10 @@
 import os
 import json
-import subprocess
 import asyncio
 from telethon import events
 from config import OWNER_ID
+from plugins.core.effects import effect_pipeline
+from plugins.core.ffmpeg import FFmpegError
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -27,50 +28,28 @@ def get_live_prefix():
             json.dump({'prefix': '.'}, f)
         return '.'
 
-async def apply_effect(input_file, effect):
-    """Apply audio effect using ffmpeg"""
-    # Clean filename to prevent issues with spaces/special chars
-    clean_input = input_file.replace(" ", "_").replace("(", "").replace(")", "")
-    if input_file != clean_input:
-        os.rename(input_file, clean_input)
-        input_file = clean_input
-    
-    output_file = os.path.join(CACHE_DIR, f"effect_{os.path.basename(input_file)}")
-    
-    effects = {
-        'bass': 'bass=g=20:d=0.8',
-        'echo': 'aecho=0.8:0.9:1000:0.3',
-        'nightcore': 'atempo=1.06,asetrate=44100*1.25',
-        'slow': 'atempo=0.5',
-        'fast': 'atempo=2.0',
-        'robot': 'asetrate=44100*0.8,atempo=1.25,afftfilt=real=\'hypot(re,im)*sin(0)\':imag=\'hypot(re,im)*cos(0)\':win_size=512:overlap=0.75',
-        'reverse': 'areverse',
-        'reverb': 'aecho=0.8:0.88:60:0.4'        
-    }
-    
-    cmd = [
-        'ffmpeg',
-        '-hide_banner',
-        '-loglevel', 'error',
-        '-i', input_file,
-        '-af', effects[effect],
-        '-y',  # Overwrite output file if exists
-        output_file
-    ]
-    
+# ffmpeg audio filter of each effect
+EFFECTS = {
+    'bass': 'bass=g=20:d=0.8',
+    'echo': 'aecho=0.8:0.9:1000:0.3',
+    'nightcore': 'atempo=1.06,asetrate=44100*1.25',
+    'slow': 'atempo=0.5',
+    'fast': 'atempo=2.0',
+    'robot': 'asetrate=44100*0.8,atempo=1.25,afftfilt=real=\'hypot(re,im)*sin(0)\':imag=\'hypot(re,im)*cos(0)\':win_size=512:overlap=0.75',
+    'reverse': 'areverse',
+    'reverb': 'aecho=0.8:0.88:60:0.4'
+}
+
+async def apply_effect(client, message, effects):
+    """Apply audio effects (chained in one ffmpeg pass) to a message"""
     try:
-        subprocess.run(cmd, check=True, stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-        return output_file
-    except subprocess.CalledProcessError as e:
-        print(f"FFmpeg error: {e.stderr.decode('utf-8')}")
+        return await effect_pipeline.render(client, message, [EFFECTS[effect] for effect in effects])
+    except FFmpegError as e:
+        print(f"FFmpeg error: {e} {e.stderr}")
         return None
     except Exception as e:
         print(f"Error applying effect: {e}")
         return None
-    finally:
-        # Clean up the renamed file if it exists
-        if os.path.exists(clean_input) and clean_input != input_file:
-            os.remove(clean_input)
 
 async def setup(bot, user):
     ensure_dirs()
@@ -81,25 +60,17 @@ async def setup(bot, user):
         """Handle audio effect commands"""
         msg = (event.text or '').strip().lower()
         
-        # Available effects
-        effects = [
-            'bass', 'echo', 'nightcore', 'slow', 
-            'fast', 'robot', 'reverse', 'reverb'
-        ]
-        
-        # Check command format
-        effect = None
+        # Check command format; several effects chain: .bass echo
+        cmd_part = None
         if not current_prefix:
-            if msg in effects and event.is_reply:
-                effect = msg
-        else:
-            if msg.startswith(current_prefix):
-                cmd_part = msg[len(current_prefix):].strip()
-                if cmd_part in effects and event.is_reply:
-                    effect = cmd_part
-        
-        if not effect:
+            cmd_part = msg
+        elif msg.startswith(current_prefix):
+            cmd_part = msg[len(current_prefix):].strip()
+
+        chain = (cmd_part or '').split()
+        if not chain or not event.is_reply or not all(name in EFFECTS for name in chain):
             return
+        effect = ' + '.join(chain)
             
         reply_msg = await event.get_reply_message()
         if not (reply_msg.voice or reply_msg.audio):
@@ -119,20 +90,8 @@ async def setup(bot, user):
                 parse_mode="html"
             )
             
-            # Download the media
-            input_file = await reply_msg.download_media(CACHE_DIR + '/')
-            if not input_file:
-                await processing_msg.edit(
-                    "<blockquote>❌ <b>Gagal mengunduh media!</b></blockquote>",
-                    parse_mode="html"
-                )
-                await asyncio.sleep(3)
-                await processing_msg.delete()
-                await event.delete()
-                return
-                
             # Apply effect
-            output_file = await apply_effect(input_file, effect)
+            output_file = await apply_effect(user, reply_msg, chain)
             if not output_file:
                 await processing_msg.edit(
                     "<blockquote>❌ <b>Gagal memproses efek!</b></blockquote>",
@@ -173,15 +132,6 @@ async def setup(bot, user):
             if processing_msg:
                 await processing_msg.delete()
             await event.delete()
-        finally:
-            # Clean up files
-            try:
-                if 'input_file' in locals() and os.path.exists(input_file):
-                    os.remove(input_file)
-                if 'output_file' in locals() and os.path.exists(output_file):
-                    os.remove(output_file)
-            except:
-                pass
 
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID, pattern=f'^{current_prefix}effects$'))
     async def list_effects_handler(event):
@@ -199,6 +149,7 @@ async def setup(bot, user):
             "• <code>reverb</code> - Efek ruangan bergema",
             "• <code>squirrel</code> - Efek suara tupai (cepat & tinggi)",
             "",
+            f"<b>Gabung efek:</b> <code>{current_prefix}bass echo</code>",
             f"<b>Usage:</b> <code>{current_prefix}[efek]</code> balas ke audio/voice note"
         ]
         
@@ -1,10 +1,17 @@
 import os
 import asyncio
-import requests
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
 from telethon import events, utils
 from config import OWNER_ID
+from plugins.core.http import http_client
+from plugins.core.images import image_pipeline
+from plugins.core.lazy import lazy_import
+from plugins.core.media_cache import get_media_cache, media_key
+
+# Heavy dependencies, imported on first use
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
 
 # Configuration
 FONTS_DIR = "data/fonts"
@@ -14,6 +21,18 @@ MIN_FONT_SIZE = 50
 BASE_LENGTH = 10
 TEXT_MARGIN = 50
 LINE_SPACING = 15
+BG_URL = "https://ar-hosting.pages.dev/1747413244830.jpg"
+
+# Background image bytes, downloaded once
+_background = None
+
+async def get_background() -> bytes:
+    global _background
+    if _background is None:
+        response = await http_client.get(BG_URL, timeout=15)
+        response.raise_for_status()
+        _background = response.content
+    return _background
 
 def get_available_fonts():
     """Get available fonts from fonts directory"""
@@ -23,15 +42,12 @@ def get_available_fonts():
     
     return sorted([f for f in os.listdir(FONTS_DIR) if f.lower().endswith('.ttf')])
 
-async def generate_custom_image(text: str, font_file: str) -> BytesIO:
+def draw_custom_image(background: bytes, text: str, font_file: str) -> BytesIO:
     bio = BytesIO()
     
     try:
         # 1. Load background image
-        bg_url = "https://ar-hosting.pages.dev/1747413244830.jpg"
-        response = requests.get(bg_url, stream=True, timeout=15)
-        response.raise_for_status()
-        bg_img = Image.open(BytesIO(response.content)).convert("RGBA")
+        bg_img = Image.open(BytesIO(background)).convert("RGBA")
         draw = ImageDraw.Draw(bg_img)
         
         # 2. Load font
@@ -102,8 +118,14 @@ async def generate_custom_image(text: str, font_file: str) -> BytesIO:
             bio.close()
         raise Exception(f"Failed to generate image: {str(e)}")
 
+async def generate_custom_image(text: str, font_file: str) -> BytesIO:
+    """Draw the text on the background in the image pool"""
+    background = await get_background()
+    return await image_pipeline.run('gen', draw_custom_image, background, text, font_file)
+
 async def setup(bot, user):
     fonts = get_available_fonts()
+    media_cache = get_media_cache(user)
     
     if not fonts:
         print("[WARNING] No fonts found in data/fonts/")
@@ -154,10 +176,10 @@ async def setup(bot, user):
         )
         
         try:
-            img = await generate_custom_image(text, font_file)
-            await user.send_file(
+            await media_cache.send(
+                media_key('gen', font_file, text),
                 event.chat_id,
-                img,
+                lambda: generate_custom_image(text, font_file),
                 reply_to=event.id if event.is_reply else None,
                 force_document=False
             )
@@ -1,10 +1,13 @@
-import instaloader
 import os
 import re
 import json
 import asyncio
 from telethon import events
-from urllib.request import urlretrieve
+from plugins.core.http import http_client
+from plugins.core.lazy import lazy_import, lazy_object
+
+# Heavy dependencies, imported on first use
+instaloader = lazy_import('instaloader')
 
 try:
     from config import OWNER_ID
@@ -43,7 +46,10 @@ async def send_profile_info(event, profile, success_msg=None):
     try:
         prof_pic_url = profile.profile_pic_url.replace('s150x150', 's1080x1080')
         filename = f"downloads/{profile.username}_profile.jpg"
-        urlretrieve(prof_pic_url, filename)
+        response = await http_client.get(prof_pic_url, timeout=30)
+        response.raise_for_status()
+        with open(filename, 'wb') as f:
+            f.write(response.content)
         
         bio = profile.biography.replace('\n', '\n  ') if profile.biography else "Tidak ada bio"
         
@@ -82,11 +88,11 @@ async def setup(bot, user):
     os.makedirs('cache', exist_ok=True)
     os.makedirs('data', exist_ok=True)
 
-    L = instaloader.Instaloader(
+    L = lazy_object(lambda: instaloader.Instaloader(
         sleep=True,
         quiet=True,
         user_agent="Mozilla/5.0 (Linux; Android 10; SM-A305F) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Mobile Safari/537.36"
-    )
+    ))
 
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID))
     async def insta_handler(event):
@@ -1,13 +1,16 @@
 import os
 import json
-import aiohttp
 import asyncio
 from datetime import datetime
 from telethon import events
 from io import BytesIO
-from PIL import Image
 import random
 from config import OWNER_ID
+from plugins.core.http import http_client
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+Image = lazy_import('PIL.Image')
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -29,13 +32,12 @@ async def download_iqc_image(message_text):
     
     api_url = f"https://brat.siputzx.my.id/iphone-quoted?time={time}&batteryPercentage={battery}&carrierName=INDOSAT&messageText={message_text}&emojiStyle=apple"
     
-    async with aiohttp.ClientSession() as session:
-        async with session.get(api_url) as response:
-            if response.status == 200:
-                image_data = await response.read()
-                return image_data
-            else:
-                raise Exception(f"API returned status code: {response.status}")
+    response = await http_client.get(api_url)
+    if response.status == 200:
+        image_data = response.content
+        return image_data
+    else:
+        raise Exception(f"API returned status code: {response.status}")
 
 async def setup(bot, user):
     def is_command(msg, commands, prefix):
@@ -1,6 +1,7 @@
 import os
 import json
 import asyncio
+from functools import partial
 from io import BytesIO
 from telethon import events
 from telethon.tl.types import (
@@ -11,7 +12,11 @@ from telethon.tl.types import (
     InputDocument
 )
 from config import OWNER_ID
-from PIL import Image, ImageOps, UnidentifiedImageError
+from plugins.core.images import image_pipeline, to_sticker
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+Image = lazy_import('PIL.Image')
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -40,32 +45,14 @@ async def convert_to_sticker(media_data: bytes, is_video: bool = False) -> Bytes
             bio.seek(0)
             return bio
         
-        # Handle image stickers
+        # Handle image stickers (fix orientation, fit 512x512, webp) off the event loop
         try:
-            img = Image.open(BytesIO(media_data)).convert("RGBA")
-        except UnidentifiedImageError:
+            data = await image_pipeline.convert(media_data, partial(to_sticker, method=6), op='jadis')
+        except Image.UnidentifiedImageError:
             raise Exception("File bukan gambar yang valid atau format tidak didukung")
-            
-        # Remove exif orientation
-        img = ImageOps.exif_transpose(img)
-        
-        # Resize while maintaining aspect ratio
-        max_size = 512
-        width, height = img.size
-        if width > max_size or height > max_size:
-            ratio = min(max_size/width, max_size/height)
-            new_size = (int(width * ratio), int(height * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-        
-        # Create transparent canvas
-        canvas = Image.new("RGBA", (max_size, max_size), (0, 0, 0, 0))
-        x = (max_size - img.width) // 2
-        y = (max_size - img.height) // 2
-        canvas.paste(img, (x, y), img)
         
-        # Save as webp
+        bio.write(data)
         bio.name = "sticker.webp"
-        canvas.save(bio, format="WEBP", quality=95, method=6)
         bio.seek(0)
         return bio
         
@@ -1,7 +1,5 @@
 import asyncio
 import io
-import math
-import urllib.request
 from os import remove
 import os
 import json
@@ -20,10 +18,13 @@ from telethon.tl.types import (
     MessageMediaUnsupported,
 )
 from telethon.utils import get_input_document
-from PIL import Image
-import requests
-from bs4 import BeautifulSoup as bs
 from config import OWNER_ID
+from plugins.core.http import http_client
+from plugins.core.images import image_pipeline, to_png
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+bs = lazy_import('bs4', 'BeautifulSoup')
 
 # Make sure data directory exists
 os.makedirs('data', exist_ok=True)
@@ -151,14 +152,12 @@ def setup(bot, user):
                 packnick += " (Animated)"
                 cmd = "/newanimated"
             else:
-                image = await resize_photo(photo)
+                # Scale so the longer side is 512 px, off the event loop
+                file.write(await image_pipeline.convert(photo.getvalue(), to_png, op='kang'))
                 file.name = "sticker.png"
-                image.save(file, "PNG")
 
-            response = urllib.request.urlopen(
-                urllib.request.Request(f"http://t.me/addstickers/{packname}")
-            )
-            htmlstr = response.read().decode("utf8").split("\n")
+            response = await http_client.get(f"http://t.me/addstickers/{packname}")
+            htmlstr = response.text.split("\n")
 
             if (
                 "  A <strong>Telegram</strong> user has created the <strong>Sticker&nbsp;Set</strong>."
@@ -300,26 +299,4 @@ def setup(bot, user):
             await xx.edit(
                 "** Sticker Berhasil Ditambahkan!**"
                 f"\n        >> **[KLIK DISINI](t.me/addstickers/{packname})** <<\n**Untuk Menggunakan Stickers**"
-            )
-
-    async def resize_photo(photo):
-        image = Image.open(photo)
-        if (image.width and image.height) < 512:
-            size1 = image.width
-            size2 = image.height
-            if size1 > size2:
-                scale = 512 / size1
-                size1new = 512
-                size2new = size2 * scale
-            else:
-                scale = 512 / size2
-                size1new = size1 * scale
-                size2new = 512
-            size1new = math.floor(size1new)
-            size2new = math.floor(size2new)
-            sizenew = (size1new, size2new)
-            image = image.resize(sizenew)
-        else:
-            maxsize = (512, 512)
-            image.thumbnail(maxsize)
-        return image
\ No newline at end of file
+            )
\ No newline at end of file
@@ -1,28 +1,41 @@
 import os
 import json
-import aiohttp
 import asyncio
 from datetime import datetime
-from telethon import events, Button
+from telethon import events
 from telethon.tl.types import PeerUser
 from telethon.errors import FloodWaitError
-from config import OWNER_ID, BOT_TOKEN
+from config import OWNER_ID
+from plugins.core.scheduler import get_scheduler
 
 # Configuration
 CONFIG_DIR = 'data'
 os.makedirs(CONFIG_DIR, exist_ok=True)
-os.makedirs('downloads', exist_ok=True)  # Folder for downloaded media
 
 PREFIX_FILE = os.path.join(CONFIG_DIR, 'prefix.json')
 LOG_STATUS_FILE = os.path.join(CONFIG_DIR, 'log_status.json')
 NOTIF_GROUP_ID = -1002394303346  # Replace with your log group ID
 
+# Notifications waiting to be sent; newer ones are dropped when it is full
+QUEUE_SIZE = 200
+# Queue fill ratio above which media is logged as text only
+MEDIA_HIGH_WATER = 0.5
+# Seconds text notifications are collected into one digest message
+DIGEST_INTERVAL = 5
+# Characters per digest message (Telegram allows 4096)
+MAX_DIGEST_CHARS = 3800
+
 # Cache for bot information
 bot_info_cache = {
     'me': None,
     'last_updated': 0
 }
 
+# Log statuses, read from LOG_STATUS_FILE once and updated by set_log_status
+log_status_cache = {
+    'status': None
+}
+
 def get_live_prefix():
     """Get current prefix directly from file"""
     try:
@@ -32,8 +45,8 @@ def get_live_prefix():
     except (FileNotFoundError, json.JSONDecodeError):
         return '.'
 
-def get_log_status():
-    """Get log notification statuses for groups and PM"""
+def read_log_status():
+    """Read log notification statuses for groups and PM from the file"""
     default_status = {"groups": False, "pm": False}
     try:
         if not os.path.exists(LOG_STATUS_FILE):
@@ -50,12 +63,19 @@ def get_log_status():
     except (json.JSONDecodeError, FileNotFoundError):
         return default_status
 
+def get_log_status():
+    """Get log notification statuses (cached, checked on every message)"""
+    if log_status_cache['status'] is None:
+        log_status_cache['status'] = read_log_status()
+    return log_status_cache['status']
+
 def set_log_status(status_type, status):
     """Set log status for groups or PM"""
-    current_status = get_log_status()
+    current_status = dict(get_log_status())
     current_status[status_type] = status
     with open(LOG_STATUS_FILE, 'w') as f:
         json.dump(current_status, f)
+    log_status_cache['status'] = current_status
 
 async def get_bot_info(user):
     """Get cached bot info with flood wait handling"""
@@ -74,95 +94,146 @@ async def get_bot_info(user):
     except Exception:
         return None
 
-async def download_media(event):
-    """Download media to downloads folder"""
-    try:
-        ext_map = {
-            'photo': 'jpg',
-            'video': 'mp4',
-            'sticker': 'webp',
-            'audio': 'mp3',
-            'voice': 'ogg',
-            'gif': 'mp4',
-            'document': 'bin'
+class LogEntry:
+    """One notification waiting to be sent to the log group"""
+    __slots__ = ('chat_id', 'text', 'link', 'message')
+
+    def __init__(self, chat_id, text, link=None, message=None):
+        self.chat_id = chat_id
+        self.text = text
+        self.link = link        # t.me link to the original message
+        self.message = message  # message whose media is sent along, or None
+
+class LogPipeline:
+    """Bounded queue between the notification handler and the log group.
+
+    Text entries are coalesced into one digest message every
+    DIGEST_INTERVAL seconds. Media is forwarded by the userbot (the bot
+    cannot use the userbot's file references), so nothing is downloaded,
+    and its text follows in the digest. When the queue is full new entries
+    are dropped and counted; above MEDIA_HIGH_WATER media entries are sent
+    as text only. Dropped entries are summarized in the next digest.
+    """
+
+    def __init__(self, bot, user, maxsize=QUEUE_SIZE):
+        self.bot = bot
+        self.user = user
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.scheduler = get_scheduler(bot)
+        self.dropped = 0
+        self.dropped_by_chat = {}  # {chat_id: dropped entries}, reset by each digest
+        self.downgraded = 0        # media entries sent as text only
+        self.sent = 0
+        self.digests = 0
+        self.failed = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, entry):
+        """Queue an entry without waiting; False if it was dropped"""
+        if entry.message is not None and self.queue.qsize() >= self.queue.maxsize * MEDIA_HIGH_WATER:
+            entry.message = None
+            self.downgraded += 1
+        try:
+            self.queue.put_nowait(entry)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self.dropped_by_chat[entry.chat_id] = self.dropped_by_chat.get(entry.chat_id, 0) + 1
+            return False
+
+    def stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'capacity': self.queue.maxsize,
+            'sent': self.sent,
+            'digests': self.digests,
+            'dropped': self.dropped,
+            'downgraded': self.downgraded,
+            'failed': self.failed,
         }
-        
-        for attr, ext in ext_map.items():
-            if getattr(event, attr, None):
-                filename = f"downloads/{datetime.now().strftime('%Y%m%d_%H%M%S')}_{attr}.{ext}"
-                await event.download_media(file=filename)
-                return filename, attr
-        return None, None
-    except Exception:
-        return None, None
 
-async def send_to_log(text, buttons=None, media_path=None, media_type=None):
-    """Send message to log group with proper media handling"""
-    try:
-        if media_path and os.path.exists(media_path):
-            # Determine the appropriate API endpoint based on media type
-            api_map = {
-                'photo': 'sendPhoto',
-                'video': 'sendVideo',
-                'sticker': 'sendSticker',
-                'audio': 'sendAudio',
-                'voice': 'sendVoice',
-                'document': 'sendDocument'
-            }
-            
-            endpoint = api_map.get(media_type, 'sendDocument')
-            url = f"https://api.telegram.org/bot{BOT_TOKEN}/{endpoint}"
-            
-            with open(media_path, 'rb') as f:
-                form = aiohttp.FormData()
-                form.add_field('chat_id', str(NOTIF_GROUP_ID))
-                form.add_field('caption', text[:1024])
-                form.add_field('parse_mode', 'markdown')
-                
-                # Special handling for different media types
-                if media_type == 'sticker':
-                    form.add_field('sticker', f)
-                else:
-                    form.add_field(media_type, f)
-                
-                async with aiohttp.ClientSession() as session:
-                    await session.post(url, data=form)
-                    
-                # Clean up downloaded file
-                os.remove(media_path)
-                
-            # Send buttons separately if they exist
-            if buttons:
-                url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-                data = {
-                    "chat_id": NOTIF_GROUP_ID,
-                    "text": "⬆️ Media above",
-                    "reply_markup": {
-                        "inline_keyboard": [[{"text": b.text, "url": b.url}] for b in buttons[0]]
-                    }
-                }
-                async with aiohttp.ClientSession() as session:
-                    await session.post(url, json=data)
-        else:
-            # Text-only message
-            url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-            data = {
-                "chat_id": NOTIF_GROUP_ID,
-                "text": text,
-                "parse_mode": "markdown",
-            }
-            if buttons:
-                data["reply_markup"] = {
-                    "inline_keyboard": [[{"text": b.text, "url": b.url}] for b in buttons[0]]
-                }
-            
-            async with aiohttp.ClientSession() as session:
-                await session.post(url, json=data)
-    except Exception:
-        if media_path and os.path.exists(media_path):
-            os.remove(media_path)
+    async def _run(self):
+        digest = []
+        loop = asyncio.get_running_loop()
+        deadline = None  # loop time the pending digest is due
+        while True:
+            timeout = None if deadline is None else max(0, deadline - loop.time())
+            try:
+                entry = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                entry = None
+
+            if entry is not None and entry.message is not None:
+                await self._send_media(entry)
+            elif entry is not None:
+                digest.append(entry)
+
+            if (digest or self.dropped_by_chat) and deadline is None:
+                deadline = loop.time() + DIGEST_INTERVAL
+            due = deadline is not None and loop.time() >= deadline
+            if due or sum(len(e.text) for e in digest) >= MAX_DIGEST_CHARS:
+                await self._send_digest(digest)
+                digest = []
+                deadline = None
+
+    def _drop_summary(self):
+        if not self.dropped_by_chat:
+            return ""
+        total = sum(self.dropped_by_chat.values())
+        chats = ", ".join(f"`{chat_id}` ×{count}" for chat_id, count in self.dropped_by_chat.items())
+        self.dropped_by_chat = {}
+        return f"⚠️ **{total} notifikasi dilewati (antrian penuh):** {chats}"
+
+    async def _send_digest(self, entries):
+        parts = []
+        for entry in entries:
+            text = entry.text
+            if entry.link:
+                text += f"[📩 Open Message]({entry.link})\n"
+            parts.append(text)
+        summary = self._drop_summary()
+        if summary:
+            parts.append(summary)
+
+        # Split at entry boundaries so no message passes Telegram's limit;
+        # each chunk keeps the number of entries it carries
+        chunks, current, count = [], "", 0
+        for i, part in enumerate(parts):
+            if current and len(current) + len(part) + 1 > MAX_DIGEST_CHARS:
+                chunks.append((current, count))
+                current, count = "", 0
+            current += part[:MAX_DIGEST_CHARS] + "\n"
+            count += i < len(entries)
+        if current:
+            chunks.append((current, count))
+
+        for chunk, count in chunks:
+            try:
+                await self.scheduler.run('send', self.bot.send_message, NOTIF_GROUP_ID, chunk,
+                                         parse_mode="markdown", link_preview=False)
+                self.digests += 1
+                self.sent += count
+            except Exception:
+                self.failed += count or 1
+
+    async def _send_media(self, entry):
+        try:
+            # The media belongs to the userbot, so the userbot forwards it
+            await get_scheduler(self.user).run('send', self.user.forward_messages, NOTIF_GROUP_ID, entry.message)
+        except Exception:
+            self.failed += 1
+        # The notification text goes out with the next digest either way
+        entry.message = None
+        self.submit(entry)
 
 async def setup(bot, user):
+    pipeline = LogPipeline(bot, user)
+    pipeline.start()
+
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID))
     async def log_cmd(event):
         """Handle log enable/disable commands"""
@@ -173,6 +244,17 @@ async def setup(bot, user):
             return
             
         args = msg.split()
+        if args[0].lower() == f"{current_prefix}logstats":
+            stats = pipeline.stats()
+            await event.reply(
+                f"**Log pipeline**\n"
+                f"Antrian: `{stats['queued']}/{stats['capacity']}`\n"
+                f"Terkirim: `{stats['sent']}` ({stats['digests']} digest)\n"
+                f"Dilewati: `{stats['dropped']}`\n"
+                f"Media jadi teks: `{stats['downgraded']}`\n"
+                f"Gagal: `{stats['failed']}`"
+            )
+            return await event.delete()
         if len(args) < 2:
             return await event.delete()
         
@@ -235,7 +317,9 @@ async def setup(bot, user):
             date_str = event.date.strftime("%Y-%m-%d %H:%M:%S")
 
             # Handle media
-            media_path, media_type = await download_media(event)
+            media_type = next((attr for attr in (
+                'photo', 'video', 'sticker', 'audio', 'voice', 'gif', 'document'
+            ) if getattr(event, attr, None)), None)
             msg_type = "Text"
             type_emoji = {
                 'photo': '🖼 Photo',
@@ -264,13 +348,12 @@ async def setup(bot, user):
             if message and not media_type:
                 notif_text += f"**Message:**\n```{message[:1000]}```\n"
 
-            # Add button for group messages
-            buttons = None
+            # Link for group messages
+            url_chat = None
             if not is_pm and str(chat_id).startswith("-100"):
                 url_chat = f"https://t.me/c/{str(chat_id)[4:]}/{event.id}"
-                buttons = [[Button.url("📩 Open Message", url_chat)]]
 
-            await send_to_log(notif_text, buttons, media_path, media_type)
+            pipeline.submit(LogEntry(chat_id, notif_text, url_chat, event.message if media_type else None))
 
         except FloodWaitError:
             return
@@ -1,16 +1,19 @@
 import os
 import json
 import asyncio
-import aiohttp
 import logging
 import re
 import math
 import time
-from bs4 import BeautifulSoup
 from telethon import events, types
-from yt_dlp import YoutubeDL
 from config import LYRICS_API_KEY, OWNER_ID
 from telethon.errors import ChatAdminRequiredError
+from plugins.core.http import http_client
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+BeautifulSoup = lazy_import('bs4', 'BeautifulSoup')
+YoutubeDL = lazy_import('yt_dlp', 'YoutubeDL')
 
 # Configuration
 GENIUS_API = "https://api.genius.com"
@@ -90,74 +93,74 @@ class YTDLProgressHook:
                     self.loop
                 )
 
-async def get_genius_song_info(session, query):
+async def get_genius_song_info(query):
     """Search for song using Genius API"""
     try:
         headers = {"Authorization": f"Bearer {LYRICS_API_KEY}"}
-        async with session.get(
+        response = await http_client.get(
             f"{GENIUS_API}/search",
             params={'q': query},
             headers=headers,
             timeout=15
-        ) as response:
-            if response.status != 200:
-                return None
-                
-            data = await response.json()
-            if not data['response']['hits']:
-                return None
-                
-            hit = data['response']['hits'][0]['result']
-            return {
-                'url': hit['url'],
-                'title': hit['title'],
-                'artist': hit['primary_artist']['name']
-            }
+        )
+        if response.status != 200:
+            return None
+            
+        data = response.json()
+        if not data['response']['hits']:
+            return None
+            
+        hit = data['response']['hits'][0]['result']
+        return {
+            'url': hit['url'],
+            'title': hit['title'],
+            'artist': hit['primary_artist']['name']
+        }
     except Exception as e:
         logger.error(f"Genius API Error: {str(e)}")
         return None
 
-async def scrape_genius_lyrics(session, url):
+async def scrape_genius_lyrics(url):
     """Scrape lyrics from Genius page"""
     try:
-        async with session.get(url, timeout=15) as response:
-            if response.status != 200:
-                return None
-                
-            html = await response.text()
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Try multiple selectors for robustness
-            selectors = [
-                {'data-lyrics-container': 'true'},  # New Genius
-                {'class': 'lyrics'},                # Old Genius
-                {'class': 'Lyrics__Container'}      # Alternate
-            ]
-            
-            lyrics_container = None
-            for selector in selectors:
-                lyrics_container = soup.find('div', selector)
-                if lyrics_container:
-                    break
+        response = await http_client.get(url, timeout=15)
+        if response.status != 200:
+            return None
             
-            if not lyrics_container:
-                return None
-                
-            lyrics = lyrics_container.get_text(separator='\n')
+        html = response.text
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Try multiple selectors for robustness
+        selectors = [
+            {'data-lyrics-container': 'true'},  # New Genius
+            {'class': 'lyrics'},                # Old Genius
+            {'class': 'Lyrics__Container'}      # Alternate
+        ]
+        
+        lyrics_container = None
+        for selector in selectors:
+            lyrics_container = soup.find('div', selector)
+            if lyrics_container:
+                break
+        
+        if not lyrics_container:
+            return None
             
-            # Clean lyrics
-            cleaned_lines = []
-            for line in lyrics.split('\n'):
-                line = line.strip()
+        lyrics = lyrics_container.get_text(separator='\n')
+        
+        # Clean lyrics
+        cleaned_lines = []
+        for line in lyrics.split('\n'):
+            line = line.strip()
+            if line:
+                line = re.sub(r'[\[\(\{].*?[\]\)\}]', '', line)  # Remove annotations
+                line = re.sub(r'\d+', '', line)  # Remove numbers
+                line = line.replace('Embed', '').replace('URLCopyEmbedCopy', '')
                 if line:
-                    line = re.sub(r'[\[\(\{].*?[\]\)\}]', '', line)  # Remove annotations
-                    line = re.sub(r'\d+', '', line)  # Remove numbers
-                    line = line.replace('Embed', '').replace('URLCopyEmbedCopy', '')
-                    if line:
-                        cleaned_lines.append(line)
-            
-            return '\n'.join(cleaned_lines)
-            
+                    cleaned_lines.append(line)
+        
+        return '\n'.join(cleaned_lines)
+        
     except Exception as e:
         logger.error(f"Scraping Error: {str(e)}")
         return None
@@ -251,17 +254,16 @@ async def setup(bot, user):
         if not query:
             return await event.reply(f"ℹ️ Usage: `{current_prefix}lagu <song title>`")
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                song_info = await get_genius_song_info(session, query)
-                if not song_info:
-                    return await event.reply("❌ Song not found")
-                    
-                await process_audio(event, song_info)
+        try:
+            song_info = await get_genius_song_info(query)
+            if not song_info:
+                return await event.reply("❌ Song not found")
                 
-            except Exception as e:
-                logger.error(f"Song Error: {str(e)}")
-                await event.reply(f"❌ Error: {str(e)[:200]}")
+            await process_audio(event, song_info)
+            
+        except Exception as e:
+            logger.error(f"Song Error: {str(e)}")
+            await event.reply(f"❌ Error: {str(e)[:200]}")
 
     @user.on(events.NewMessage(outgoing=True, pattern=f'^{current_prefix}lirik(?: |$)(.*)'))
     async def lyrics_handler(event):
@@ -270,36 +272,35 @@ async def setup(bot, user):
         if not query:
             return await event.reply(f"ℹ️ Usage: `{current_prefix}lirik <song title>`")
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                progress_msg = await event.reply("🔍 Searching lyrics...")
+        try:
+            progress_msg = await event.reply("🔍 Searching lyrics...")
+            
+            song_info = await get_genius_song_info(query)
+            if not song_info:
+                return await progress_msg.edit("❌ Lyrics not found")
                 
-                song_info = await get_genius_song_info(session, query)
-                if not song_info:
-                    return await progress_msg.edit("❌ Lyrics not found")
-                    
-                lyrics = await scrape_genius_lyrics(session, song_info['url'])
-                if not lyrics:
-                    return await progress_msg.edit("❌ Failed to get lyrics")
-                    
-                header = f"🎵 **{song_info['title']}** - {song_info['artist']}\n\n"
-                max_length = MAX_LYRICS_LENGTH - len(header)
+            lyrics = await scrape_genius_lyrics(song_info['url'])
+            if not lyrics:
+                return await progress_msg.edit("❌ Failed to get lyrics")
                 
-                # Send lyrics in chunks
-                for i in range(0, len(lyrics), max_length):
-                    chunk = lyrics[i:i+max_length]
-                    await event.reply(f"{header}{chunk}", parse_mode='markdown')
-                    header = ""  # Only show header for first message
-                    
-                await progress_msg.delete()
+            header = f"🎵 **{song_info['title']}** - {song_info['artist']}\n\n"
+            max_length = MAX_LYRICS_LENGTH - len(header)
+            
+            # Send lyrics in chunks
+            for i in range(0, len(lyrics), max_length):
+                chunk = lyrics[i:i+max_length]
+                await event.reply(f"{header}{chunk}", parse_mode='markdown')
+                header = ""  # Only show header for first message
                 
-            except Exception as e:
-                logger.error(f"Lyrics Error: {str(e)}")
-                await event.reply(f"❌ Error: {str(e)[:200]}")
-                try:
-                    await progress_msg.delete()
-                except:
-                    pass
+            await progress_msg.delete()
+            
+        except Exception as e:
+            logger.error(f"Lyrics Error: {str(e)}")
+            await event.reply(f"❌ Error: {str(e)[:200]}")
+            try:
+                await progress_msg.delete()
+            except:
+                pass
 
     @user.on(events.NewMessage(outgoing=True, pattern=f'^{current_prefix}lyrichelp'))
     async def lyrics_help_handler(event):
@@ -4,9 +4,9 @@ import re
 import json
 import time
 import asyncio
-import aiohttp
 from telethon import events
 from config import OWNER_ID
+from plugins.core.http import http_client
 from urllib.parse import unquote, urlparse
 from math import floor
 
@@ -35,65 +35,64 @@ async def download_from_mediafire(url, event):
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     }
     
-    async with aiohttp.ClientSession(headers=headers) as session:
-        try:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    return None, None, f"Failed to access URL (HTTP {resp.status})"
-                
-                html = await resp.text()
-                match = re.search(r'aria-label="Download file"\s+href="([^"]+)"', html)
-                if not match:
-                    match = re.search(r'class="input popsok"\s+value="([^"]+)"', html)
-                    if not match:
-                        return None, None, "Download link not found"
-                
-                download_url = match.group(1)
-                if download_url.startswith('//'):
-                    download_url = 'https:' + download_url
-                elif download_url.startswith('/'):
-                    download_url = 'https://www.mediafire.com' + download_url
-                
-                filename = os.path.basename(unquote(urlparse(url).path)) or "mediafire_download"
+    try:
+        resp = await http_client.get(url, headers=headers)
+        if resp.status != 200:
+            return None, None, f"Failed to access URL (HTTP {resp.status})"
+        
+        html = resp.text
+        match = re.search(r'aria-label="Download file"\s+href="([^"]+)"', html)
+        if not match:
+            match = re.search(r'class="input popsok"\s+value="([^"]+)"', html)
+            if not match:
+                return None, None, "Download link not found"
+        
+        download_url = match.group(1)
+        if download_url.startswith('//'):
+            download_url = 'https:' + download_url
+        elif download_url.startswith('/'):
+            download_url = 'https://www.mediafire.com' + download_url
+        
+        filename = os.path.basename(unquote(urlparse(url).path)) or "mediafire_download"
+        file_path = os.path.join(DOWNLOAD_DIR, filename)
+        
+        async with http_client.stream('GET', download_url, headers=headers) as resp:
+            if resp.status != 200:
+                return None, None, f"Download failed (HTTP {resp.status})"
+            
+            content_disposition = resp.headers.get('Content-Disposition', '')
+            if 'filename=' in content_disposition:
+                filename = unquote(content_disposition.split('filename=')[1].strip('"'))
                 file_path = os.path.join(DOWNLOAD_DIR, filename)
-                
-                async with session.get(download_url) as resp:
-                    if resp.status != 200:
-                        return None, None, f"Download failed (HTTP {resp.status})"
-                    
-                    content_disposition = resp.headers.get('Content-Disposition', '')
-                    if 'filename=' in content_disposition:
-                        filename = unquote(content_disposition.split('filename=')[1].strip('"'))
-                        file_path = os.path.join(DOWNLOAD_DIR, filename)
-                    
-                    total_size = int(resp.headers.get('content-length', 0))
-                    downloaded = 0
-                    last_progress = -1
-                    start_time = time.time()
+            
+            total_size = int(resp.headers.get('content-length', 0))
+            downloaded = 0
+            last_progress = -1
+            start_time = time.time()
 
-                    with open(file_path, 'wb') as f:
-                        async for chunk in resp.content.iter_chunked(8192):
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            progress = floor((downloaded / total_size) * 100)
+            with open(file_path, 'wb') as f:
+                async for chunk in resp.iter_chunks(8192):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    progress = floor((downloaded / total_size) * 100)
 
-                            # Update every 5% or 1 second
-                            now = time.time()
-                            if progress >= last_progress + 5 or now - start_time >= 1:
-                                last_progress = progress
-                                start_time = now
-                                text = (
-                                    f"📥 **Downloading:** `{filename}`\n"
-                                    f"📦 **Progress:** `{progress}%`\n"
-                                    f"🔄 **Status:** `{human_readable_size(downloaded)}/{human_readable_size(total_size)}`"
-                                )
-                                if event.text != text:
-                                    await event.edit(text)
+                    # Update every 5% or 1 second
+                    now = time.time()
+                    if progress >= last_progress + 5 or now - start_time >= 1:
+                        last_progress = progress
+                        start_time = now
+                        text = (
+                            f"📥 **Downloading:** `{filename}`\n"
+                            f"📦 **Progress:** `{progress}%`\n"
+                            f"🔄 **Status:** `{human_readable_size(downloaded)}/{human_readable_size(total_size)}`"
+                        )
+                        if event.text != text:
+                            await event.edit(text)
 
-                    return file_path, filename, None
-                    
-        except Exception as e:
-            return None, None, f"Error: {str(e)}"
+            return file_path, filename, None
+            
+    except Exception as e:
+        return None, None, f"Error: {str(e)}"
 
 def human_readable_size(size):
     for unit in ['B', 'KB', 'MB', 'GB']:
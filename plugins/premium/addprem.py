@@ -1,51 +1,12 @@
 import json
 import os
-from telethon import events
+from datetime import datetime
 from config import OWNER_ID
+from plugins.core.premium import premium_registry
+from plugins.core.router import get_router
 
-PREMIUM_FILE = 'premium/premium.json'
 NOMOR_FILE = 'data/nomor.json'
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open(PREMIUM_FILE, 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
-
-def load_premium_users():
-    try:
-        if os.path.exists(PREMIUM_FILE):
-            with open(PREMIUM_FILE, 'r') as f:
-                return json.load(f)
-    except:
-        return {"users": []}
-    return {"users": []}
-
-def save_premium_users(data):
-    with open(PREMIUM_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-
 def load_nomor():
     try:
         if os.path.exists(NOMOR_FILE):
@@ -58,30 +19,32 @@ def load_nomor():
 async def setup(bot, client, user_id):
     """Setup admin commands for owner only"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def admin_handler(event):
+    @router.command("addprem", "pvaddprem", "delprem", "listprem", "disconnect", "ceknomor")
+    async def admin_handler(event, cmd):
         """Handle admin commands (owner only)"""
         # Check if user is owner
         if event.sender_id != OWNER_ID:
             return
 
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
         # Helper function to check commands
-        def is_command(cmd):
-            return msg.startswith(f"{current_prefix}{cmd}")
+        def is_command(name):
+            return cmd.name == name
 
         # ADD PREMIUM command
         if is_command("addprem"):
-            target = msg[len(current_prefix)+7:].strip()
+            target, days = cmd.args, None
+            parts = target.split()
+            if len(parts) > 1 and parts[-1].rstrip('d').isdigit():
+                days = int(parts[-1].rstrip('d'))
+                target = ' '.join(parts[:-1])
             if not target:
                 if event.is_reply:
                     replied = await event.get_reply_message()
                     target_id = replied.sender_id
                 else:
-                    await event.reply("<blockquote>❌ Gunakan: <code>.addprem @username</code> atau reply pesan</blockquote>", parse_mode="html")
+                    await event.reply("<blockquote>❌ Gunakan: <code>.addprem @username [hari]</code> atau reply pesan</blockquote>", parse_mode="html")
                     return
             else:
                 if target.startswith('@'):
@@ -98,11 +61,7 @@ async def setup(bot, client, user_id):
                         await event.reply("<blockquote>❌ ID harus angka atau username</blockquote>", parse_mode="html")
                         return
 
-            premium_data = load_premium_users()
-            if str(target_id) not in premium_data["users"]:
-                premium_data["users"].append(str(target_id))
-                save_premium_users(premium_data)
-
+            if premium_registry.add(target_id, days):
                 try:
                     await client.send_message(
                         target_id,
@@ -114,7 +73,8 @@ async def setup(bot, client, user_id):
 
                 await event.reply(f"<blockquote>✅ Sukses</blockquote>", parse_mode="html")
             else:
-                await event.reply("<blockquote>ℹ️ Pengguna sudah premium</blockquote>", parse_mode="html")
+                note = " (masa aktif diperbarui)" if days else ""
+                await event.reply(f"<blockquote>ℹ️ Pengguna sudah premium{note}</blockquote>", parse_mode="html")
 
         # PVADDPREM command - Add premium untuk semua anggota grup
         elif is_command("pvaddprem"):
@@ -124,7 +84,6 @@ async def setup(bot, client, user_id):
 
             processing_msg = await event.reply("<blockquote>🔄 <b>Memproses semua anggota grup...</b></blockquote>", parse_mode="html")
             
-            premium_data = load_premium_users()
             added_count = 0
             already_premium_count = 0
             error_count = 0
@@ -135,10 +94,7 @@ async def setup(bot, client, user_id):
                     if getattr(member, 'bot', False) or getattr(member, 'is_self', False):
                         continue
                     
-                    user_id_str = str(member.id)
-                    
-                    if user_id_str not in premium_data["users"]:
-                        premium_data["users"].append(user_id_str)
+                    if premium_registry.add(member.id):
                         added_count += 1
                         
                         # Kirim notifikasi ke user yang berhasil ditambahkan
@@ -153,8 +109,6 @@ async def setup(bot, client, user_id):
                     else:
                         already_premium_count += 1
                 
-                save_premium_users(premium_data)
-                
                 result_message = (
                     f"<blockquote>✅ <b>Proses PVADDPREM Selesai!</b></blockquote>\n\n"
                     f"<blockquote>📊 <b>Hasil:</b>\n"
@@ -171,7 +125,7 @@ async def setup(bot, client, user_id):
 
         # DELETE PREMIUM command
         elif is_command("delprem"):
-            target = msg[len(current_prefix)+7:].strip()
+            target = cmd.args
             if not target:
                 if event.is_reply:
                     replied = await event.get_reply_message()
@@ -194,11 +148,7 @@ async def setup(bot, client, user_id):
                         await event.reply("<blockquote>❌ ID harus angka atau username</blockquote>", parse_mode="html")
                         return
 
-            premium_data = load_premium_users()
-            if str(target_id) in premium_data["users"]:
-                premium_data["users"].remove(str(target_id))
-                save_premium_users(premium_data)
-
+            if premium_registry.remove(target_id):
                 try:
                     await client.send_message(
                         target_id,
@@ -214,8 +164,7 @@ async def setup(bot, client, user_id):
 
         # LIST PREMIUM command
         elif is_command("listprem"):
-            premium_data = load_premium_users()
-            users = premium_data.get("users", [])
+            users = premium_registry.users()
             
             if not users:
                 await event.reply("<blockquote>❌ Tidak ada pengguna premium</blockquote>", parse_mode="html")
@@ -223,21 +172,23 @@ async def setup(bot, client, user_id):
 
             message = "<blockquote>📋 Daftar Pengguna Premium:</blockquote>\n\n"
             for user_id in users:
+                expires = premium_registry.expires_at(user_id)
+                until = f" - s/d {datetime.fromtimestamp(expires):%d-%m-%Y}" if expires else ""
                 try:
                     entity = await client.get_entity(int(user_id))
                     name = entity.first_name
                     if entity.last_name:
                         name += f" {entity.last_name}"
                     username = f"@{entity.username}" if entity.username else "No Username"
-                    message += f"<blockquote>• {name} ({username}) - <code>{user_id}</code></blockquote>\n"
+                    message += f"<blockquote>• {name} ({username}) - <code>{user_id}</code>{until}</blockquote>\n"
                 except Exception:
-                    message += f"<blockquote>• <code>{user_id}</code></blockquote>\n"
+                    message += f"<blockquote>• <code>{user_id}</code>{until}</blockquote>\n"
 
             await event.reply(message, parse_mode="html")
 
         # DISCONNECT command
         elif is_command("disconnect"):
-            target = msg[len(current_prefix)+10:].strip()
+            target = cmd.args
             if not target:
                 await event.reply("<blockquote>❌ Gunakan: <code>.disconnect user_id</code></blockquote>", parse_mode="html")
                 return
@@ -258,7 +209,7 @@ async def setup(bot, client, user_id):
 
         # CEK NOMOR command
         elif is_command("ceknomor"):
-            target = msg[len(current_prefix)+8:].strip()
+            target = cmd.args
             if not target:
                 await event.reply("<blockquote>❌ Gunakan: <code>.ceknomor user_id</code></blockquote>", parse_mode="html")
                 return
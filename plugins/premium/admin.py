@@ -1,10 +1,9 @@
 import os
-import json
 import asyncio
 import logging
 import random
 from datetime import datetime
-from telethon import events, types
+from telethon import types
 from telethon.errors import ChatAdminRequiredError, YouBlockedUserError
 from telethon.tl.functions.channels import (
     EditBannedRequest,
@@ -13,7 +12,6 @@ from telethon.tl.functions.channels import (
     DeleteChannelRequest
 )
 from telethon.tl.types import (
-    ChannelParticipantsAdmins,
     ChannelParticipantsSearch,
     ChatBannedRights,
     ChatAdminRights,
@@ -22,7 +20,11 @@ from telethon.tl.types import (
     DocumentAttributeVideo,
     DocumentAttributeAudio
 )
-from config import OWNER_ID
+from plugins.core.admins import get_admin_index
+from plugins.core.config import get_active_prefix
+from plugins.core.participants import get_participant_service
+from plugins.core.router import get_router
+from plugins.core.scheduler import get_scheduler
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -73,37 +75,9 @@ class MediaBuffer:
 
 media_buffer = MediaBuffer()
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
-
 def get_live_prefix(user_id=None):
     """Get current prefix directly from file"""
-    return get_prefix(user_id)
+    return get_active_prefix(user_id)
 
 async def download_media(message, media_type):
     """Download media and save to appropriate directory"""
@@ -147,40 +121,18 @@ def determine_media_type(message):
 async def setup(bot, client, user_id):
     """Setup admin commands for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
+    scheduler = get_scheduler(client)
+    admin_index = get_admin_index(client, current_user_id)
+    participants = get_participant_service(client)
 
     # ===== PIN/UNPIN =====
-    @client.on(events.NewMessage())
-    async def pin_handler(event):
+    @router.command("pin", "unpin")
+    async def pin_handler(event, cmd):
         """Handle pin command"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        msg = (event.text or '').strip()
-        current_prefix = get_prefix(current_user_id)
-        
-        # Check command format
-        is_pin_cmd = False
-        is_unpin_cmd = False
-        
-        if current_prefix:
-            if msg == f"{current_prefix}pin":
-                is_pin_cmd = True
-            elif msg == f"{current_prefix}unpin":
-                is_unpin_cmd = True
-        else:
-            if msg.lower() == "pin":
-                is_pin_cmd = True
-            elif msg.lower() == "unpin":
-                is_unpin_cmd = True
-                
-        if not (is_pin_cmd or is_unpin_cmd):
+        if cmd.args:
             return
+        is_pin_cmd = cmd.name == "pin"
 
         # Common checks for both commands
         if not (event.is_group or event.is_channel):
@@ -210,35 +162,11 @@ async def setup(bot, client, user_id):
             await event.delete()
 
     # ===== TITLE =====
-    @client.on(events.NewMessage())
-    async def title_handler(event):
+    @router.command("title")
+    async def title_handler(event, cmd):
         """Handle title command"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        msg = (event.text or '').strip()
-        current_prefix = get_prefix(current_user_id)
-        
-        # Check command format
-        is_title_cmd = False
-        title = ""
-        
-        if current_prefix:
-            if msg.startswith(f"{current_prefix}title "):
-                is_title_cmd = True
-                title = msg[len(current_prefix)+6:].strip()
-        else:
-            if msg.lower().startswith("title "):
-                is_title_cmd = True
-                title = msg[6:].strip()
-                
-        if not is_title_cmd or not title:
+        title = cmd.args
+        if not title:
             return
 
         # Validate chat type and permissions
@@ -269,29 +197,12 @@ async def setup(bot, client, user_id):
             await event.delete()
 
     # ===== DELETE =====
-    @client.on(events.NewMessage())
-    async def del_handler(event):
+    @router.command("del")
+    async def del_handler(event, cmd):
         """Handle message deletion commands"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
+        if cmd.args or not event.is_reply:
             return
 
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        if current_prefix:
-            if not (msg == f"{current_prefix}del" and event.is_reply):
-                return
-        else:
-            if not (msg.lower() == "del" and event.is_reply):
-                return
-
         reply = await event.get_reply_message()
         if not reply:
             notif = await event.reply("<blockquote>❌ <b>Balas pesan yang ingin dihapus</b></blockquote>", parse_mode="html")
@@ -319,32 +230,10 @@ async def setup(bot, client, user_id):
             await error_msg.delete()
 
     # ===== STAFF LIST =====
-    @client.on(events.NewMessage())
-    async def staff_handler(event):
+    @router.command("staff")
+    async def staff_handler(event, cmd):
         """Handle staff list command"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        msg = (event.text or '').strip()
-        current_prefix = get_prefix(current_user_id)
-        
-        # Check command format
-        is_staff_cmd = False
-        
-        if current_prefix:
-            if msg == f"{current_prefix}staff":
-                is_staff_cmd = True
-        else:
-            if msg.lower() == "staff":
-                is_staff_cmd = True
-                
-        if not is_staff_cmd:
+        if cmd.args:
             return
 
         # Validate chat type
@@ -356,35 +245,32 @@ async def setup(bot, client, user_id):
         
         try:
             staff_list = []
-            async for admin in client.iter_participants(
-                event.chat_id,
-                filter=ChannelParticipantsAdmins
-            ):
+            for admin in await admin_index.admins(event.chat_id):
                 # Skip bots
-                if getattr(admin, 'bot', False):
+                if admin['bot']:
                     continue
 
                 # Determine role
-                if getattr(admin, 'is_creator', False):
+                if admin['creator']:
                     role = "👑 Owner"
-                elif getattr(admin, 'admin_rights', None):
+                elif admin['rights']:
                     role = "🛡️ Admin"
                 else:
                     role = "👤 Staff"
 
                 # Add custom title if available
-                title = getattr(admin, 'rank', None)
+                title = admin['rank']
                 if title:
                     role += f" ({title})"
 
-                mention = f"<a href='tg://user?id={admin.id}'>{admin.first_name or 'No Name'}</a>"
-                username = f"@{admin.username}" if admin.username else "—"
+                mention = f"<a href='tg://user?id={admin['id']}'>{admin['first_name'] or 'No Name'}</a>"
+                username = f"@{admin['username']}" if admin['username'] else "—"
 
                 staff_list.append(
                     f"{role}\n"
                     f" ├ <b>Nama:</b> {mention}\n"
                     f" ├ <b>Username:</b> {username}\n"
-                    f" └ <b>ID:</b> <code>{admin.id}</code>"
+                    f" └ <b>ID:</b> <code>{admin['id']}</code>"
                 )
 
             if not staff_list:
@@ -412,30 +298,10 @@ async def setup(bot, client, user_id):
             await event.delete()
 
     # ===== KICK =====
-    @client.on(events.NewMessage())
-    async def kick_handler(event):
+    @router.command("kick")
+    async def kick_handler(event, cmd):
         """Handle kick command"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        if current_prefix:
-            if not msg.startswith(f"{current_prefix}kick"):
-                return
-            target = msg[len(current_prefix)+4:].strip()
-        else:
-            if not msg.lower().startswith("kick"):
-                return
-            target = msg[4:].strip()
+        target = cmd.args
 
         # Check if in group/channel
         if not event.is_group and not event.is_channel:
@@ -473,47 +339,17 @@ async def setup(bot, client, user_id):
                 await event.reply(f"<blockquote>❌ <b>Gagal mengkick:</b> <code>{str(e)}</code></blockquote>", parse_mode="html")
 
     # ===== TAG =====
-    @client.on(events.NewMessage())
-    async def tag_handler(event):
+    @router.command("tag", "stag")
+    async def tag_handler(event, cmd):
         """Handle tag command"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        msg = (event.text or '').strip()
-        current_prefix = get_prefix(current_user_id)
-        
-        # Check command format
-        is_tag_cmd = False
-        is_stop_cmd = False
-        message = "Halo semuanya!"
-        
-        if current_prefix:
-            if msg.startswith(f"{current_prefix}tag"):
-                is_tag_cmd = True
-                message = msg[len(current_prefix)+4:].strip() or message
-            elif msg == f"{current_prefix}stag":
-                is_stop_cmd = True
-        else:
-            if msg.lower().startswith("tag"):
-                is_tag_cmd = True
-                message = msg[3:].strip() or message
-            elif msg.lower() == "stag":
-                is_stop_cmd = True
-                
-        if not (is_tag_cmd or is_stop_cmd):
-            return
-
         # Handle stop tag command
-        if is_stop_cmd:
-            await stop_tag(event)
+        if cmd.name == "stag":
+            if not cmd.args:
+                await stop_tag(event)
             return
 
+        message = cmd.args or "Halo semuanya!"
+
         # Validate chat type
         if not (event.is_group or event.is_channel):
             await event.reply("<blockquote>❌ <b>Perintah ini hanya bekerja di grup/channel</b></blockquote>", parse_mode="html")
@@ -527,47 +363,50 @@ async def setup(bot, client, user_id):
             return
 
         emoji_list = ["🔥", "⚡", "✨", "💥", "🚀", "🎯", "⚔️", "🌟", "🎉", "🛡️"]
-        mentions = []
 
         try:
             # Mark this chat as active
             active_tag_sessions.add(chat_id)
             await event.reply("<blockquote>🔄 <b>Memulai proses tag...</b></blockquote>", parse_mode="html")
 
-            # Collect participants
-            async for member in client.iter_participants(
-                chat_id, 
-                filter=ChannelParticipantsSearch("")
-            ):
+            # Stream members and send mentions in chunks of 5
+            total_members = await participants.count(chat_id)
+            await event.reply(f"<blockquote>✅ <b>Akan men-tag ±{total_members} anggota. Ketik .stag untuk membatalkan.</b></blockquote>", parse_mode="html")
+
+            chunk_size = 5
+            chunk = []
+            tagged = 0
+            stopped = False
+            async for member in participants.iter(chat_id, filter=ChannelParticipantsSearch("")):
+                if chat_id not in active_tag_sessions:
+                    stopped = True
+                    break
+
                 # Skip bots and self
                 if getattr(member, 'bot', False) or getattr(member, 'is_self', False):
                     continue
 
                 mention = f"<a href='tg://user?id={member.id}'>{member.first_name or 'User'}</a>"
                 emoji = random.choice(emoji_list)
-                mentions.append(f"{emoji} {mention}")
-
-            if not mentions:
-                await event.reply("<blockquote>❌ <b>Tidak ada member yang bisa di-tag</b></blockquote>", parse_mode="html")
-                return
-
-            # Send initial message
-            total_members = len(mentions)
-            await event.reply(f"<blockquote>✅ <b>Akan men-tag {total_members} anggota. Ketik .stag untuk membatalkan.</b></blockquote>", parse_mode="html")
-
-            # Send mentions in chunks of 5
-            chunk_size = 5
-            for i in range(0, len(mentions), chunk_size):
-                if chat_id not in active_tag_sessions:
-                    await event.reply("<blockquote>🛑 <b>Proses tag dihentikan</b></blockquote>", parse_mode="html")
-                    break
-
-                chunk = mentions[i:i + chunk_size]
+                chunk.append(f"{emoji} {mention}")
+                if len(chunk) == chunk_size:
+                    text = f"<b>{message}</b>\n\n" + "\n".join(chunk)
+                    await scheduler.run('send', client.send_message, chat_id, text, parse_mode="html", link_preview=False)
+                    tagged += len(chunk)
+                    chunk = []
+
+            stopped = stopped or chat_id not in active_tag_sessions
+            if chunk and not stopped:
                 text = f"<b>{message}</b>\n\n" + "\n".join(chunk)
-                await client.send_message(chat_id, text, parse_mode="html", link_preview=False)
-                await asyncio.sleep(1.5)  # Rate limiting
+                await scheduler.run('send', client.send_message, chat_id, text, parse_mode="html", link_preview=False)
+                tagged += len(chunk)
 
-            await event.reply(f"<blockquote>✅ <b>Selesai men-tag {total_members} anggota</b></blockquote>", parse_mode="html")
+            if stopped:
+                await event.reply("<blockquote>🛑 <b>Proses tag dihentikan</b></blockquote>", parse_mode="html")
+            elif not tagged:
+                await event.reply("<blockquote>❌ <b>Tidak ada member yang bisa di-tag</b></blockquote>", parse_mode="html")
+            else:
+                await event.reply(f"<blockquote>✅ <b>Selesai men-tag {tagged} anggota</b></blockquote>", parse_mode="html")
 
         except Exception as e:
             await event.reply(f"<blockquote>❌ <b>Gagal melakukan tag:</b> <code>{str(e)[:200]}</code></blockquote>", parse_mode="html")
@@ -586,29 +425,12 @@ async def setup(bot, client, user_id):
         await event.delete()
 
     # ===== MEDIA BUFFER =====
-    @client.on(events.NewMessage())
-    async def copy_media_handler(event):
+    @router.command("b")
+    async def copy_media_handler(event, cmd):
         """Copy media to buffer"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
+        if cmd.args:
             return
 
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        if current_prefix:
-            if not msg == f"{current_prefix}b":
-                return
-        else:
-            if not msg.lower() == "b":
-                return
-
         reply = await event.get_reply_message()
         if not reply:
             status = await event.reply("<blockquote>🚫 <b>Balas ke media yang ingin disalin!</b></blockquote>", parse_mode="html")
@@ -645,30 +467,10 @@ async def setup(bot, client, user_id):
             await status.delete()
             await event.delete()
 
-    @client.on(events.NewMessage())
-    async def paste_media_handler(event):
+    @router.command("t")
+    async def paste_media_handler(event, cmd):
         """Paste media from buffer"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        if current_prefix:
-            if not msg.startswith(f"{current_prefix}t"):
-                return
-            caption = msg[len(current_prefix)+1:].strip()
-        else:
-            if not msg.lower().startswith("t"):
-                return
-            caption = msg[1:].strip()
+        caption = cmd.args
 
         if not media_buffer.buffered_media or not os.path.exists(media_buffer.buffered_media):
             status = await event.reply("<blockquote>🚫 <b>Tidak ada media yang tersedia di buffer!</b></blockquote>", parse_mode="html")
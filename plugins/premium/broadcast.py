@@ -1,13 +1,18 @@
 # plugins/premium/broadcast.py
 import os
 import json
-import asyncio
 import time
 import random
-from telethon import events, types
+from telethon import types
 from telethon.tl.types import Channel, Chat, User
 from telethon.tl.functions.messages import SendMessageRequest, ForwardMessagesRequest
 from config import OWNER_ID
+from plugins.core.broadcast import COPY, FORWARD, BroadcastJob, BroadcastPayload, broadcast_engine, split_mode
+from plugins.core.config import get_user_folder, is_premium_user
+from plugins.core.dialogs import get_dialog_index
+from plugins.core.peers import pack_peer
+from plugins.core.router import get_router
+from plugins.core.scheduler import get_scheduler
 
 # Add emoji mapping function
 def get_emoji(emoji_type):
@@ -20,37 +25,11 @@ def get_emoji(emoji_type):
         'task': '🆔',
         'user': '👤',
         'cancel': '🚫',
+        'time': '⏱',
         'error': '⚠️'
     }
     return emoji_map.get(emoji_type, '➡️')
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
-
 def get_blacklist_file(user_id=None):
     """Get blacklist file path based on user"""
     user_folder = get_user_folder(user_id)
@@ -114,194 +93,210 @@ def save_failed(data, user_id=None):
     with open(failed_file, 'w') as f:
         json.dump(data, f, indent=4)
 
+# Rounds per mode allowed in bc-bench
+BENCH_MAX_ROUNDS = 10
+
+def sent_message_ids(result):
+    """Message ids from a send result (a Message or raw Updates)"""
+    if hasattr(result, 'updates'):
+        return [
+            update.message.id for update in result.updates
+            if hasattr(getattr(update, 'message', None), 'id')
+        ]
+    return [result.id] if hasattr(result, 'id') else []
+
+async def benchmark_modes(client, message, rounds):
+    """Average seconds per target for each way of broadcasting a message.
+
+    Sends to Saved Messages and deletes the copies afterwards.
+    """
+    async def reupload(chat):
+        if message.media:
+            return await client.send_file(chat, message.media, caption=message.text or None, parse_mode='html')
+        return await client.send_message(chat, message.text, parse_mode='html')
+
+    copy = await BroadcastPayload.create(client, source=message, mode=COPY)
+    forward = await BroadcastPayload.create(client, source=message, mode=FORWARD)
+    modes = [
+        ("send_file (old)", reupload),
+        ("copy by reference", lambda chat: copy.send(client, chat)),
+        ("forward drop_author", lambda chat: forward.send(client, chat)),
+    ]
+
+    me = await client.get_input_entity('me')
+    results = []
+    sent_ids = []
+    for name, send in modes:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            sent_ids.extend(sent_message_ids(await send(me)))
+        results.append((name, (time.perf_counter() - start) / rounds))
+
+    try:
+        await client.delete_messages(me, sent_ids)
+    except Exception:
+        pass
+    return results
+
 async def setup(bot, connect_user, user_id=None):
     current_user_id = user_id  # Store user_id in a local variable
+    router = get_router(connect_user, current_user_id)
     broadcast_delay = load_delay(current_user_id)  # Load user-specific delay
+    # Sends are paced by the client's scheduler; the delay caps its send rate
+    scheduler = get_scheduler(connect_user)
+    scheduler.bucket('send').set_rate(1 / broadcast_delay)
     
-    # Store active broadcasts for cancellation
-    active_broadcasts = {}
-    failed_broadcasts = {}
+    async def finish_broadcast(job):
+        """Save failures and post the result of a finished or cancelled job"""
+        if job.failed_list:
+            failed_data = load_failed(job.owner_key)
+            failed_data[job.task_id] = {
+                'timestamp': int(time.time()),
+                'failed_list': job.failed_list,
+                'type': job.kind
+            }
+            save_failed(failed_data, job.owner_key)
 
-    async def send_broadcast(event, content, reply, is_group=False):
-        """Helper function to send broadcasts"""
+        # Get owner name
+        try:
+            owner_entity = await connect_user.get_entity(OWNER_ID)
+            owner_name = getattr(owner_entity, 'first_name', 'Owner')
+        except:
+            owner_name = "Owner"
+
+        # Final result message
+        result = f"""
+<blockquote>{get_emoji('broadcast')} <b>ᴛʏᴘᴇ: {job.kind}</b>
+{get_emoji('total')} <b>ᴛᴏᴛᴀʟ: {job.total}</b>
+{get_emoji('sukses')} <b>sᴜᴋsᴇs: {job.success}</b>
+{get_emoji('gagal')} <b>ɢᴀɢᴀʟ: {job.failed}</b>
+{get_emoji('time')} <b>ᴀᴠɢ: {job.avg_latency * 1000:.0f} ms/target ({job.mode})</b>
+{get_emoji('task')} <b>ᴛᴀsᴋ ɪᴅ:</b> <code>{job.task_id}</code>
+{get_emoji('user')} <b>ᴏᴡɴᴇʀ:</b> <a href='tg://user?id={OWNER_ID}'>{owner_name}</a>
+
+<code>.bc-error {job.task_id}</code> <b>to view the failed!</b></blockquote>
+"""
+        try:
+            await connect_user.edit_message(job.peer(job.status_msg), job.status_msg[1], result, parse_mode="html")
+        except Exception:
+            await connect_user.send_message(job.peer(job.status_msg), result, parse_mode="html")
+
+    # Jobs survive restarts: pick up this tenant's unfinished broadcasts
+    broadcast_engine.register(current_user_id, connect_user, finish_broadcast)
+    broadcast_engine.resume_saved(current_user_id)
+
+    async def send_broadcast(event, content, reply, is_group=False, mode=COPY):
+        """Snapshot the targets once and start a broadcast job"""
         if not await connect_user.is_user_authorized():
             return await event.respond("<blockquote>❗ UserBot not connected!</blockquote>", parse_mode="html")
 
-        success = 0
-        failed = 0
-        failed_list = []
         target_type = "groups" if is_group else "private chats"
         
         # Generate a unique task ID
         task_id = f"{int(time.time())}_{random.randint(1000, 9999)}"
         
-        # Get owner name
-        try:
-            owner_entity = await connect_user.get_entity(OWNER_ID)
-            owner_name = getattr(owner_entity, 'first_name', 'Owner')
-        except:
-            owner_name = "Owner"
-        
-        # Count total targets
-        total_targets = 0
-        blacklist = load_blacklist(event.sender_id if event.sender_id != OWNER_ID else None)
+        owner_key = event.sender_id if event.sender_id != OWNER_ID else None
+        blacklist = load_blacklist(owner_key)
         
-        async for dialog in connect_user.iter_dialogs():
-            if dialog.id in blacklist:
-                continue
-            if is_group and not dialog.is_group:
-                continue
-            if not is_group and (not dialog.is_user or getattr(dialog.entity, 'bot', False) or dialog.id == OWNER_ID):
-                continue
-            total_targets += 1
+        # Snapshot the targets from the dialog index
+        dialogs = await get_dialog_index(connect_user)
+        targets = [
+            [entry.id, entry.name, pack_peer(entry.entity)]
+            for entry in (dialogs.groups() if is_group else dialogs.users())
+            if entry.id not in blacklist and entry.id != OWNER_ID
+        ]
         
         # Initial status message
         status_msg = await event.respond(
-            f"<blockquote>{get_emoji('broadcast')} <b>Starting broadcast to {total_targets} {target_type}...</b></blockquote>",
+            f"<blockquote>{get_emoji('broadcast')} <b>Starting broadcast to {len(targets)} {target_type}...</b>\n"
+            f"{get_emoji('task')} <b>ᴛᴀsᴋ ɪᴅ:</b> <code>{task_id}</code></blockquote>",
             parse_mode="html"
         )
         
-        # Store the broadcast task
-        active_broadcasts[task_id] = {
-            'status_msg': status_msg,
-            'cancelled': False,
-            'type': 'gcast' if is_group else 'ucast'
-        }
-        
-        # Send broadcasts
-        async for dialog in connect_user.iter_dialogs():
-            if active_broadcasts[task_id]['cancelled']:
-                break
-                
-            if dialog.id in blacklist:
-                continue
-                
-            if is_group and not dialog.is_group:
-                continue
-            if not is_group and (not dialog.is_user or getattr(dialog.entity, 'bot', False) or dialog.id == OWNER_ID):
-                continue
-                    
-            try:
-                if reply:
-                    # Copy the message instead of forwarding to preserve formatting
-                    if reply.media:
-                        # Handle media messages
-                        await connect_user.send_file(
-                            dialog.id, 
-                            reply.media, 
-                            caption=reply.text if reply.text else None,
-                            parse_mode='html'
-                        )
-                    else:
-                        # Handle text messages
-                        await connect_user.send_message(
-                            dialog.id, 
-                            reply.text, 
-                            parse_mode='html'
-                        )
-                else:
-                    # Send text message directly
-                    await connect_user.send_message(
-                        dialog.id, 
-                        content, 
-                        parse_mode='html'
-                    )
-                
-                success += 1
-                await asyncio.sleep(broadcast_delay)
-                
-            except Exception as e:
-                failed += 1
-                failed_list.append({
-                    'id': dialog.id,
-                    'name': getattr(dialog.entity, 'title', getattr(dialog.entity, 'first_name', 'Unknown')),
-                    'error': str(e)
-                })
-                # Add a small delay even on failure to avoid rate limiting
-                await asyncio.sleep(0.5)
-                continue
-        
-        # Remove from active broadcasts
-        if task_id in active_broadcasts:
-            del active_broadcasts[task_id]
-        
-        # Save failed broadcasts for later viewing
-        if failed_list:
-            failed_data = load_failed(event.sender_id if event.sender_id != OWNER_ID else None)
-            failed_data[task_id] = {
-                'timestamp': int(time.time()),
-                'failed_list': failed_list,
-                'type': 'gcast' if is_group else 'ucast'
-            }
-            save_failed(failed_data, event.sender_id if event.sender_id != OWNER_ID else None)
-        
-        # Final result message
-        result = f"""
-<blockquote>{get_emoji('broadcast')} <b>ᴛʏᴘᴇ: {'gcast' if is_group else 'ucast'}</b>
-{get_emoji('total')} <b>ᴛᴏᴛᴀʟ: {total_targets}</b>
-{get_emoji('sukses')} <b>sᴜᴋsᴇs: {success}</b>
-{get_emoji('gagal')} <b>ɢᴀɢᴀʟ: {failed}</b>
-{get_emoji('task')} <b>ᴛᴀsᴋ ɪᴅ:</b> <code>{task_id}</code>
-{get_emoji('user')} <b>ᴏᴡɴᴇʀ:</b> <a href='tg://user?id={OWNER_ID}'>{owner_name}</a>
-
-<code>.bc-error {task_id}</code> <b>to view the failed!</b></blockquote>
-"""
-        await status_msg.edit(result, parse_mode="html")
+        broadcast_engine.start(BroadcastJob(
+            task_id,
+            current_user_id,
+            'gcast' if is_group else 'ucast',
+            targets,
+            content=None if reply else content,
+            source=[reply.chat_id, reply.id, pack_peer(await reply.get_input_chat())] if reply else None,
+            status_msg=[status_msg.chat_id, status_msg.id, pack_peer(await status_msg.get_input_chat())],
+            owner_key=owner_key,
+            mode=mode,
+        ))
 
-    @connect_user.on(events.NewMessage())
-    async def broadcast_handler(event):
+    @router.command("gcast", "ucast", "bc-bench", "bc-cancel", "bc-pause", "bc-resume", "bc-jobs", "bc-error", "setdelay", "addbl", "delbl", "listbl", "bchelp")
+    async def broadcast_handler(event, command):
         """Handle broadcast commands"""
-        # Check if user is owner or premium with active session
         sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id)
-        )
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        message = (event.raw_text or '').strip()
-        
-        # Check for broadcast commands
-        if not message.startswith(current_prefix):
-            return
-
-        cmd = message[len(current_prefix):].strip().lower()
+        current_prefix = command.prefix
+        cmd = f"{command.name} {command.args}".strip().lower()
         
-        # GCAST command
-        if cmd.startswith("gcast"):
+        # GCAST / UCAST commands
+        if cmd.startswith(("gcast", "ucast")):
             reply = await event.get_reply_message()
-            content = message[len(current_prefix)+5:].strip()
+            mode, content = split_mode(command.args)
             
             if not content and not reply:
                 return await event.respond("<blockquote>❌ Reply to a message or include text</blockquote>", parse_mode="html")
+            if mode == FORWARD and not reply:
+                return await event.respond("<blockquote>❌ -fwd needs a replied message</blockquote>", parse_mode="html")
             
-            await send_broadcast(event, content, reply, is_group=True)
+            await send_broadcast(event, content, reply, is_group=cmd.startswith("gcast"), mode=mode)
         
-        # UCAST command
-        elif cmd.startswith("ucast"):
+        # BC-BENCH command
+        elif cmd.startswith("bc-bench"):
             reply = await event.get_reply_message()
-            content = message[len(current_prefix)+5:].strip()
-            
-            if not content and not reply:
-                return await event.respond("<blockquote>❌ Reply to a message or include text</blockquote>", parse_mode="html")
+            if not reply:
+                return await event.respond("<blockquote>❌ Reply to a message to benchmark</blockquote>", parse_mode="html")
+            try:
+                rounds = min(max(int(command.args or 3), 1), BENCH_MAX_ROUNDS)
+            except ValueError:
+                rounds = 3
             
-            await send_broadcast(event, content, reply, is_group=False)
+            status_msg = await event.respond("<blockquote>⏱ Benchmarking broadcast modes...</blockquote>", parse_mode="html")
+            results = await benchmark_modes(connect_user, reply, rounds)
+            message = f"<blockquote>⏱ <b>Per-target latency ({rounds}x to Saved Messages)</b>\n"
+            for name, latency in results:
+                message += f"• {name}: <b>{latency * 1000:.0f} ms</b>\n"
+            message += "</blockquote>"
+            await status_msg.edit(message, parse_mode="html")
         
-        # BCAST CANCEL command
-        elif cmd.startswith("bc-cancel"):
+        # BC-CANCEL / BC-PAUSE / BC-RESUME commands
+        elif cmd.startswith(("bc-cancel", "bc-pause", "bc-resume")):
             parts = cmd.split()
+            action = parts[0]
             if len(parts) > 1:
                 task_id = parts[1]
-                if task_id in active_broadcasts:
-                    active_broadcasts[task_id]['cancelled'] = True
-                    await event.respond(f"<blockquote>{get_emoji('cancel')} <b>Broadcast task {task_id} cancelled!</b></blockquote>", parse_mode="html")
+                owner = None if sender_id == OWNER_ID else current_user_id
+                if action == "bc-cancel":
+                    done = broadcast_engine.cancel(task_id, owner)
+                    text = f"{get_emoji('cancel')} <b>Broadcast task {task_id} cancelled!</b>"
+                elif action == "bc-pause":
+                    done = broadcast_engine.pause(task_id, owner)
+                    text = f"⏸ <b>Broadcast task {task_id} paused!</b>"
                 else:
-                    await event.respond("<blockquote>❌ Task ID not found or already completed</blockquote>", parse_mode="html")
+                    done = broadcast_engine.resume(task_id, owner)
+                    text = f"▶️ <b>Broadcast task {task_id} resumed!</b>"
+                if done:
+                    await event.respond(f"<blockquote>{text}</blockquote>", parse_mode="html")
+                else:
+                    await event.respond("<blockquote>❌ Task ID not found or not in a state for this action</blockquote>", parse_mode="html")
             else:
-                await event.respond("<blockquote>❌ Please specify task ID: bc-cancel [task_id]</blockquote>", parse_mode="html")
+                await event.respond(f"<blockquote>❌ Please specify task ID: {action} [task_id]</blockquote>", parse_mode="html")
+        
+        # BC-JOBS command
+        elif cmd.startswith("bc-jobs"):
+            jobs = broadcast_engine.user_jobs(current_user_id)
+            if not jobs:
+                return await event.respond("<blockquote>📭 No active broadcast jobs</blockquote>", parse_mode="html")
+            message = f"<blockquote>{get_emoji('broadcast')} <b>Broadcast jobs</b></blockquote>\n"
+            for job in jobs:
+                message += (
+                    f"<blockquote><code>{job.task_id}</code> • {job.kind} • {job.status}\n"
+                    f"{job.position}/{job.total} • ✅ {job.success} • ❌ {job.failed}</blockquote>\n"
+                )
+            await event.respond(message, parse_mode="html")
         
         # BC-ERROR command
         elif cmd.startswith("bc-error"):
@@ -335,6 +330,7 @@ async def setup(bot, connect_user, user_id=None):
                     new_delay = 1
                 nonlocal broadcast_delay
                 broadcast_delay = new_delay
+                scheduler.bucket('send').set_rate(1 / broadcast_delay)
                 save_delay(broadcast_delay, current_user_id)  # Save delay for current user
                 await event.respond(
                     f"<blockquote>⏱ Broadcast delay set to: {broadcast_delay} seconds</blockquote>",
@@ -451,13 +447,18 @@ async def setup(bot, connect_user, user_id=None):
                 "<blockquote>📢 Broadcast Guide</blockquote>\n\n"
                 "<blockquote>• Broadcast Commands:</blockquote>\n"
                 f"{current_prefix}gcast [message/reply] - Broadcast to all groups\n"
-                f"{current_prefix}ucast [message/reply] - Broadcast to all private chats\n\n"
+                f"{current_prefix}ucast [message/reply] - Broadcast to all private chats\n"
+                f"{current_prefix}gcast -fwd [reply] - Forward without the author header (no re-send)\n"
+                f"{current_prefix}bc-bench [rounds] [reply] - Compare per-target latency of each mode\n\n"
                 "<blockquote>• Settings:</blockquote>\n"
                 f"{current_prefix}setdelay [seconds] - Set broadcast delay\n"
                 f"{current_prefix}addbl - Add chat/group to blacklist\n"
                 f"{current_prefix}delbl - Remove chat/group from blacklist\n"
                 f"{current_prefix}listbl [user_id] - View blacklist (owner can specify user)\n\n"
                 "<blockquote>• Task Management:</blockquote>\n"
+                f"{current_prefix}bc-jobs - List running and paused broadcasts\n"
+                f"{current_prefix}bc-pause [task_id] - Pause a running broadcast\n"
+                f"{current_prefix}bc-resume [task_id] - Resume a paused broadcast\n"
                 f"{current_prefix}bc-cancel [task_id] - Cancel a running broadcast\n"
                 f"{current_prefix}bc-error [task_id] - View failed broadcasts for a task"
             )
@@ -1,36 +1,5 @@
-import os
-import json
-import aiohttp
-from telethon import events
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.http import http_client
+from plugins.core.router import get_router
 
 async def safe_delete(message):
     """Safely delete a message with error handling"""
@@ -48,11 +17,10 @@ async def get_weather_data(location):
         url = f"https://api.openweathermap.org/data/2.5/weather?q={location}&units=metric&appid={WEATHER_API_KEY}&lang=id"
         headers = {'User-Agent': 'Mozilla/5.0'}
         
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
+        response = await http_client.get(url, headers=headers, timeout=10)
+        if response.status == 200:
+            return response.json()
+        return None
     except Exception as e:
         print(f"[WEATHER] Error fetching data: {str(e)}")
         return None
@@ -97,44 +65,14 @@ def format_weather_response(weather_data, location):
 async def setup(bot, client, user_id):
     """Setup weather commands for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def weather_handler(event):
+    @router.command("cuaca", "weather")
+    async def weather_handler(event, cmd):
         """Handle weather command requests"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
+        current_prefix = cmd.prefix
+        location = cmd.args
 
-        msg = (event.text or '').strip()
-        current_prefix = get_prefix(current_user_id)
-        
-        # Check command format
-        is_weather_cmd = False
-        location = ""
-        
-        if current_prefix:
-            # Prefix mode
-            if msg.startswith(current_prefix):
-                cmd_part = msg[len(current_prefix):].strip().lower()
-                if cmd_part.startswith(("cuaca", "weather")):
-                    is_weather_cmd = True
-                    parts = cmd_part.split(maxsplit=1)
-                    location = parts[1] if len(parts) > 1 else ""
-        else:
-            # No prefix mode
-            if msg.lower().startswith(("cuaca", "weather")):
-                is_weather_cmd = True
-                parts = msg.split(maxsplit=1)
-                location = parts[1] if len(parts) > 1 else ""
-        
-        if not is_weather_cmd:
-            return
-            
         if not location:
             status = await event.reply(
                 "<blockquote>🌍 <b>Mohon sertakan nama lokasi</b>\n"
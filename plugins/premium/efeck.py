@@ -1,39 +1,9 @@
 # plugins/effect.py
-import os
-import json
-import subprocess
-from telethon import events
-from config import OWNER_ID
+from plugins.core.effects import effect_pipeline
+from plugins.core.ffmpeg import FFmpegError
+from plugins.core.router import get_router
 import asyncio
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
-
 # Daftar efek yang diperbarui (efek duplikat/serupa telah dihapus)
 effect_list = [
     'bass', 'echo', 'nightcore', 'slow', 'fast', 'robot', 'reverse',
@@ -64,25 +34,15 @@ effect_filters = {
     'underwater': 'lowpass=f=300',
 }
 
-async def apply_effect(input_file, effect):
-    output_file = f"cache/effect_{os.path.basename(input_file)}"
-    filter_str = effect_filters.get(effect)
-
-    if not filter_str:
+async def apply_effect(client, message, effects):
+    """Apply one or more effects (chained in one pass) to an audio message"""
+    filters = [effect_filters[effect] for effect in effects if effect in effect_filters]
+    if not filters:
         return None
 
-    cmd = [
-        'ffmpeg',
-        '-i', input_file,
-        '-af', filter_str,
-        '-y',
-        output_file
-    ]
-
     try:
-        subprocess.run(cmd, check=True, stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
-        return output_file
-    except subprocess.CalledProcessError:
+        return await effect_pipeline.render(client, message, filters)
+    except FFmpegError:
         return None
 
 async def safe_delete(message):
@@ -95,55 +55,36 @@ async def safe_delete(message):
 async def setup(bot, client, user_id):
     """Setup effect commands for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
+    effect_commands = [f"efek{i}" for i in range(1, len(effect_list) + 1)]
 
-    @client.on(events.NewMessage())
-    async def effect_handler(event):
+    @router.command("listefek", "efek", *effect_commands)
+    async def effect_handler(event, cmd):
         """Handle effect commands"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
+        current_prefix = cmd.prefix
+        is_listefek_cmd = cmd.name == "listefek"
+        is_efek_cmd = cmd.name == "efek"
+        effect_num = cmd.name[4:] if cmd.name in effect_commands else None
+
 
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        is_listefek_cmd = False
-        is_efek_cmd = False
-        effect_num = None
-        
-        if current_prefix:
-            if msg == f"{current_prefix}listefek":
-                is_listefek_cmd = True
-            elif msg == f"{current_prefix}efek":
-                is_efek_cmd = True
-            elif msg.startswith(f"{current_prefix}efek"):
-                effect_num = msg[len(current_prefix)+4:].strip()
-        else:
-            if msg.lower() == "listefek":
-                is_listefek_cmd = True
-            elif msg.lower() == "efek":
-                is_efek_cmd = True
-            elif msg.lower().startswith("efek"):
-                effect_num = msg[4:].strip()
-                
         # LISTEFEK command
         if is_listefek_cmd:
+            if cmd.args:
+                return
             teks = "<blockquote>📄 Daftar Efek:</blockquote>\n"
             for i, name in enumerate(effect_list, start=1):
                 if current_prefix:
                     teks += f"<blockquote>{i}. <code>{current_prefix}efek{i}</code> → {name}</blockquote>\n"
                 else:
                     teks += f"<blockquote>{i}. <code>efek{i}</code> → {name}</blockquote>\n"
+            teks += f"<blockquote>🔗 Gabung efek: <code>{current_prefix}efek1 5 8</code></blockquote>\n"
             await event.reply(teks, parse_mode="html")
             return
 
         # EFEK command (without number)
         if is_efek_cmd:
+            if cmd.args:
+                return
             if current_prefix:
                 msg_text = await event.reply("<blockquote>❌ Cara pakeknya balas pesan suara/audio dengan perintah <code>{current_prefix}efek1,2,3</code>, dst!!</blockquote>", parse_mode="html")
             else:
@@ -154,11 +95,13 @@ async def setup(bot, client, user_id):
 
         # EFEK command with number
         if effect_num is not None:
-            if not effect_num.isdigit():
+            # Extra numbers after the command chain more effects: efek1 5 8
+            numbers = [effect_num] + cmd.args.split()
+            if not all(num.isdigit() for num in numbers):
                 return
 
-            index = int(effect_num) - 1
-            if index < 0 or index >= len(effect_list):
+            indexes = [int(num) - 1 for num in numbers]
+            if any(index < 0 or index >= len(effect_list) for index in indexes):
                 if current_prefix:
                     msg_text = await event.reply(f"<blockquote>❌ Tidak ada efek nomor segitu! Gunakan <code>{current_prefix}listefek</code> untuk melihat daftar efek!!</blockquote>", parse_mode="html")
                 else:
@@ -167,7 +110,7 @@ async def setup(bot, client, user_id):
                 await safe_delete(msg_text)
                 return
 
-            effect = effect_list[index]
+            effects = [effect_list[index] for index in indexes]
 
             if not event.is_reply:
                 msg_text = await event.reply("<blockquote>❌ Balas voice atau audio yg mau diberi efek!!</blockquote>", parse_mode="html")
@@ -184,8 +127,7 @@ async def setup(bot, client, user_id):
 
             try:
                 proses = await event.reply("<blockquote>🔄 Memproses efek...</blockquote>", parse_mode="html")
-                input_file = await reply_msg.download_media('cache/')
-                output_file = await apply_effect(input_file, effect)
+                output_file = await apply_effect(client, reply_msg, effects)
 
                 if not output_file:
                     await proses.edit("<blockquote>❌ Gagal memproses efek.</blockquote>", parse_mode="html")
@@ -200,14 +142,7 @@ async def setup(bot, client, user_id):
                     reply_to=event.reply_to_msg_id
                 )
                 await safe_delete(proses)
-                
-                # Cleanup
-                try:
-                    os.remove(input_file)
-                    os.remove(output_file)
-                except:
-                    pass
-                    
+
             except Exception as e:
                 msg_text = await event.reply(f"<blockquote>❌ Error: {str(e)[:200]}</blockquote>", parse_mode="html")
                 await asyncio.sleep(5)
@@ -1,9 +1,6 @@
 # plugins/fakeaction.py
 import re
 import asyncio
-import json
-import os
-from telethon import events
 from telethon.tl.functions.messages import SetTypingRequest
 from telethon.tl.types import (
     SendMessageUploadVideoAction,
@@ -11,63 +8,19 @@ from telethon.tl.types import (
     SendMessageUploadPhotoAction,
     SendMessageUploadDocumentAction
 )
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.router import get_router
 
 async def setup(bot, client, user_id):
     """Setup fake action commands for premium users"""
     current_user_id = user_id
     active_actions = {}
 
-    @client.on(events.NewMessage())
-    async def fake_action_handler(event):
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
+    router = get_router(client, current_user_id)
 
-        # Get current prefix and message
-        current_prefix = get_prefix(current_user_id)
-        message = (event.text or '').strip()
-        
-        # Check if message matches the fake action pattern
-        pattern = (
-            r'^fake\s+(\d+)?\s?(video|audio|photo|file|cancel)$' if not current_prefix else
-            rf'^{re.escape(current_prefix)}fake\s+(\d+)?\s?(video|audio|photo|file|cancel)$'
-        )
-        
-        match = re.match(pattern, message, re.IGNORECASE)
+    @router.command("fake")
+    async def fake_action_handler(event, cmd):
+        # Check if the arguments match the fake action pattern
+        match = re.match(r'^(\d+)?\s?(video|audio|photo|file|cancel)$', cmd.args, re.IGNORECASE)
         if not match:
             return
 
@@ -1,129 +1,99 @@
 # plugins/premium/globalban.py
-import os
-import json
 import random
-import asyncio
-from telethon import events
-from telethon.tl.types import ChannelParticipantsAdmins, Channel, Chat
+import time
 from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.admins import get_admin_index
+from plugins.core.gban import BAN, UNBAN, GbanRun, gban_executor
+from plugins.core.peers import pack_peer
+from plugins.core.router import get_router
 
 async def get_admin_groups_fast(client, user_id):
-    """Get all groups where the user is admin (fast version)"""
-    admin_groups = []
-    async for dialog in client.iter_dialogs(limit=100):  # Batasi jumlah dialog
-        if dialog.is_group or (dialog.is_channel and not getattr(dialog.entity, 'broadcast', False)):
-            try:
-                # Cek cepat apakah user adalah creator (pemilik) grup
-                if hasattr(dialog.entity, 'creator') and dialog.entity.creator:
-                    if dialog.entity.creator and getattr(dialog.entity, 'id', None) == user_id:
-                        admin_groups.append({
-                            'id': dialog.id,
-                            'title': dialog.name,
-                        })
-                        continue
-                
-                # Untuk grup non-broadcast, cek admin status dengan cara lebih cepat
-                if not getattr(dialog.entity, 'broadcast', False):
-                    # Coba akses admin rights langsung dari dialog jika tersedia
-                    if hasattr(dialog, 'participant') and hasattr(dialog.participant, 'admin_rights'):
-                        if dialog.participant.admin_rights:
-                            admin_groups.append({
-                                'id': dialog.id,
-                                'title': dialog.name,
-                            })
-                            continue
-                    
-                    # Fallback: cek admin dengan metode yang lebih ringan
-                    try:
-                        # Coba dapatkan info chat yang lebih ringan
-                        chat = await client.get_entity(dialog.id)
-                        if hasattr(chat, 'admin_rights') and chat.admin_rights:
-                            admin_groups.append({
-                                'id': dialog.id,
-                                'title': dialog.name,
-                            })
-                    except:
-                        continue
-            except Exception as e:
-                # Skip dialog yang error
-                continue
-    
-    return admin_groups
+    """Get all groups where the user can ban, from the admin index"""
+    chats = await get_admin_index(client, user_id).my_admin_chats('ban_users')
+    return [{'id': chat_id, 'title': info['title'], 'peer': info.get('peer')} for chat_id, info in chats.items()]
 
 async def setup(bot, client, user_id):
     """Setup global ban commands for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
+
+    async def finish_gban(run):
+        """Post the result of a finished gban/ungban run"""
+        title = "GLOBAL BAN BERHASIL" if run.action == BAN else "GLOBAL UNBAN BERHASIL"
+        result_msg = (
+            f"<blockquote>✅ <b>{title}</b></blockquote>\n\n"
+            f"<blockquote>👤 <b>Target:</b> {run.target_name}</blockquote>\n"
+            f"<blockquote>🆔 <b>User ID:</b> <code>{run.target}</code></blockquote>\n\n"
+            f"<blockquote>📊 <b>Hasil:</b></blockquote>\n"
+            f"<blockquote>✅ <b>Sukses:</b> {run.success} grup</blockquote>\n"
+            f"<blockquote>❌ <b>Gagal:</b> {run.failed} grup</blockquote>\n"
+            f"<blockquote>⏱ <b>Durasi:</b> {run.duration:.1f} detik</blockquote>\n\n"
+            f"<blockquote><code>.gban-status {run.run_id}</code> untuk detail per grup"
+        )
+        if run.action == BAN:
+            result_msg += f"\n<code>.ungban -r {run.run_id}</code> untuk membatalkan"
+        result_msg += "</blockquote>"
+        try:
+            await client.edit_message(run.peer(run.status_msg), run.status_msg[1], result_msg, parse_mode="html")
+        except Exception:
+            await client.send_message(run.peer(run.status_msg), result_msg, parse_mode="html")
+
+    # Runs survive restarts: finish this tenant's interrupted gbans
+    gban_executor.register(current_user_id, client, finish_gban)
+    gban_executor.resume_saved(current_user_id)
+
+    async def start_run(event, action, target, target_name, groups, rollback_of=None, target_peer=None):
+        verb = "Global Ban" if action == BAN else "Global Unban"
+        processing_msg = await event.reply(
+            f"<blockquote>⚡ Memulai {verb} pada {len(groups)} grup...</blockquote>",
+            parse_mode="html"
+        )
+        run = GbanRun(
+            f"{int(time.time())}_{random.randint(1000, 9999)}",
+            current_user_id,
+            action,
+            target,
+            target_name,
+            [[group['id'], group['title'], group.get('peer')] for group in groups],
+            status_msg=[processing_msg.chat_id, processing_msg.id, pack_peer(await processing_msg.get_input_chat())],
+            rollback_of=rollback_of,
+            target_peer=target_peer,
+        )
+        gban_executor.start(run)
 
-    @client.on(events.NewMessage())
-    async def globalban_handler(event):
+    @router.command("gban", "gben", "ungban")
+    async def globalban_handler(event, cmd):
         """Handle global ban commands"""
-        # Check authorization
         sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
+        is_gban_cmd = cmd.name == "gban"
 
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        is_gban_cmd = False
-        is_gben_cmd = False
-        
-        if current_prefix == "no":
-            if msg.lower().startswith("gban"):
-                is_gban_cmd = True
-            elif msg.lower().startswith("gben"):
-                is_gben_cmd = True
-        else:
-            if msg.lower().startswith(f"{current_prefix}gban"):
-                is_gban_cmd = True
-            elif msg.lower().startswith(f"{current_prefix}gben"):
-                is_gben_cmd = True
-                
-        if not (is_gban_cmd or is_gben_cmd):
+        # Rollback of an earlier gban: ungban -r <run_id>
+        if cmd.name == "ungban" and cmd.args.startswith("-r"):
+            run_id = cmd.args[2:].strip()
+            run = gban_executor.load(current_user_id, run_id) if run_id else None
+            if run is None or run.action != BAN:
+                await event.reply("<blockquote>❌ Run gban tidak ditemukan</blockquote>", parse_mode="html")
+                return
+            groups = [
+                {'id': group[0], 'title': group[1], 'peer': group[2] if len(group) > 2 else None}
+                for group in run.banned_groups()
+            ]
+            if not groups:
+                await event.reply("<blockquote>❌ Tidak ada grup yang perlu di-unban</blockquote>", parse_mode="html")
+                return
+            await start_run(event, UNBAN, run.target, run.target_name, groups,
+                            rollback_of=run.run_id, target_peer=run.target_peer)
             return
 
         # Extract target user
         target = None
+        target_entity = None
         target_name = "Unknown User"
         target_username = "No Username"
         
-        if is_gban_cmd:
-            target_text = msg[len(current_prefix)+4:].strip() if current_prefix != "no" else msg[4:].strip()
-        else:
-            target_text = msg[len(current_prefix)+4:].strip() if current_prefix != "no" else msg[4:].strip()
-            
+        target_text = cmd.args
+
+
         if not target_text and event.is_reply:
             reply = await event.get_reply_message()
             target = reply.sender_id
@@ -173,60 +143,22 @@ async def setup(bot, client, user_id):
             return
 
         # Process based on command type
-        if is_gban_cmd:
-            # Real GBAN - show processing message
-            processing_msg = await event.reply(
-                "<blockquote>🔍 Mencari grup dimana Anda adalah admin...</blockquote>",
-                parse_mode="html"
-            )
-            
-            try:
-                # Get admin groups dengan timeout
-                admin_groups = await asyncio.wait_for(
-                    get_admin_groups_fast(client, sender_id), 
-                    timeout=30  # Timeout 30 detik
-                )
-            except asyncio.TimeoutError:
-                await processing_msg.edit("<blockquote>❌ Timeout: Pencarian grup terlalu lama</blockquote>", parse_mode="html")
-                return
+        if is_gban_cmd or cmd.name == "ungban":
+            # Plan from the admin index (instant once cached)
+            admin_groups = await get_admin_groups_fast(client, current_user_id)
             
             if not admin_groups:
-                await processing_msg.edit("<blockquote>❌ Anda bukan admin di grup manapun</blockquote>", parse_mode="html")
+                await event.reply("<blockquote>❌ Anda bukan admin di grup manapun</blockquote>", parse_mode="html")
                 return
 
-            # Process real ban
-            await processing_msg.edit(
-                f"<blockquote>⚡ Memulai Global Ban pada {len(admin_groups)} grup...</blockquote>",
-                parse_mode="html"
+            await start_run(
+                event,
+                BAN if is_gban_cmd else UNBAN,
+                target,
+                f"{target_name} ({target_username})",
+                admin_groups,
+                target_peer=pack_peer(target_entity) if target_entity is not None else None
             )
-            
-            success = 0
-            failed = 0
-            
-            for group in admin_groups:
-                try:
-                    await client.edit_permissions(
-                        group['id'],
-                        target,
-                        view_messages=False
-                    )
-                    success += 1
-                    await asyncio.sleep(0.5)  # Delay untuk menghindari flood
-                except Exception as e:
-                    failed += 1
-                    # Skip error details untuk mempercepat
-            
-            # Send result
-            result_msg = (
-                f"<blockquote>✅ <b>GLOBAL BAN BERHASIL</b></blockquote>\n\n"
-                f"<blockquote>👤 <b>Target:</b> {target_name} ({target_username})</blockquote>\n"
-                f"<blockquote>🆔 <b>User ID:</b> <code>{target}</code></blockquote>\n\n"
-                f"<blockquote>📊 <b>Hasil:</b></blockquote>\n"
-                f"<blockquote>✅ <b>Sukses:</b> {success} grup</blockquote>\n"
-                f"<blockquote>❌ <b>Gagal:</b> {failed} grup</blockquote>"
-            )
-            
-            await processing_msg.edit(result_msg, parse_mode="html")
         
         else:
             # Fake GBEN - langsung kirim hasil fake tanpa proses
@@ -240,4 +172,47 @@ async def setup(bot, client, user_id):
                 f"<blockquote><b>Gagal:</b> {failed} grup</blockquote>\n\n"
             )
             
-            await event.reply(result_msg, parse_mode="html")
\ No newline at end of file
+            await event.reply(result_msg, parse_mode="html")
+
+    @router.command("gban-status", "gban-list")
+    async def gban_status_handler(event, cmd):
+        """Show the per-group outcome of gban runs"""
+        if cmd.name == "gban-list":
+            runs = gban_executor.history(current_user_id)[:10]
+            if not runs:
+                await event.reply("<blockquote>📭 Belum ada riwayat gban</blockquote>", parse_mode="html")
+                return
+            message = "<blockquote>📋 <b>Riwayat Gban</b></blockquote>\n"
+            for run in runs:
+                message += (
+                    f"<blockquote><code>{run.run_id}</code> • {run.action} • {run.status}\n"
+                    f"{run.target_name} • ✅ {run.success} • ❌ {run.failed} • ⏳ {len(run.pending)}</blockquote>\n"
+                )
+            await event.reply(message, parse_mode="html")
+            return
+
+        run = gban_executor.load(current_user_id, cmd.args) if cmd.args else None
+        if run is None:
+            await event.reply("<blockquote>❌ Run gban tidak ditemukan</blockquote>", parse_mode="html")
+            return
+
+        lines = []
+        for group in run.groups:
+            chat_id, title = group[0], group[1]
+            result = run.results.get(str(chat_id))
+            if result is None:
+                lines.append(f"⏳ {title}")
+            elif result['ok']:
+                lines.append(f"✅ {title}")
+            else:
+                lines.append(f"❌ {title}: <code>{result['error'][:60]}</code>")
+
+        message = (
+            f"<blockquote>📊 <b>Gban {run.run_id}</b> ({run.action}, {run.status})\n"
+            f"👤 {run.target_name} (<code>{run.target}</code>)</blockquote>\n"
+            f"<blockquote>" + "\n".join(lines[:40])
+        )
+        if len(lines) > 40:
+            message += f"\n... dan {len(lines) - 40} grup lainnya"
+        message += "</blockquote>"
+        await event.reply(message, parse_mode="html")
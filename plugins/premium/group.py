@@ -1,9 +1,7 @@
 # plugins/premium/group.py
-import os
 import asyncio
-import json
 import re
-from telethon import events, functions, types
+from telethon import functions, types
 from telethon.errors import (
     ChatAdminRequiredError,
     UserNotParticipantError,
@@ -12,83 +10,38 @@ from telethon.errors import (
     ChannelPrivateError,
     FloodWaitError
 )
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.dialogs import get_dialog_index
+from plugins.core.router import get_router
 
 async def setup(bot, connect_user, user_id=None):
     current_user_id = user_id  # Store user_id in a local variable
+    router = get_router(connect_user, current_user_id)
 
-    @connect_user.on(events.NewMessage())
-    async def group_manager_handler(event):
+    @router.command("join", "leave", "leavemute", "papay", "grouphelp")
+    async def group_manager_handler(event, command):
         """Handle group management commands"""
-        # Check if user is owner or premium with active session
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id)
-        )
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        message = (event.raw_text or '').strip()
-        
-        # Check for group commands
-        if not message.startswith(current_prefix):
-            return
-
-        cmd = message[len(current_prefix):].strip().lower()
+        cmd = command.name
         
         try:
             # JOIN command
-            if cmd.startswith("join"):
-                query = message[len(current_prefix)+4:].strip()
-                await handle_join(event, query)
+            if cmd == "join":
+                await handle_join(event, command.args)
             
             # LEAVE command
-            elif cmd.startswith("leave"):
-                target = message[len(current_prefix)+5:].strip()
-                await handle_leave(event, target)
+            elif cmd == "leave":
+                await handle_leave(event, command.args)
             
             # LEAVEMUTE command
-            elif cmd == "leavemute":
+            elif cmd == "leavemute" and not command.args:
                 await handle_leavemute(event)
             
             # PAPAY command
-            elif cmd.startswith("papay"):
-                target = message[len(current_prefix)+5:].strip() or None
-                await handle_papay(event, target)
+            elif cmd == "papay":
+                await handle_papay(event, command.args or None)
             
             # GROUPHELP command
-            elif cmd == "grouphelp":
-                await handle_grouphelp(event, current_prefix)
+            elif cmd == "grouphelp" and not command.args:
+                await handle_grouphelp(event, command.prefix)
                 
         except FloodWaitError as e:
             await event.reply(f"<blockquote>❌ <b>Tunggu {e.seconds} detik sebelum mencoba lagi</b></blockquote>", parse_mode="html")
@@ -208,21 +161,9 @@ async def setup(bot, connect_user, user_id=None):
         try:
             processing_msg = await event.reply("<blockquote>🔄 <b>Mencari grup yang memute anda...</b></blockquote>", parse_mode="html")
             
-            # Dapatkan semua dialog
-            dialogs = await event.client.get_dialogs()
-            muted_groups = []
-            
-            for dialog in dialogs:
-                # Hanya proses grup dan channel (bukan chat private)
-                if dialog.is_group or dialog.is_channel:
-                    try:
-                        # Cek apakah user dimute di grup ini
-                        participant = await event.client.get_permissions(dialog.entity, event.sender_id)
-                        if participant and not participant.send_messages:
-                            muted_groups.append(dialog.entity)
-                    except Exception as e:
-                        # Skip jika tidak bisa mendapatkan permissions
-                        continue
+            # Grup yang memute akun ini, dari indeks dialog
+            dialogs = await get_dialog_index(event.client)
+            muted_groups = [entry.entity for entry in dialogs.muted_groups()]
             
             if not muted_groups:
                 await processing_msg.edit("<blockquote>✅ <b>Tidak ada grup yang memute anda</b></blockquote>", parse_mode="html")
@@ -1,63 +1,20 @@
 # plugins/premium/help.py
-import os
-import json
 import logging
 from telethon import events, Button
-from config import BOT_USERNAME, OWNER_ID
+from config import BOT_USERNAME
+from plugins.core.router import get_router
 from ..help import FEATURES, FEATURES_LIST, ITEMS_PER_PAGE, TOTAL_PAGES, create_help_caption, get_page_markup
 
 logger = logging.getLogger(__name__)
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
-
 async def setup(bot, client, user_id):
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def help_handler(event):
+    @router.command("help")
+    async def help_handler(event, cmd):
         """Handle help command with prefix"""
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        message = (event.raw_text or '').strip()
-        
-        if not message.startswith(current_prefix):
-            return
-
-        cmd = message[len(current_prefix):].strip().lower()
-        
-        if cmd == "help":
+        if not cmd.args:
             try:
                 await event.delete()
                 result = await client.inline_query(BOT_USERNAME, "help")
@@ -1,35 +1,8 @@
 # plugins/premium/cek_id.py
-import json
-import os
-from telethon import events, errors
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from telethon import errors
+from plugins.core.config import is_premium_user
+from plugins.core.participants import get_participant_service
+from plugins.core.router import get_router
 
 def get_actual_chat_id(chat_id):
     """Convert chat ID to actual format (with -100 for groups/channels)"""
@@ -53,37 +26,12 @@ def get_actual_chat_id(chat_id):
 async def setup(bot, client, user_id):
     """Setup cek ID command for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def cek_id_handler(event):
+    @router.command("id")
+    async def cek_id_handler(event, cmd):
         """Handle cek ID command"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        is_cek_id_cmd = False
-        target_arg = ""
-        
-        if current_prefix:
-            if msg.startswith(f"{current_prefix}id"):
-                is_cek_id_cmd = True
-                target_arg = msg[len(current_prefix)+2:].strip()
-        else:
-            if msg.lower().startswith("id"):
-                is_cek_id_cmd = True
-                target_arg = msg[2:].strip()
-                
-        if not is_cek_id_cmd:
-            return
+        target_arg = cmd.args
 
         try:
             # Get target user
@@ -143,12 +91,11 @@ async def setup(bot, client, user_id):
                     
                     # Get participant count for groups
                     participants_count = "Tidak diketahui"
-                    if hasattr(chat, 'participants_count'):
+                    if getattr(chat, 'participants_count', None):
                         participants_count = chat.participants_count
-                    elif not getattr(chat, 'broadcast', False):
+                    else:
                         try:
-                            participants = await client.get_participants(chat)
-                            participants_count = len(participants)
+                            participants_count = await get_participant_service(client).count(chat)
                         except:
                             pass
                     
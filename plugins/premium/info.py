@@ -1,7 +1,5 @@
-import os
-import json
 from datetime import datetime
-from telethon import events, functions
+from telethon import functions
 from telethon.tl.functions.users import GetFullUserRequest
 from telethon.tl.functions.channels import GetParticipantRequest
 from telethon.tl.types import (
@@ -10,69 +8,17 @@ from telethon.tl.types import (
     ChannelParticipantCreator, ChannelParticipantAdmin,
     ChannelParticipantBanned
 )
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-    
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.router import get_router
 
 async def setup(bot, connect_user, user_id=None):
     """Setup info command for premium users"""
+    router = get_router(connect_user, user_id)
     
-    @connect_user.on(events.NewMessage())
-    async def info_handler(event):
+    @router.command("info")
+    async def info_handler(event, cmd):
         """Handle info command"""
-        # Check authorization
-        sender_id = event.sender_id
-        current_prefix = get_prefix(sender_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        is_info_cmd = (
-            (current_prefix == "no" and (msg.lower() == "info" or msg.lower().startswith("info "))) or
-            (msg.lower().startswith(f"{current_prefix}info"))
-        )
-        
-        if not is_info_cmd:
-            return
-            
-        # Check authorization
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and sender_id == user_id)
-        )
-        
-        if not is_authorized:
-            return
-
         # Extract target from command
-        if current_prefix == "no":
-            target = msg[4:].strip()
-        else:
-            target = msg[len(current_prefix)+4:].strip()
+        target = cmd.args
 
         # Get target user
         try:
@@ -1,44 +1,19 @@
 # plugins/premium/sticker.py
-import os
-import json
 import asyncio
+from functools import partial
 from io import BytesIO
-from telethon import events
 from telethon.tl.types import (
     DocumentAttributeFilename,
     DocumentAttributeVideo,
     DocumentAttributeSticker,
     InputStickerSetShortName
 )
-from config import OWNER_ID
-from PIL import Image, ImageOps, UnidentifiedImageError
+from plugins.core.router import get_router
+from plugins.core.images import image_pipeline, to_sticker
+from plugins.core.lazy import lazy_import
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+# Heavy dependencies, imported on first use
+Image = lazy_import('PIL.Image')
 
 async def convert_to_sticker(media_data: bytes, is_video: bool = False) -> BytesIO:
     """
@@ -55,32 +30,13 @@ async def convert_to_sticker(media_data: bytes, is_video: bool = False) -> Bytes
             bio.seek(0)
             return bio
         
-        # Handle image stickers
-        with Image.open(BytesIO(media_data)) as img:
-            img = img.convert("RGBA")
-            img = ImageOps.exif_transpose(img)  # Fix orientation
-            
-            # Resize while maintaining aspect ratio
-            max_size = 512
-            width, height = img.size
-            if width > max_size or height > max_size:
-                ratio = min(max_size/width, max_size/height)
-                new_size = (int(width * ratio), int(height * ratio))
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
-            
-            # Create transparent canvas
-            canvas = Image.new("RGBA", (max_size, max_size), (0, 0, 0, 0))
-            x = (max_size - img.width) // 2
-            y = (max_size - img.height) // 2
-            canvas.paste(img, (x, y), img)
-            
-            # Save as webp
-            bio.name = "sticker.webp"
-            canvas.save(bio, format="WEBP", quality=95, method=6)
-            bio.seek(0)
-            return bio
+        # Handle image stickers (fix orientation, fit 512x512, webp) off the event loop
+        bio.write(await image_pipeline.convert(media_data, partial(to_sticker, method=6), op='jadis'))
+        bio.name = "sticker.webp"
+        bio.seek(0)
+        return bio
             
-    except UnidentifiedImageError:
+    except Image.UnidentifiedImageError:
         raise Exception("File bukan gambar yang valid atau format tidak didukung")
     except Exception as e:
         raise Exception(f"Gagal mengkonversi media: {str(e)}")
@@ -95,33 +51,12 @@ async def safe_delete(message):
 async def setup(bot, client, user_id):
     """Setup sticker converter for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def sticker_handler(event):
+    @router.command("s")
+    async def sticker_handler(event, cmd):
         """Convert replied media to proper sticker"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        is_sticker_cmd = False
-        
-        if current_prefix == "no":
-            if msg.lower() == "s":
-                is_sticker_cmd = True
-        else:
-            if msg.lower() == f"{current_prefix}s" or msg.lower().startswith(f"{current_prefix}s "):
-                is_sticker_cmd = True
-                
-        if not is_sticker_cmd:
+        if not cmd.prefix and cmd.args:
             return
 
         # Check reply
@@ -1,11 +1,7 @@
 import asyncio
 import io
-import math
-import urllib.request
 import os
-import json
 from secrets import choice
-from telethon import events
 from telethon.errors import PackShortNameOccupiedError
 from telethon.errors.rpcerrorlist import YouBlockedUserError
 from telethon.tl import functions, types
@@ -19,36 +15,9 @@ from telethon.tl.types import (
     MessageMediaUnsupported,
 )
 from telethon.utils import get_input_document
-from PIL import Image
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.http import http_client
+from plugins.core.images import image_pipeline, to_png
+from plugins.core.router import get_router
 
 async def safe_delete(message):
     """Safely delete a message with error handling"""
@@ -64,59 +33,15 @@ KANGING_STR = [
     "Ijin Colong Stickernya Yaa :D",
 ]
 
-async def resize_photo(photo):
-    """Resize photo to 512x512 for sticker requirements"""
-    image = Image.open(photo)
-    if (image.width and image.height) < 512:
-        size1 = image.width
-        size2 = image.height
-        if size1 > size2:
-            scale = 512 / size1
-            size1new = 512
-            size2new = size2 * scale
-        else:
-            scale = 512 / size2
-            size1new = size1 * scale
-            size2new = 512
-        size1new = math.floor(size1new)
-        size2new = math.floor(size2new)
-        sizenew = (size1new, size2new)
-        image = image.resize(sizenew)
-    else:
-        maxsize = (512, 512)
-        image.thumbnail(maxsize)
-    return image
-
 async def setup(bot, client, user_id):
     """Setup sticker kang commands for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def kang_handler(event):
+    @router.command("kang", "tikel")
+    async def kang_handler(event, command):
         """Handle sticker kang commands"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        message = (event.raw_text or '').strip()
-        
-        # Check if message is a kang command
-        is_kang = False
-        if current_prefix:
-            if message.startswith(current_prefix):
-                cmd_part = message[len(current_prefix):].strip().lower()
-                is_kang = cmd_part.startswith(("kang", "tikel"))
-        else:
-            is_kang = message.lower().startswith(("kang", "tikel"))
-        
-        if not is_kang:
-            return
+        message = command.text
 
         user_client = await client.get_me()
         if not user_client.username:
@@ -215,14 +140,12 @@ async def setup(bot, client, user_id):
                 packnick += " (Animated)"
                 cmd = "/newanimated"
             else:
-                image = await resize_photo(photo)
+                # Scale so the longer side is 512 px, off the event loop
+                file.write(await image_pipeline.convert(photo.getvalue(), to_png, op='kang'))
                 file.name = "sticker.png"
-                image.save(file, "PNG")
 
-            response = urllib.request.urlopen(
-                urllib.request.Request(f"http://t.me/addstickers/{packname}")
-            )
-            htmlstr = response.read().decode("utf8").split("\n")
+            response = await http_client.get(f"http://t.me/addstickers/{packname}")
+            htmlstr = response.text.split("\n")
 
             if (
                 "  A <strong>Telegram</strong> user has created the <strong>Sticker&nbsp;Set</strong>."
@@ -1,31 +1,13 @@
 import os
 import json
 import asyncio
-from telethon import events
-from config import OWNER_ID
+from plugins.core.config import get_user_folder
+from plugins.core.router import get_router
 
 # File structure
 NOTES_DIR = 'data/notes'
 
 
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-        
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
 def get_user_notes_file(user_id):
     """Get user-specific notes file path"""
     user_folder = get_user_folder(user_id)
@@ -33,15 +15,6 @@ def get_user_notes_file(user_id):
     os.makedirs(notes_dir, exist_ok=True)
     return os.path.join(notes_dir, 'notes.json')
 
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
-
 async def safe_edit(event, text):
     """Safely edit a message with error handling"""
     try:
@@ -76,30 +49,12 @@ def save_user_notes(user_id, notes):
 async def setup(bot, client, user_id=None):
     """Setup notes commands for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    async def check_auth(event):
-        """Check if user is authorized to use the command"""
-        sender_id = event.sender_id
-        return (sender_id == OWNER_ID or 
-               (is_premium_user(sender_id) and current_user_id == sender_id))
-
-    @client.on(events.NewMessage())
-    async def save_note_handler(event):
+    @router.command("save")
+    async def save_note_handler(event, cmd):
         """Handle save note command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "save"):
-                return
-            args = msg[len(current_prefix)+4:].strip()
-        else:
-            if not msg.lower().startswith("save"):
-                return
-            args = msg[4:].strip()
+        args = cmd.args
 
         reply_msg = await event.get_reply_message()
         
@@ -128,23 +83,10 @@ async def setup(bot, client, user_id=None):
         except Exception as e:
             await safe_edit(event, f"`❌ Error: {str(e)}`")
 
-    @client.on(events.NewMessage())
-    async def get_note_handler(event):
+    @router.command("get")
+    async def get_note_handler(event, cmd):
         """Handle get note command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "get"):
-                return
-            name = msg[len(current_prefix)+3:].strip().lower()
-        else:
-            if not msg.lower().startswith("get"):
-                return
-            name = msg[3:].strip().lower()
+        name = cmd.args.lower()
 
         if not name:
             await safe_edit(event, "`❌ Format: [prefix]get <note name>`")
@@ -156,21 +98,9 @@ async def setup(bot, client, user_id=None):
         else:
             await safe_edit(event, f"`❌ Note '{name}' tidak ditemukan`")
 
-    @client.on(events.NewMessage())
-    async def list_notes_handler(event):
+    @router.command("notes")
+    async def list_notes_handler(event, cmd):
         """Handle list notes command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "notes"):
-                return
-        else:
-            if not msg.lower().startswith("notes"):
-                return
 
         notes = load_user_notes(event.sender_id)
         if not notes:
@@ -183,23 +113,10 @@ async def setup(bot, client, user_id=None):
         message += "╰──「 ᴀʟꜰʀᴇᴀᴅ  」"
         await safe_edit(event, message)
 
-    @client.on(events.NewMessage())
-    async def clear_note_handler(event):
+    @router.command("clear")
+    async def clear_note_handler(event, cmd):
         """Handle clear note command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "clear"):
-                return
-            args = msg[len(current_prefix)+5:].strip().lower()
-        else:
-            if not msg.lower().startswith("clear"):
-                return
-            args = msg[5:].strip().lower()
+        args = cmd.args.lower()
 
         if not args:
             await safe_edit(event, "`❌ Format: [prefix]clear <note name|all>`")
@@ -216,23 +133,10 @@ async def setup(bot, client, user_id=None):
         else:
             await safe_edit(event, f"`❌ Note '{args}' tidak ditemukan`")
 
-    @client.on(events.NewMessage())
-    async def notes_help_handler(event):
+    @router.command("noteshelp")
+    async def notes_help_handler(event, cmd):
         """Show notes help"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "noteshelp"):
-                return
-        else:
-            if not msg.lower().startswith("noteshelp"):
-                return
-
-        prefix = current_prefix if current_prefix else ""
+        prefix = cmd.prefix
         help_text = (
             "╭──「 Notes 」\n"
             f"│ • {prefix}save <name> [content]: Save a note\n"
@@ -1,38 +1,9 @@
 # plugins/premium/profile.py
-import os
-import json
 import asyncio
-from telethon import events, functions, types
+from telethon import functions
 from telethon.tl.functions.photos import UploadProfilePhotoRequest, DeletePhotosRequest
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.admins import get_admin_index
+from plugins.core.router import get_router
 
 async def safe_edit(event, text):
     """Safely edit a message or send a new one if editing fails"""
@@ -51,35 +22,19 @@ async def safe_edit(event, text):
 async def setup(bot, client, user_id=None):
     """Setup profile management commands for premium users"""
     current_user_id = user_id
-
-    async def check_auth(event):
-        """Check if user is authorized to use the command"""
-        sender_id = event.sender_id
-        return (sender_id == OWNER_ID or 
-               (is_premium_user(sender_id) and current_user_id == sender_id))
+    router = get_router(client, current_user_id)
 
     # ADMINLIST
-    @client.on(events.NewMessage())
-    async def adminlist_handler(event):
+    @router.command("adminlist")
+    async def adminlist_handler(event, cmd):
         """Handle adminlist command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "adminlist"):
-                return
-        elif not msg.lower().startswith("adminlist"):
-            return
 
         if not event.is_private:
             try:
-                admins = await client.get_participants(event.chat_id, filter=types.ChannelParticipantsAdmins)
+                admins = await get_admin_index(client, current_user_id).admins(event.chat_id)
                 admin_list = "╭──「 Admins 」\n"
                 for admin in admins:
-                    admin_list += f"│ • {admin.first_name} {admin.last_name or ''} ({admin.id})\n"
+                    admin_list += f"│ • {admin['first_name']} {admin['last_name'] or ''} ({admin['id']})\n"
                 admin_list += "╰──「 ᴀʟꜰʀᴇᴀᴅ  」"
                 await safe_edit(event, admin_list)
             except Exception as e:
@@ -88,20 +43,9 @@ async def setup(bot, client, user_id=None):
             await safe_edit(event, "`❌ Only works in groups/channels`")
 
     # ME (ACCOUNT INFO)
-    @client.on(events.NewMessage())
-    async def me_handler(event):
+    @router.command("my")
+    async def me_handler(event, cmd):
         """Handle my command (account info)"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "my"):
-                return
-        elif not msg.lower().startswith("my"):
-            return
 
         try:
             me = await client.get_me()
@@ -130,23 +74,10 @@ async def setup(bot, client, user_id=None):
             await safe_edit(event, f"`❌ Error: {str(e)}`")
 
     # SET USERNAME
-    @client.on(events.NewMessage())
-    async def setuname_handler(event):
+    @router.command("setuname")
+    async def setuname_handler(event, cmd):
         """Handle setuname command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "setuname"):
-                return
-            new_username = msg[len(current_prefix)+8:].strip().lower()
-        elif not msg.lower().startswith("setuname"):
-            return
-        else:
-            new_username = msg[8:].strip().lower()
+        new_username = cmd.args.lower()
 
         if not new_username:
             await safe_edit(event, "`❌ Format: [prefix]setuname <new_username>`")
@@ -167,20 +98,9 @@ async def setup(bot, client, user_id=None):
             await safe_edit(event, f"`❌ Failed to change username: {error}`")
 
     # REMOVE USERNAME
-    @client.on(events.NewMessage())
-    async def remuname_handler(event):
+    @router.command("remuname")
+    async def remuname_handler(event, cmd):
         """Handle remuname command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "remuname"):
-                return
-        elif not msg.lower().startswith("remuname"):
-            return
 
         try:
             await client(functions.account.UpdateUsernameRequest(username=""))
@@ -189,23 +109,10 @@ async def setup(bot, client, user_id=None):
             await safe_edit(event, f"`❌ Failed to remove username: {str(e)}`")
 
     # SET BIO
-    @client.on(events.NewMessage())
-    async def setbio_handler(event):
+    @router.command("setbio")
+    async def setbio_handler(event, cmd):
         """Handle setbio command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "setbio"):
-                return
-            new_bio = msg[len(current_prefix)+6:].strip()
-        elif not msg.lower().startswith("setbio"):
-            return
-        else:
-            new_bio = msg[6:].strip()
+        new_bio = cmd.args
 
         if not new_bio:
             await safe_edit(event, "`❌ Format: [prefix]setbio <new_bio>`")
@@ -218,23 +125,10 @@ async def setup(bot, client, user_id=None):
             await safe_edit(event, f"`❌ Failed to update bio: {str(e)}`")
 
     # SET NAME
-    @client.on(events.NewMessage())
-    async def setname_handler(event):
+    @router.command("setname")
+    async def setname_handler(event, cmd):
         """Handle setname command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "setname"):
-                return
-            name_parts = msg[len(current_prefix)+8:].strip().split(maxsplit=1)
-        elif not msg.lower().startswith("setname"):
-            return
-        else:
-            name_parts = msg[7:].strip().split(maxsplit=1)
+        name_parts = cmd.args.split(maxsplit=1)
 
         if len(name_parts) < 2:
             await safe_edit(event, "`❌ Format: [prefix]setname <first_name> <last_name>`")
@@ -251,20 +145,9 @@ async def setup(bot, client, user_id=None):
             await safe_edit(event, f"`❌ Failed to change name: {str(e)}`")
 
     # SET PROFILE PICTURE
-    @client.on(events.NewMessage())
-    async def setpp_handler(event):
+    @router.command("setpp")
+    async def setpp_handler(event, cmd):
         """Handle setpp command"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "setpp"):
-                return
-        elif not msg.lower().startswith("setpp"):
-            return
 
         reply_msg = await event.get_reply_message()
         if reply_msg and reply_msg.photo:
@@ -1,57 +1,44 @@
 import asyncio
-import time
-import json
-import os
-from telethon import events
-from config import OWNER_ID
+from plugins.core.dialogs import get_dialog_index
+from plugins.core.router import get_router
+from plugins.core.scheduler import get_scheduler
 from telethon.errors import MessageIdInvalidError, MessageNotModifiedError
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
+# Messages deleted per request (Telegram's limit)
+DELETE_BATCH = 100
 
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+async def delete_messages(client, chat_id, messages):
+    """Delete messages in batches, paced by the client's scheduler"""
+    scheduler = get_scheduler(client)
+    batch = []
+    async for message in messages:
+        batch.append(message.id)
+        if len(batch) >= DELETE_BATCH:
+            try:
+                await scheduler.run('delete', client.delete_messages, chat_id, batch)
+            except Exception:
+                pass
+            batch = []
+    if batch:
+        try:
+            await scheduler.run('delete', client.delete_messages, chat_id, batch)
+        except Exception:
+            pass
 
 async def delete_messages_in_chat(client, chat_id):
     """Delete all messages sent by me in a specific chat"""
     try:
-        async for message in client.iter_messages(chat_id, from_user='me'):
-            try:
-                await message.delete()
-                await asyncio.sleep(0.5)  # Increased delay to avoid flood
-            except Exception:
-                continue
+        await delete_messages(client, chat_id, client.iter_messages(chat_id, from_user='me'))
     except Exception:
         pass
 
 async def delete_all_chats(client):
     """Delete all messages in all chats (groups and PMs)"""
     try:
-        async for dialog in client.iter_dialogs():
+        dialogs = await get_dialog_index(client)
+        for dialog in dialogs.all():
             try:
                 await delete_messages_in_chat(client, dialog.id)
-                await asyncio.sleep(1)  # Added delay between chats
             except Exception:
                 continue
     except Exception:
@@ -60,12 +47,9 @@ async def delete_all_chats(client):
 async def delete_messages_with_text(client, chat_id, search_text):
     """Delete messages containing specific text"""
     try:
-        async for message in client.iter_messages(chat_id, search=search_text, from_user='me'):
-            try:
-                await message.delete()
-                await asyncio.sleep(0.5)
-            except Exception:
-                continue
+        await delete_messages(
+            client, chat_id, client.iter_messages(chat_id, search=search_text, from_user='me')
+        )
     except Exception:
         pass
 
@@ -81,34 +65,12 @@ async def safe_edit_message(message, new_text):
 async def setup(bot, client, user_id):
     """Setup purge commands for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def purge_handler(event):
+    @router.command("purge")
+    async def purge_handler(event, cmd):
         """Handle purge commands"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        if current_prefix:
-            if not msg.startswith(current_prefix):
-                return
-            cmd_part = msg[len(current_prefix):].strip().lower()
-        else:
-            cmd_part = msg.lower()
-        
-        if not cmd_part.startswith("purge"):
-            return
-
-        args = cmd_part.split(maxsplit=2)
+        args = f"{cmd.name} {cmd.args}".lower().split(maxsplit=2)
         chat_id = event.chat_id
         
         try:
@@ -1,5 +1,3 @@
-import os
-import json
 import asyncio
 from telethon import events, Button
 from telethon.tl.functions.messages import ReportRequest
@@ -14,35 +12,8 @@ from telethon.tl.types import (
     InputReportReasonPersonalDetails,
     InputReportReasonGeoIrrelevant
 )
-from config import OWNER_ID, BOT_USERNAME2
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from config import BOT_USERNAME2
+from plugins.core.router import get_router
 
 async def safe_delete(message):
     """Safely delete a message with error handling"""
@@ -91,19 +62,17 @@ user_report_states = {}
 async def setup(bot, client, user_id):
     """Setup report feature for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage(pattern=f'^({get_prefix(current_user_id)}|/)report$'))
-    async def report_handler(event):
+    @router.command("report")
+    @router.command("/report", prefix=False)
+    async def report_handler(event, cmd):
         """Handle report command"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
+        if cmd.args:
             return
 
+        sender_id = event.sender_id
+
         # Check if replying to a message
         if not event.is_reply:
             status = await event.reply(
@@ -288,9 +257,9 @@ async def setup(bot, client, user_id):
             parse_mode="markdown"
         )
 
-    @client.on(events.NewMessage())
+    @router.watch
     async def report_comment_handler(event):
-        """Handle report comment input"""
+        """Handle report comment input (only the reporter can be in a session)"""
         sender_id = event.sender_id
         
         if sender_id not in user_report_states:
@@ -393,18 +362,14 @@ async def setup(bot, client, user_id):
             parse_mode="markdown"
         )
 
-    @client.on(events.NewMessage(pattern=f'^({get_prefix(current_user_id)}|/)reporthelp$'))
-    async def report_help_handler(event):
+    @router.command("reporthelp")
+    @router.command("/reporthelp", prefix=False)
+    async def report_help_handler(event, cmd):
         """Handle report help command"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
+        if cmd.args:
             return
 
+
         help_text = """
 **📢 Panduan Report**
 
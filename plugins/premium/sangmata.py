@@ -1,38 +1,8 @@
 from asyncio import sleep, TimeoutError
-from telethon import events
 from telethon.errors.rpcerrorlist import YouBlockedUserError
 import logging
 import asyncio
-import os
-import json
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.router import get_router
 
 async def safe_delete(message):
     """Safely delete a message with error handling"""
@@ -44,39 +14,11 @@ async def safe_delete(message):
 async def setup(bot, client, user_id):
     """Setup sangmata command for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def sangmata_beta(event):
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        message_raw = (event.raw_text or '').strip()
-        message_lower = message_raw.lower()
-        command = "sg"
-
-        if not message_lower:
-            return
-
-        if current_prefix == "no":
-            parts = message_lower.split(maxsplit=1)
-            if not parts or parts[0] != command:
-                return
-            args_text = parts[1] if len(parts) > 1 else ""
-        else:
-            if not message_lower.startswith(current_prefix.lower()):
-                return
-            cmd_body = message_raw[len(current_prefix):].strip()
-            parts = cmd_body.split(maxsplit=1)
-            if not parts or parts[0].lower() != command:
-                return
-            args_text = parts[1] if len(parts) > 1 else ""
+    @router.command("sg")
+    async def sangmata_beta(event, cmd):
+        args_text = cmd.args
 
         reply = await event.get_reply_message()
         chat = "SangMata_beta_bot"
@@ -1,36 +1,5 @@
 import asyncio
-import os
-import json
-from telethon import events
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.router import get_router
 
 async def safe_delete(message):
     """Safely delete a message with error handling"""
@@ -42,59 +11,24 @@ async def safe_delete(message):
 async def setup(bot, user, user_id):
     """Setup spam commands for premium users"""
     current_user_id = user_id
+    router = get_router(user, current_user_id)
 
-    @user.on(events.NewMessage())
-    async def spam_handler(event):
+    @router.command("cspam", "wspam", "spam", "picspam", "delayspam")
+    async def spam_handler(event, cmd):
         """Handle all spam commands"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
+        if not cmd.args:
             return
 
-        msg = (event.text or '').strip()
-        current_prefix = get_prefix(current_user_id)
-        
         # Determine command type
-        command = None
-        if current_prefix:
-            if msg.startswith(f"{current_prefix}cspam "):
-                command = "cspam"
-                text = msg[len(current_prefix)+6:].replace(" ", "")
-            elif msg.startswith(f"{current_prefix}wspam "):
-                command = "wspam"
-                text = msg[len(current_prefix)+6:].split()
-            elif msg.startswith(f"{current_prefix}spam "):
-                command = "spam"
-                parts = msg[len(current_prefix)+5:].split(maxsplit=1)
-            elif msg.startswith(f"{current_prefix}picspam "):
-                command = "picspam"
-                parts = msg[len(current_prefix)+8:].split(maxsplit=1)
-            elif msg.startswith(f"{current_prefix}delayspam "):
-                command = "delayspam"
-                parts = msg[len(current_prefix)+10:].split(maxsplit=2)
+        command = cmd.name
+        if command == "cspam":
+            text = cmd.args.replace(" ", "")
+        elif command == "wspam":
+            text = cmd.args.split()
+        elif command == "delayspam":
+            parts = cmd.args.split(maxsplit=2)
         else:
-            if msg.lower().startswith("cspam "):
-                command = "cspam"
-                text = msg[6:].replace(" ", "")
-            elif msg.lower().startswith("wspam "):
-                command = "wspam"
-                text = msg[6:].split()
-            elif msg.lower().startswith("spam "):
-                command = "spam"
-                parts = msg[5:].split(maxsplit=1)
-            elif msg.lower().startswith("picspam "):
-                command = "picspam"
-                parts = msg[8:].split(maxsplit=1)
-            elif msg.lower().startswith("delayspam "):
-                command = "delayspam"
-                parts = msg[10:].split(maxsplit=2)
-                
-        if not command:
-            return
+            parts = cmd.args.split(maxsplit=1)
             
         try:
             await safe_delete(event)
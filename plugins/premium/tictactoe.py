@@ -11,33 +11,9 @@ from telethon.tl.types import (
     InputBotInlineResult,
 )
 from config import OWNER_ID, BOT_USERNAME
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.config import is_premium_user
+from plugins.core.bot_handlers import get_bot_handlers
+from plugins.core.router import get_router
 
 # Game state management
 GAME_FILE = 'data/tictactoe_games.json'
@@ -212,15 +188,20 @@ def create_ttt_caption(player_name):
 async def setup(bot, client, user_id):
     """Setup TicTacToe game for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
+
+    # Bot-side handlers are shared by all tenants and installed only once
+    shared = get_bot_handlers(bot)
+    shared.add_tenant(current_user_id, client)
 
-    @bot.on(events.InlineQuery)
+    @shared.on(events.InlineQuery)
     async def ttt_inline_handler(event):
         """Handle TicTacToe inline queries"""
-        # Check authorization
+        # Check authorization: owner, or a connected premium tenant
         sender_id = event.sender_id
         is_authorized = (
             sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
+            (shared.tenant(sender_id) is not None and is_premium_user(sender_id)))
         
         if not is_authorized:
             return
@@ -250,55 +231,43 @@ async def setup(bot, client, user_id):
             except Exception as e:
                 print(f"Error in TTT inline handler: {e}")
 
-    @client.on(events.NewMessage())
-    async def ttt_handler(event):
+    @router.command("ttt", "tictactoe")
+    async def ttt_handler(event, cmd):
         """Handle TicTacToe commands"""
-        # Check authorization
         sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
 
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
+        # Check if in private chat
+        if not event.is_private:
+            status = await event.reply("<blockquote>❌ Game hanya bisa dimainkan di chat private!</blockquote>", parse_mode="html")
+            await asyncio.sleep(3)
+            await status.delete()
+            return
         
-        # TicTacToe command
-        if msg.startswith(f"{current_prefix}ttt") or msg.startswith(f"{current_prefix}tictactoe"):
-            # Check if in private chat
-            if not event.is_private:
-                status = await event.reply("<blockquote>❌ Game hanya bisa dimainkan di chat private!</blockquote>", parse_mode="html")
-                await asyncio.sleep(3)
-                await status.delete()
-                return
-            
-            # Create new game
-            sender = await event.get_sender()
-            player_name = sender.first_name or "Player"
-            if sender.last_name:
-                player_name += f" {sender.last_name}"
-            
-            game_id = create_game(event.chat_id, sender_id, player_name)
-            
-            # Send join message with button
-            join_button = [
-                [Button.inline("🎮 Bergabung dengan Game", f"ttt_join_{game_id}")]
-            ]
-            
-            # Format pesan dengan button di bagian bawah
-            message_text = (
-                f"🎮 Game TicTacToe\n\n"
-                f"👤 Player 1: {player_name}\n"
-                f"⏳ Menunggu player 2 bergabung...\n\n"
-                f"Klik tombol di bawah untuk bergabung!"
-            )
-            
-            await event.reply(message_text, buttons=join_button)
-            await event.delete()
+        # Create new game
+        sender = await event.get_sender()
+        player_name = sender.first_name or "Player"
+        if sender.last_name:
+            player_name += f" {sender.last_name}"
+        
+        game_id = create_game(event.chat_id, sender_id, player_name)
+        
+        # Send join message with button
+        join_button = [
+            [Button.inline("🎮 Bergabung dengan Game", f"ttt_join_{game_id}")]
+        ]
+        
+        # Format pesan dengan button di bagian bawah
+        message_text = (
+            f"🎮 Game TicTacToe\n\n"
+            f"👤 Player 1: {player_name}\n"
+            f"⏳ Menunggu player 2 bergabung...\n\n"
+            f"Klik tombol di bawah untuk bergabung!"
+        )
+        
+        await event.reply(message_text, buttons=join_button)
+        await event.delete()
 
-    @bot.on(events.CallbackQuery(pattern=r"ttt_join_(\w+)"))
+    @shared.on(events.CallbackQuery(pattern=r"ttt_join_(\w+)"))
     async def ttt_join_handler(event):
         """Handle join game callback"""
         try:
@@ -349,7 +318,7 @@ async def setup(bot, client, user_id):
             await event.answer("Error saat bergabung dengan game!", alert=True)
             print(f"TTT join error: {e}")
 
-    @bot.on(events.CallbackQuery(pattern=r"ttt_(\w+)_(\d)"))
+    @shared.on(events.CallbackQuery(pattern=r"ttt_(\w+)_(\d)"))
     async def ttt_move_handler(event):
         """Handle game move callback"""
         try:
@@ -413,7 +382,7 @@ async def setup(bot, client, user_id):
             await event.answer("Error saat melakukan move!", alert=True)
             print(f"TTT move error: {e}")
 
-    @bot.on(events.CallbackQuery(pattern=r"ttt_new_(\w+)"))
+    @shared.on(events.CallbackQuery(pattern=r"ttt_new_(\w+)"))
     async def ttt_new_handler(event):
         """Handle new game callback"""
         try:
@@ -451,38 +420,16 @@ async def setup(bot, client, user_id):
             await event.answer("Error membuat game baru!", alert=True)
             print(f"TTT new game error: {e}")
 
-    @bot.on(events.CallbackQuery(pattern=r"ttt_none"))
+    @shared.on(events.CallbackQuery(pattern=r"ttt_none"))
     async def ttt_none_handler(event):
         """Handle invalid button clicks"""
         await event.answer("Posisi ini sudah terisi!", alert=True)
 
     # Userbot handler: trigger inline
-    @client.on(events.NewMessage(outgoing=True))
-    async def ttt_command_handler(event):
+    @router.command("ttt")
+    async def ttt_command_handler(event, cmd):
         """Handle ttt command to trigger inline query"""
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        msg = (event.text or '').strip()
-        current_prefix = get_prefix(current_user_id)
-        
-        is_ttt_cmd = False
-        
-        if current_prefix == "no":
-            if msg.lower().startswith("ttt"):
-                is_ttt_cmd = True
-        else:
-            if msg.startswith(current_prefix):
-                cmd = msg[len(current_prefix):].strip().lower()
-                if cmd.startswith("ttt"):
-                    is_ttt_cmd = True
-
-        if not is_ttt_cmd:
+        if not event.out:
             return
 
         try:
@@ -1,39 +1,10 @@
 import os
-import json
 import random
 import asyncio
-from telethon import events
 from telethon.tl.types import DocumentAttributeVideo
 from telethon.errors import MessageNotModifiedError, MessageDeleteForbiddenError
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.config import get_user_folder
+from plugins.core.router import get_router
 
 async def safe_delete(message):
     """Safely delete a message with error handling"""
@@ -52,43 +23,14 @@ async def safe_edit(message, text):
 async def setup(bot, client, user_id):
     """Setup sticker creation commands for premium users"""
     current_user_id = user_id
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def sticker_handler(event):
+    @router.command("img")
+    async def sticker_handler(event, cmd):
         """Handle sticker creation commands"""
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        is_sticker_cmd = False
-        command = ""
-        args = ""
-        
-        if current_prefix:
-            if msg.startswith(current_prefix):
-                cmd_part = msg[len(current_prefix):].strip().split(maxsplit=1)
-                if cmd_part and cmd_part[0].lower() in ['img']:
-                    is_sticker_cmd = True
-                    command = cmd_part[0].lower()
-                    args = cmd_part[1] if len(cmd_part) > 1 else ""
-        else:
-            cmd_part = msg.lower().split(maxsplit=1)
-            if cmd_part and cmd_part[0] in ['img']:
-                is_sticker_cmd = True
-                command = cmd_part[0].lower()
-                args = cmd_part[1] if len(cmd_part) > 1 else ""
-                
-        if not is_sticker_cmd:
-            return
+        current_prefix = cmd.prefix
+        command = cmd.name
+        args = cmd.args
 
         if not event.is_reply:
             status = await event.reply(f"```❌ Harus reply sticker dengan caption {current_prefix}{command}```")
@@ -2,36 +2,12 @@
 import os
 import json
 from telethon import events
-from config import OWNER_ID
-from googletrans import Translator
+from plugins.core.config import get_user_folder
+from plugins.core.router import get_router
+from plugins.core.lazy import lazy_import, lazy_object
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+# Heavy dependencies, imported on first use
+Translator = lazy_import('googletrans', 'Translator')
 
 def get_user_translate_file(user_id):
     """Get user-specific translate state file"""
@@ -74,29 +50,14 @@ async def safe_edit(message, text):
 async def setup(bot, client, user_id=None):
     """Setup translation commands for premium users"""
     current_user_id = user_id
-    translator = Translator()
+    translator = lazy_object(Translator)
 
-    async def check_auth(event):
-        """Check if user is authorized to use the command"""
-        sender_id = event.sender_id
-        return (sender_id == OWNER_ID or 
-               (is_premium_user(sender_id) and current_user_id == sender_id))
+    router = get_router(client, current_user_id)
 
     # Translate Command Handler
-    @client.on(events.NewMessage())
-    async def translate_handler(event):
+    @router.command("tr")
+    async def translate_handler(event, cmd):
         """Handle manual translation requests"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "tr"):
-                return
-        elif not msg.lower().startswith("tr"):
-            return
 
         if not event.is_reply:
             await safe_edit(event, "ℹ️ **Harap reply pesan yang ingin diterjemahkan!**")
@@ -134,20 +95,9 @@ async def setup(bot, client, user_id=None):
             await safe_edit(processing_msg, f"❌ **Gagal menerjemahkan:** {str(e)}")
 
     # Auto-Translate Toggle Handler
-    @client.on(events.NewMessage())
-    async def auto_translate_handler(event):
+    @router.command("trall")
+    async def auto_translate_handler(event, cmd):
         """Toggle auto-translation state"""
-        if not await check_auth(event):
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        if current_prefix:
-            if not msg.startswith(current_prefix + "trall"):
-                return
-        elif not msg.lower().startswith("trall"):
-            return
 
         # Toggle auto-translation state
         current_state = load_user_translate_state(event.sender_id)
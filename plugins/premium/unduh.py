@@ -1,39 +1,12 @@
 # plugins/premium/unduh.py
 import os
 import re
-import json
-from telethon import events
 from telethon.tl.types import MessageMediaPhoto, MessageMediaDocument
 from telethon.tl.types import InputPeerChannel, InputPeerChat, InputPeerUser
 from telethon.errors import ChannelPrivateError
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.config import get_user_folder
+from plugins.core.dialogs import get_dialog_index
+from plugins.core.router import get_router
 
 def ensure_data_dir(user_id=None):
     """Ensure data directory exists for specific user"""
@@ -73,11 +46,9 @@ async def get_access_hash(user, channel_id):
     """Try to get access hash for private channels"""
     try:
         # Check if we're already a member of this channel
-        async for dialog in user.iter_dialogs():
-            if dialog.id == channel_id:
-                if hasattr(dialog.entity, 'access_hash'):
-                    return dialog.entity.access_hash
-        return None
+        dialogs = await get_dialog_index(user)
+        entry = dialogs.channel(channel_id)
+        return entry.access_hash if entry else None
     except:
         return None
 
@@ -92,36 +63,15 @@ def cleanup_file(file_path):
 async def setup(bot, user, user_id):
     """Setup download handler for premium users"""
     current_user_id = user_id
+    router = get_router(user, current_user_id)
 
-    @user.on(events.NewMessage())
-    async def download_handler(event):
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        # Get current prefix and message
-        current_prefix = get_prefix(current_user_id)
-        message = (event.raw_text or '').strip()
-        
-        # Check if message is a download command
-        pattern = (
-            r'^unduh\s+(https://t\.me/(?:c/)?(\d+)/(\d+))$' if current_prefix == "no" else
-            r'^{}unduh\s+(https://t\.me/(?:c/)?(\d+)/(\d+))$'.format(re.escape(current_prefix))
-        )
-        
-        match = re.match(pattern, message, re.IGNORECASE)
+    @router.command("unduh")
+    async def download_handler(event, cmd):
+        # Check if the argument is a message link
+        match = re.match(r'^(https://t\.me/(?:c/)?(\d+)/(\d+))$', cmd.args, re.IGNORECASE)
         if not match:
             # Also check for username format
-            pattern2 = (
-                r'^unduh\s+(https://t\.me/([\w_]+)/(\d+))$' if current_prefix == "no" else
-                r'^{}unduh\s+(https://t\.me/([\w_]+)/(\d+))$'.format(re.escape(current_prefix))
-            )
-            match = re.match(pattern2, message, re.IGNORECASE)
+            match = re.match(r'^(https://t\.me/([\w_]+)/(\d+))$', cmd.args, re.IGNORECASE)
             if not match:
                 return
 
@@ -1,47 +1,19 @@
 # plugins/vctools.py
-from telethon import events, functions, types
-from config import OWNER_ID
+from telethon import functions, types
+from plugins.core.router import get_router
 import asyncio
 import random
 import logging
 import json
-import os
 import time
 import re
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            prefix = json.load(f).get('prefix', '.')
-            return prefix if prefix != "no" else ""
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
-
 async def setup(bot, client, user_id):
     current_user_id = user_id
+    router = get_router(client, current_user_id)
     active_calls = {}  # Track active calls to prevent auto-leaving
     MIN_JOIN_TIME = 300  # Minimum time to stay in VC (5 minutes)
     
@@ -70,58 +42,12 @@ async def setup(bot, client, user_id):
             logger.error(f"Error resolving chat entity: {e}")
             return None
 
-    @client.on(events.NewMessage())
-    async def vc_handler(event):
-        # Check authorization
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id))
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        message = (event.raw_text or '').strip()
-        
-        # Check if message is a VC command
-        vc_commands = ["startvc", "stavc", "stopvc", "stovc", "joinvc", "jvc", "leavevc", "lvc"]
-        
-        is_vc_cmd = False
-        cmd = ""
-        
-        if current_prefix == "":
-            # No prefix mode
-            for vc_cmd in vc_commands:
-                if message.lower().startswith(vc_cmd):
-                    is_vc_cmd = True
-                    cmd = vc_cmd
-                    break
-        else:
-            # With prefix mode
-            if message.startswith(current_prefix):
-                msg_without_prefix = message[len(current_prefix):].strip().lower()
-                for vc_cmd in vc_commands:
-                    if msg_without_prefix.startswith(vc_cmd):
-                        is_vc_cmd = True
-                        cmd = vc_cmd
-                        break
-        
-        if not is_vc_cmd:
-            return
+    @router.command("startvc", "stavc", "stopvc", "stovc", "joinvc", "jvc", "leavevc", "lvc")
+    async def vc_handler(event, command):
+        cmd = command.name
 
         # Extract target chat if provided
-        target_chat = None
-        if " " in message:
-            # Extract the part after the command
-            if current_prefix == "":
-                parts = message.split(" ", 1)
-                if len(parts) > 1:
-                    target_chat = parts[1].strip()
-            else:
-                parts = message[len(current_prefix):].strip().split(" ", 1)
-                if len(parts) > 1:
-                    target_chat = parts[1].strip()
+        target_chat = command.args or None
         
         # Map aliases to main commands
         if cmd in ["stavc"]:
@@ -1,37 +1,7 @@
 # plugins/premium/zodiak.py
-import os
 import re
-import json
 from datetime import datetime
-from telethon import events
-from config import OWNER_ID
-
-def get_user_folder(user_id=None):
-    """Get user-specific folder path"""
-    if user_id is None or user_id == OWNER_ID:
-        return 'premium'
-    return f'premium/userprem_{user_id}'
-
-def get_prefix(user_id=None):
-    """Get current prefix for specific user"""
-    user_folder = get_user_folder(user_id)
-    try:
-        with open(f'{user_folder}/prefix.json', 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        os.makedirs(user_folder, exist_ok=True)
-        with open(f'{user_folder}/prefix.json', 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
-
-def is_premium_user(user_id):
-    """Check if user is premium"""
-    try:
-        with open('premium/premium.json', 'r') as f:
-            premium_data = json.load(f)
-            return str(user_id) in premium_data.get("users", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return False
+from plugins.core.router import get_router
 
 def get_zodiac_sign(birth_date):
     """Determine zodiac sign from birth date"""
@@ -82,32 +52,14 @@ HOROSCOPE_PREDICTIONS = {
 
 async def setup(bot, client, user_id):
     current_user_id = user_id  # Store user_id in a local variable
+    router = get_router(client, current_user_id)
 
-    @client.on(events.NewMessage())
-    async def zodiac_handler(event):
+    @router.command("zodiak")
+    async def zodiac_handler(event, cmd):
         """Handle zodiac command"""
-        # Check if user is owner or premium with active session
-        sender_id = event.sender_id
-        is_authorized = (
-            sender_id == OWNER_ID or 
-            (is_premium_user(sender_id) and current_user_id == sender_id)
-        )
-        
-        if not is_authorized:
-            return
-
-        current_prefix = get_prefix(current_user_id)
-        msg = (event.text or '').strip()
-        
-        # Check command format
-        is_zodiac_cmd = False
-        date_str = ""
-        
-        if msg.startswith(f"{current_prefix}zodiak "):
-            is_zodiac_cmd = True
-            date_str = msg[len(current_prefix)+7:].strip()
-                
-        if not is_zodiac_cmd:
+        current_prefix = cmd.prefix
+        date_str = cmd.args
+        if not date_str:
             return
 
         try:
@@ -153,13 +105,16 @@ async def setup(bot, client, user_id):
             except:
                 pass
 
-    @client.on(events.NewMessage(pattern=f"^{get_prefix(current_user_id)}zodiachelp$"))
-    async def zodiac_help(event):
+    @router.command("zodiachelp")
+    async def zodiac_help(event, cmd):
         """Show zodiac command help"""
+        if cmd.args:
+            return
+
         help_text = (
             f"<blockquote>✨ <b>Zodiak Command Guide</b></blockquote>\n\n"
-            f"<blockquote>• <code>{get_prefix(current_user_id)}zodiak [dd-mm-yyyy]</code> - "
+            f"<blockquote>• <code>{cmd.prefix}zodiak [dd-mm-yyyy]</code> - "
             "Dapatkan ramalan zodiak berdasarkan tanggal lahir</blockquote>\n"
-            f"<blockquote>Contoh: <code>{get_prefix(current_user_id)}zodiak 16-06-2006</code></blockquote>"
+            f"<blockquote>Contoh: <code>{cmd.prefix}zodiak 16-06-2006</code></blockquote>"
         )
         await event.reply(help_text, parse_mode="html")
\ No newline at end of file
@@ -1,11 +1,10 @@
 import os
 import json
-import requests
-import base64
 import asyncio
-from io import BytesIO
 from telethon import events, types
 from config import OWNER_ID
+from plugins.core.media_cache import get_media_cache, media_key
+from plugins.core.quote import quote_renderer
 
 def get_prefix():
     """Get current prefix from config"""
@@ -18,85 +17,9 @@ def get_prefix():
             json.dump({'prefix': '.'}, f)
         return '.'
 
-async def get_profile_photo(user, client):
-    try:
-        photo = await client.download_profile_photo(user, file=BytesIO())
-        if photo:
-            photo.seek(0)
-            return photo
-    except:
-        pass
-    return None
-
-async def photo_to_base64(photo_bytes):
-    if photo_bytes:
-        photo_bytes.seek(0)
-        return base64.b64encode(photo_bytes.read()).decode("utf-8")
-    return None
-
-def get_unique_color(user_id, offset=0):
-    hex_color = f"#{(user_id * 1234567 + offset) % 0xFFFFFF:06x}"
-    return hex_color
-
-def get_initials(name):
-    if not name:
-        return "?"
-    parts = name.split()
-    if len(parts) >= 2:
-        return (parts[0][0] + parts[-1][0]).upper()
-    return name[:2].upper() if len(name) >= 2 else name[0].upper()
-
-async def generate_quote(user, text, avatar_b64=None):
-    try:
-        text_color = get_unique_color(user.id)
-        avatar_color = get_unique_color(user.id, 1)
-        
-        quote_data = {
-            "type": "quote",
-            "format": "webp",
-            "backgroundColor": "#000000",
-            "width": 512,
-            "height": 512,
-            "scale": 2,
-            "quality": 100,
-            "messages": [{
-                "entities": [],
-                "avatar": True,
-                "from": {
-                    "id": user.id,
-                    "name": user.first_name,
-                    "photo": {
-                        "url": f"data:image/png;base64,{avatar_b64}" if avatar_b64 else None,
-                        "width": 512,
-                        "height": 512,
-                        "color": avatar_color if not avatar_b64 else None,
-                        "initials": get_initials(user.first_name) if not avatar_b64 else None
-                    }
-                },
-                "text": text,
-                "textColor": text_color,
-                "replyMessage": {}
-            }]
-        }
-
-        response = requests.post(
-            "https://bot.lyo.su/quote/generate",
-            json=quote_data,
-            headers={"Content-Type": "application/json"},
-            timeout=15
-        )
-        response.raise_for_status()
-
-        sticker_data = base64.b64decode(response.json()["result"]["image"])
-        sticker = BytesIO(sticker_data)
-        sticker.name = "sticker.webp"
-        sticker.seek(0)
-        return sticker
-    except Exception as e:
-        print(f"Error generating quote: {e}")
-        return None
-
 async def setup(bot, user):
+    media_cache = get_media_cache(user)
+
     @user.on(events.NewMessage())
     async def q_handler(event):
         # Skip if not from owner
@@ -179,28 +102,26 @@ async def setup(bot, user):
         status = await event.edit("```Sabar Ya Ler........```")
 
         try:
-            # Get profile photo
-            avatar = await get_profile_photo(target_user, user)
-            avatar_b64 = await photo_to_base64(avatar) if avatar else None
+            # Same person, name, photo and text give the same sticker
+            photo = getattr(target_user, 'photo', None)
+            key = media_key('qc', target_user.id, getattr(target_user, 'first_name', None),
+                            getattr(photo, 'photo_id', None), text)
 
-            # Generate sticker
-            sticker = await generate_quote(target_user, text, avatar_b64)
-            
-            if sticker:
-                await user.send_file(
-                    event.chat_id,
-                    sticker,
-                    reply_to=event.reply_to_msg_id if event.is_reply and not cmd else None,
-                    force_document=False,
-                    attributes=[
-                        types.DocumentAttributeFilename("sticker.webp"),
-                        types.DocumentAttributeSticker(
-                            alt="quote",
-                            stickerset=types.InputStickerSetEmpty()
-                        )
-                    ]
-                )
-            else:
+            sent = await media_cache.send(
+                key,
+                event.chat_id,
+                lambda: quote_renderer.render(user, target_user, text),
+                reply_to=event.reply_to_msg_id if event.is_reply and not cmd else None,
+                force_document=False,
+                attributes=[
+                    types.DocumentAttributeFilename("sticker.webp"),
+                    types.DocumentAttributeSticker(
+                        alt="quote",
+                        stickerset=types.InputStickerSetEmpty()
+                    )
+                ]
+            )
+            if not sent:
                 await status.edit("❌ **Gagal membuat stiker quote**")
                 await asyncio.sleep(3)
         except Exception as e:
@@ -1,26 +1,10 @@
 # plugins/shared.py
 import json
 import os
+import time
 
-PREMIUM_FILE = 'premium/premium.json'
 ACTIVE_CONNECTIONS_FILE = 'premium/active_connections.json'
 UPTIME_FILE = 'premium/uptime.json'
-PREFIX_FILE = 'premium/prefix.json'
-
-def load_premium_users():
-    """Load premium users from file"""
-    try:
-        if os.path.exists(PREMIUM_FILE):
-            with open(PREMIUM_FILE, 'r') as f:
-                return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        pass
-    return {"users": []}
-
-def save_premium_users(data):
-    """Save premium users to file"""
-    with open(PREMIUM_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
 
 def load_active_connections():
     """Load active premium connections from file"""
@@ -59,13 +43,3 @@ def get_uptime():
     if seconds or not parts: parts.append(f"{seconds}s")
     
     return ' '.join(parts)
-
-def get_prefix():
-    """Get current prefix"""
-    try:
-        with open(PREFIX_FILE, 'r') as f:
-            return json.load(f).get('prefix', '.')
-    except (FileNotFoundError, json.JSONDecodeError):
-        with open(PREFIX_FILE, 'w') as f:
-            json.dump({'prefix': '.'}, f)
-        return '.'
\ No newline at end of file
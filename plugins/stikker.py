@@ -3,12 +3,15 @@ import json
 import re
 import random
 import asyncio
-import requests
 from io import BytesIO
-from PIL import Image
-from bs4 import BeautifulSoup
 from telethon import events
 from config import OWNER_ID
+from plugins.core.http import http_client
+from plugins.core.images import image_pipeline, to_sticker
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+BeautifulSoup = lazy_import('bs4', 'BeautifulSoup')
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -39,7 +42,7 @@ async def search_image_bing(query: str) -> str:
     }
 
     try:
-        response = requests.get(
+        response = await http_client.get(
             'https://www.bing.com/images/search',
             params=params,
             headers=headers,
@@ -67,23 +70,12 @@ async def search_image_bing(query: str) -> str:
 async def create_sticker(image_url: str) -> BytesIO:
     """Download image and convert to sticker format"""
     try:
-        res = requests.get(image_url, stream=True, timeout=15)
+        res = await http_client.get(image_url, timeout=15)
         res.raise_for_status()
 
-        img = Image.open(BytesIO(res.content)).convert("RGBA")
-        max_size = (512, 512)
-        img.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-        # Create transparent canvas
-        canvas = Image.new("RGBA", max_size, (0, 0, 0, 0))
-        x = (max_size[0] - img.width) // 2
-        y = (max_size[1] - img.height) // 2
-        canvas.paste(img, (x, y), img)
-
-        bio = BytesIO()
+        # Fit on a transparent 512x512 canvas off the event loop
+        bio = BytesIO(await image_pipeline.convert(res.content, to_sticker, op='stikker'))
         bio.name = "sticker.webp"
-        canvas.save(bio, format="WEBP", quality=95)
-        bio.seek(0)
         return bio
 
     except Exception as e:
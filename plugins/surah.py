@@ -1,11 +1,12 @@
 # audiosurah.py
 import os
 import json
-import aiohttp
 import time
 import math
 from telethon import events, types
 from config import OWNER_ID
+from plugins.core.http import http_client
+from plugins.core.media_cache import get_media_cache, media_key
 
 # File configuration
 CONFIG_DIR = 'data'
@@ -32,6 +33,9 @@ SURAH_NAMES = {
     114: "An-Nas (Mankind)"
 }
 
+class DownloadFailed(Exception):
+    """The surah audio could not be downloaded"""
+
 def human_readable_size(size):
     """Convert bytes to human readable format"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -44,41 +48,43 @@ async def download_audio(url, filename, event):
     """Download audio file with progress tracking"""
     filepath = None
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return None, f"HTTP Error {response.status}"
-                
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-                last_progress = -1
-                last_update = time.time()
-                
-                filepath = os.path.join(TEMP_AUDIO_DIR, filename)
-                
-                with open(filepath, 'wb') as f:
-                    async for chunk in response.content.iter_chunked(8192):
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        progress = math.floor((downloaded / total_size) * 100)
-                        
-                        if progress >= last_progress + 5 or time.time() - last_update >= 1:
-                            last_progress = progress
-                            last_update = time.time()
-                            await event.edit(
-                                f"📥 Downloading Surah Audio\n"
-                                f"📦 Progress: {progress}%\n"
-                                f"🔄 {human_readable_size(downloaded)}/{human_readable_size(total_size)}"
-                            )
-                
-                return filepath, None
+        async with http_client.stream('GET', url) as response:
+            if response.status != 200:
+                return None, f"HTTP Error {response.status}"
+            
+            total_size = int(response.headers.get('content-length', 0))
+            downloaded = 0
+            last_progress = -1
+            last_update = time.time()
+            
+            filepath = os.path.join(TEMP_AUDIO_DIR, filename)
+            
+            with open(filepath, 'wb') as f:
+                async for chunk in response.iter_chunks(8192):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    
+                    progress = math.floor((downloaded / total_size) * 100)
+                    
+                    if progress >= last_progress + 5 or time.time() - last_update >= 1:
+                        last_progress = progress
+                        last_update = time.time()
+                        await event.edit(
+                            f"📥 Downloading Surah Audio\n"
+                            f"📦 Progress: {progress}%\n"
+                            f"🔄 {human_readable_size(downloaded)}/{human_readable_size(total_size)}"
+                        )
+            
+            return filepath, None
     except Exception as e:
         if filepath and os.path.exists(filepath):
             os.remove(filepath)
         return None, f"Download error: {str(e)}"
 
 async def setup(bot, user):
+    # Surahs are sent by the bot; each one is uploaded once and then re-sent by reference
+    media_cache = get_media_cache(bot)
+
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID))
     async def audiosurah_handler(event):
         msg = (event.text or '').strip()
@@ -121,16 +127,19 @@ async def setup(bot, user):
             audio_url = f"https://api.lolhuman.xyz/api/quran/audio/{surah_num}?apikey=efcb180d3fd3134748648887"  # Fixed variable name
             
             filename = f"surah_{surah_num}_{surah_name.split(' ')[0]}.mp3"
-            filepath, error = await download_audio(audio_url, filename, processing)
-            
-            if error:
-                await processing.edit(f"❌ {error}")
-                return
+
+            async def produce():
+                nonlocal filepath
+                filepath, error = await download_audio(audio_url, filename, processing)
+                if error:
+                    raise DownloadFailed(error)
+                return filepath
 
             try:
-                await bot.send_file(
+                await media_cache.send(
+                    media_key('surah', surah_num),
                     event.chat_id,
-                    filepath,
+                    produce,
                     voice_note=True,
                     attributes=[
                         types.DocumentAttributeAudio(
@@ -142,7 +151,12 @@ async def setup(bot, user):
                     caption=f"🎧 {surah_name}"
                 )
                 await processing.edit(f"✅ Successfully sent Surah {surah_name}")
+            except DownloadFailed as e:
+                await processing.edit(f"❌ {e}")
+                return
             except:
+                if not filepath:
+                    raise
                 await bot.send_file(
                     event.chat_id,
                     filepath,
@@ -1,10 +1,10 @@
 # plugins/telegraph.py
 import json
-import aiohttp
 import os
 import time
 from telethon import events
 from config import OWNER_ID
+from plugins.core.http import http_client
 
 def get_prefix():
     """Get current prefix from config (supports 'no' prefix mode)"""
@@ -54,39 +54,38 @@ async def setup(bot, user):
         title, content = parts
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # Create anonymous account
-                async with session.post(
-                    'https://api.telegra.ph/createAccount',
-                    params={'short_name': 'AlfreadBot', 'author_name': 'Bot'}
-                ) as acc_res:
-                    acc_data = await acc_res.json()
-                    access_token = acc_data.get('result', {}).get('access_token', '')
-                
-                if not access_token:
-                    await event.reply('❌ Gagal membuat akun Telegraph')
-                    return
-                
-                # Create page
-                page_data = {
-                    'access_token': access_token,
-                    'title': title,
-                    'content': [{'tag': 'p', 'children': [content]}],
-                    'return_content': False
-                }
+            # Create anonymous account
+            acc_res = await http_client.post(
+                'https://api.telegra.ph/createAccount',
+                params={'short_name': 'AlfreadBot', 'author_name': 'Bot'}
+            )
+            acc_data = acc_res.json()
+            access_token = acc_data.get('result', {}).get('access_token', '')
+            
+            if not access_token:
+                await event.reply('❌ Gagal membuat akun Telegraph')
+                return
+            
+            # Create page
+            page_data = {
+                'access_token': access_token,
+                'title': title,
+                'content': [{'tag': 'p', 'children': [content]}],
+                'return_content': False
+            }
+            
+            page_res = await http_client.post(
+                'https://api.telegra.ph/createPage',
+                json=page_data
+            )
+            page = page_res.json()
+            
+            if page.get('ok'):
+                await event.reply(f'✅ Sukses! Artikel kamu:\nhttps://telegra.ph/{page["result"]["path"]}')
+            else:
+                error = page.get('error', 'Unknown error')
+                await event.reply(f'❌ Gagal membuat halaman: {error}')
                 
-                async with session.post(
-                    'https://api.telegra.ph/createPage',
-                    json=page_data
-                ) as page_res:
-                    page = await page_res.json()
-                    
-                    if page.get('ok'):
-                        await event.reply(f'✅ Sukses! Artikel kamu:\nhttps://telegra.ph/{page["result"]["path"]}')
-                    else:
-                        error = page.get('error', 'Unknown error')
-                        await event.reply(f'❌ Gagal membuat halaman: {error}')
-                        
         except Exception as e:
             print(f'Telegraph error: {str(e)}')
             await event.reply('❌ Terjadi kesalahan saat membuat artikel Telegraph.')
\ No newline at end of file
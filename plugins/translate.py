@@ -3,7 +3,10 @@ import os
 import json
 from telethon import events
 from config import OWNER_ID
-from googletrans import Translator
+from plugins.core.lazy import lazy_import, lazy_object
+
+# Heavy dependencies, imported on first use
+Translator = lazy_import('googletrans', 'Translator')
 
 # File configuration
 CONFIG_DIR = 'data'
@@ -37,7 +40,7 @@ def save_translate_state(state):
         json.dump({'auto_translate': state}, f, indent=2)
 
 async def setup(bot, user):
-    translator = Translator()
+    translator = lazy_object(Translator)
     current_prefix = get_live_prefix()
 
     # Translate Command Handler
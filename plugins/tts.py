@@ -6,10 +6,13 @@ import json
 import re
 from telethon import events
 from config import OWNER_ID, BOT_USERNAME
-import gtts
 from io import BytesIO
 import speech_recognition as sr
 from pydub import AudioSegment
+from plugins.core.lazy import lazy_import
+
+# Heavy dependencies, imported on first use
+gtts = lazy_import('gtts')
 
 def get_prefix():
     """Get current prefix from config (supports 'no' prefix mode)"""
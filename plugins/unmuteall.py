@@ -6,6 +6,8 @@ from telethon import events, types
 from telethon.tl.types import ChannelParticipantsBanned
 from telethon.errors import FloodWaitError
 from config import OWNER_ID
+from plugins.core.participants import get_participant_service
+from plugins.core.scheduler import get_scheduler
 
 # Configuration
 CONFIG_DIR = 'data'
@@ -21,6 +23,9 @@ def get_live_prefix():
         return '.'
 
 async def setup(bot, user):
+    scheduler = get_scheduler(user)
+    participants = get_participant_service(user)
+
     @user.on(events.NewMessage(outgoing=True, from_users=OWNER_ID))
     async def unmuteall_handler(event):
         """Handle unmuteall command"""
@@ -102,13 +107,11 @@ async def setup(bot, user):
             status_msg = await event.reply("```🔄 Memulai proses unmute...```")
             
             total_unmuted = 0
-            async for member in user.iter_participants(
-                event.chat_id,
-                filter=ChannelParticipantsBanned,
-                aggressive=True
-            ):
+            async for member in participants.iter(event.chat_id, filter=ChannelParticipantsBanned):
                 try:
-                    await user.edit_permissions(
+                    await scheduler.run(
+                        'ban',
+                        user.edit_permissions,
                         event.chat_id,
                         member.id,
                         view_messages=True,
@@ -120,13 +123,16 @@ async def setup(bot, user):
                         send_inline=True
                     )
                     total_unmuted += 1
-                    await asyncio.sleep(2)  # Rate limiting
                 except FloodWaitError as e:
-                    await status_msg.edit(f"```⏳ Menunggu {e.seconds} detik karena flood limit```")
-                    await asyncio.sleep(e.seconds)
+                    # Wait too long to sit out; stop instead of hammering the API
+                    await status_msg.edit(f"```⏳ Flood limit {e.seconds} detik, proses dihentikan```")
+                    break
                 except Exception as e:
                     continue
 
+            # The banned list changed
+            participants.invalidate(event.chat_id)
+
             # Final report
             duration = time.time() - start_time
             minutes = int(duration // 60)